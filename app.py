@@ -2,11 +2,21 @@
 Flask Web Application for Amazon Affiliate Product Showcase
 """
 # -*- coding: utf-8 -*-
+import time
+_import_started = time.perf_counter()
+
 import os
 import sys
-from flask import Flask, render_template, request, jsonify, send_from_directory, url_for
+import hmac
+import threading
+from dotenv import load_dotenv
+from flask import Flask, render_template, request, jsonify, send_file, url_for, Response, stream_with_context, abort, g
+from werkzeug.security import safe_join
+from urllib.parse import quote
+import mimetypes
 from flask_cors import CORS
-from product_fetcher import get_fetcher
+
+load_dotenv()
 
 def detect_store_from_url(url: str) -> str:
     """זיהוי אוטומטי של חנות לפי URL"""
@@ -23,11 +33,23 @@ def detect_store_from_url(url: str) -> str:
     else:
         # Default to Amazon
         return 'amazon'
-from video_generator import VideoGenerator
 from product_manager import ProductManager
+from render_profiles import RENDER_PROFILES, DEFAULT_PROFILE, OUTPUT_FORMATS, parse_formats
+from scratch_space import ScratchSpace, DiskJanitor
+import metrics
+import tracing
+import sampling_profiler
+from log_config import configure_logging, get_logger
 
-import threading
-import time
+import json
+
+# LOG_LEVEL / LOG_FORMAT (text or json) / LOG_DEBUG_SAMPLE - see log_config.py
+configure_logging()
+log = get_logger('web')
+
+# PROFILE_SIGNAL (e.g. SIGUSR2): sample every thread for PROFILE_SIGNAL_SECONDS into PROFILE_DIR.
+# Installed at import time so it is in the main thread (and inherited by preloaded gunicorn workers)
+sampling_profiler.install_signal_handler()
 
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32':
@@ -42,14 +64,204 @@ app.config['UPLOAD_FOLDER'] = 'output_videos'
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max file size
 
 # Initialize components
-video_generator = VideoGenerator()
-product_fetcher = None
-product_manager = ProductManager()
+# מערכת הווידאו (moviepy, numpy, cv2, PIL) ומשיכת המוצרים (requests, bs4) נטענות בשימוש הראשון,
+# כך ש-worker שלא מרנדר לא משלם עליהן בעלייה. עם PRELOAD_APP (gunicorn.conf.py) הן נטענות
+# פעם אחת בתהליך האב לפני ה-fork, וה-workers חולקים את הדפים בזיכרון
+PRELOAD_APP = os.getenv('PRELOAD_APP', '').lower() in ('1', 'true', 'yes')
+OUTPUT_DIR = 'output_videos'
+TEMP_DIR = 'temp_files'
+
+startup_report = {
+    'pid': os.getpid(),
+    'preloaded': PRELOAD_APP,
+    'import_ms': None,
+    'products_ms': None,
+    'video_subsystem_ms': None,
+    'fetcher_ms': None,
+    'preload_ms': None,
+}
+
+_lazy_lock = threading.RLock()
+_product_manager = None
+_video_generator = None
+_video_jobs = None
+
+# תיקיות העבודה משותפות ל-VideoGenerator ול-janitor (שלא ימחק עבודה שרצה)
+scratch_space = ScratchSpace(TEMP_DIR)
+disk_janitor = None
+
+
+def _record_startup(key: str, started: float):
+    startup_report[key] = round((time.perf_counter() - started) * 1000, 1)
+    log.info("Startup %s: %.0f ms", key.replace('_ms', ''), startup_report[key], extra={'pid': os.getpid()})
+
+
+def get_product_manager() -> ProductManager:
+    """products.json נטען בבקשה הראשונה שצריכה אותו"""
+    global _product_manager
+    if _product_manager is None:
+        with _lazy_lock:
+            if _product_manager is None:
+                started = time.perf_counter()
+                with tracing.span('load.products'):
+                    _product_manager = ProductManager()
+                _record_startup('products_ms', started)
+    return _product_manager
+
+
+def get_fetcher(store: str = 'amazon'):
+    """product_fetcher (requests, bs4) נטען רק כשצריך למשוך מוצר"""
+    if startup_report['fetcher_ms'] is None:
+        with _lazy_lock:
+            if startup_report['fetcher_ms'] is None:
+                started = time.perf_counter()
+                with tracing.span('load.fetcher'):
+                    import product_fetcher
+                _record_startup('fetcher_ms', started)
+    from product_fetcher import get_fetcher as fetcher_factory
+    return fetcher_factory(store)
+
+
+def _load_video_subsystem():
+    """VideoGenerator ומנהל העבודות (quick preview first, then the full render) - נבנים פעם אחת"""
+    global _video_generator, _video_jobs
+    with _lazy_lock:
+        if _video_jobs is None:
+            started = time.perf_counter()
+            with tracing.span('load.video'):
+                from video_generator import VideoGenerator
+                from video_jobs import VideoJobManager
+                _video_generator = VideoGenerator(output_dir=OUTPUT_DIR, temp_dir=TEMP_DIR, scratch=scratch_space)
+                _video_jobs = VideoJobManager(_video_generator)
+            _record_startup('video_subsystem_ms', started)
+
+
+def get_video_generator():
+    if _video_generator is None:
+        _load_video_subsystem()
+    return _video_generator
+
+
+def get_video_jobs():
+    if _video_jobs is None:
+        _load_video_subsystem()
+    return _video_jobs
+
+
+def _on_video_removed(path: str):
+    # כשהקטלוג עוד לא נטען אין מה לעדכן - רשומה של קובץ חסר מוסרת ממילא בשאילתה הבאה
+    if _video_generator is not None:
+        _video_generator.catalog.remove(os.path.basename(path))
+
+
+def start_background_tasks():
+    """ניקוי ברקע של temp_files/ ו-output_videos/ (size and age quotas).
+    threads לא שורדים fork - עם PRELOAD_APP זה נקרא מ-post_fork בכל worker"""
+    global disk_janitor
+    with _lazy_lock:
+        if disk_janitor is None:
+            disk_janitor = DiskJanitor(scratch_space, output_dir=OUTPUT_DIR, on_remove=_on_video_removed).start()
+    return disk_janitor
+
 
+def warm_up():
+    """טעינת המודולים הכבדים ו-products.json מראש (בתהליך האב של gunicorn, לפני ה-fork).
+    לא יוצר threads ולא אובייקטים עם מצב - רק קוד ונתונים לקריאה"""
+    started = time.perf_counter()
+    import video_generator  # noqa: F401 - moviepy, numpy, PIL, cv2
+    import video_jobs  # noqa: F401
+    import video_batch  # noqa: F401
+    get_fetcher('amazon')
+    get_product_manager()
+    _record_startup('preload_ms', started)
 
-# Video generation queue
-video_queue = {}
-video_status = {}
+# Video serving: '' (Flask streams the file), 'x-sendfile' (Apache/lighttpd) or 'x-accel' (nginx)
+VIDEO_OFFLOAD = os.getenv('VIDEO_OFFLOAD', '').lower()
+VIDEO_ACCEL_PREFIX = os.getenv('VIDEO_ACCEL_PREFIX', '/protected-videos/')  # nginx internal location
+VIDEO_CACHE_MAX_AGE = 365 * 24 * 3600  # fingerprinted URLs never change
+app.config['USE_X_SENDFILE'] = VIDEO_OFFLOAD == 'x-sendfile'
+
+# Server-Sent Events for job status (seconds / milliseconds)
+SSE_HEARTBEAT = float(os.getenv('SSE_HEARTBEAT', '15'))
+SSE_MIN_INTERVAL = float(os.getenv('SSE_MIN_INTERVAL', '0.5'))  # progress events are coalesced
+SSE_MAX_STREAM = float(os.getenv('SSE_MAX_STREAM', '300'))  # client reconnects after this
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', '3000'))
+
+if PRELOAD_APP:
+    warm_up()
+else:
+    start_background_tasks()
+
+_record_startup('import_ms', _import_started)
+
+# Prometheus metrics (GET /metrics) - each gunicorn worker keeps its own counters
+HTTP_SECONDS = metrics.histogram('http_request_duration_seconds', 'Flask request latency per route', ['method', 'route'])
+HTTP_REQUESTS = metrics.counter('http_requests', 'Flask requests per route and status', ['method', 'route', 'status'])
+
+
+# Request tracing (tracing.py): a span tree per request, appended to TRACE_FILE (traces.jsonl).
+# Static files and metric scrapes are not traced
+UNTRACED_ENDPOINTS = ('static', 'prometheus_metrics')
+
+
+def _request_id() -> str:
+    # an upstream X-Request-ID (proxy / load balancer) is kept so the logs line up
+    incoming = request.headers.get('X-Request-ID', '')
+    if incoming and len(incoming) <= 64 and all(c.isalnum() or c in '-_' for c in incoming):
+        return incoming
+    return tracing.new_trace_id()
+
+
+def _wants_debug_timing() -> bool:
+    if tracing.DEBUG_TIMING == 'always':
+        return True
+    return tracing.DEBUG_TIMING in ('1', 'true', 'yes') and bool(request.headers.get('X-Debug-Timing'))
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    if request.endpoint not in UNTRACED_ENDPOINTS:
+        g.trace = tracing.start_trace(f'{request.method} {request.path}', _request_id())
+
+
+def _finish_request_trace(status=None):
+    root, token = g.pop('trace', (None, None))
+    if root is None:
+        return None
+    if request.url_rule is not None:
+        root.set(route=request.url_rule.rule)
+    if status is not None:
+        root.set(status=status)
+    return tracing.finish_trace(root, token)
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # the URL rule, not the path, so /videos/<filename> is one series
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        HTTP_SECONDS.observe(time.perf_counter() - started, method=request.method, route=route)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=response.status_code)
+    root = _finish_request_trace(response.status_code)
+    if root is not None:
+        response.headers['X-Request-ID'] = root.trace_id
+        if _wants_debug_timing():
+            response.headers['X-Debug-Timing'] = tracing.timing_summary(root)
+    return response
+
+
+@app.teardown_request
+def _close_request_trace(error=None):
+    # after_request is skipped when it raises itself - never leak the span into the next request on this thread
+    _finish_request_trace()
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Counters, gauges and histograms in the Prometheus text format"""
+    return Response(metrics.REGISTRY.render(), mimetype=None, content_type=metrics.CONTENT_TYPE)
 
 
 @app.route('/')
@@ -105,7 +317,7 @@ def get_product(asin):
     """Get product by ASIN - first try saved products, then fetch from Amazon"""
     try:
         # First try to get from saved products
-        product = product_manager.get_product_by_asin(asin)
+        product = get_product_manager().get_product_by_asin(asin)
         if product:
             return jsonify({
                 'success': True,
@@ -142,7 +354,7 @@ def get_product_by_url():
         # Auto-detect store if not provided
         if not store:
             store = detect_store_from_url(product_url)
-            print(f"[API] Auto-detected store: {store}")
+            log.debug("Auto-detected store: %s", store)
         
         fetcher = get_fetcher(store)
         product = fetcher.fetch_product_by_url(product_url)
@@ -166,10 +378,19 @@ def generate_video():
         data = request.json
         product = data.get('product')
         asin = data.get('asin')
+        profile = data.get('profile') or DEFAULT_PROFILE
         
         if not product and not asin:
             return jsonify({'error': 'Product data or ASIN required'}), 400
         
+        if profile not in RENDER_PROFILES:
+            return jsonify({'error': f"Unknown render profile '{profile}'. Available: {', '.join(RENDER_PROFILES)}"}), 400
+        
+        try:
+            formats = parse_formats(data.get('formats'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # If only ASIN provided, fetch product
         if not product and asin:
             fetcher = get_fetcher('amazon')
@@ -183,83 +404,304 @@ def generate_video():
         video_id = "".join(c for c in video_id[:50] if c.isalnum() or c in (' ', '-', '_'))
         video_id = video_id.replace(' ', '_')
         
-        # Set status to processing
-        video_status[video_id] = {
-            'status': 'processing',
-            'message': 'Video generation started...'
-        }
-        
-        # Generate video in background thread
-        def generate():
-            try:
-                video_path = video_generator.create_product_video(product)
-                if video_path:
-                    filename = os.path.basename(video_path)
-                    video_status[video_id] = {
-                        'status': 'completed',
-                        'message': 'Video generated successfully',
-                        'filename': filename,
-                        'path': video_path
-                    }
-                else:
-                    video_status[video_id] = {
-                        'status': 'failed',
-                        'message': 'Video generation failed'
-                    }
-            except Exception as e:
-                video_status[video_id] = {
-                    'status': 'failed',
-                    'message': f'Error: {str(e)}'
-                }
-        
-        thread = threading.Thread(target=generate)
-        thread.daemon = True
-        thread.start()
+        # Quick preview first, full render queued in the background
+        preview = data.get('preview', True) not in (False, 'false', '0', 0)
+        job = get_video_jobs().submit(video_id, product, profile, preview=preview, formats=formats)
         
         return jsonify({
             'success': True,
             'video_id': video_id,
+            'profile': profile,
+            'formats': formats,
+            'preview': job['preview']['status'] != 'skipped',
             'message': 'Video generation started'
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/video/batch', methods=['POST'])
+def generate_video_batch():
+    """Generate videos for many saved products as one grouped job.
+    Body: {"asins": [...]} or {"query": "..."} or {"all": true}, plus optional profile / formats"""
+    try:
+        data = request.json or {}
+        asins = data.get('asins')
+        query = (data.get('query') or '').strip()
+        profile = data.get('profile') or DEFAULT_PROFILE
+        
+        if isinstance(asins, str):
+            asins = [asin.strip() for asin in asins.split(',') if asin.strip()]
+        if not asins and not query and not data.get('all'):
+            return jsonify({'error': 'asins, query or all required'}), 400
+        
+        if profile not in RENDER_PROFILES:
+            return jsonify({'error': f"Unknown render profile '{profile}'. Available: {', '.join(RENDER_PROFILES)}"}), 400
+        
+        try:
+            formats = parse_formats(data.get('formats'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        from video_batch import select_products, new_batch_id
+        items = select_products(get_product_manager(), asins=asins, query=query or None)
+        if not items:
+            return jsonify({'error': 'No products matched'}), 404
+        
+        # ASINs that are not in the saved catalog are fetched from the store when their turn comes
+        def fetch_product(asin):
+            return get_fetcher('amazon').fetch_product_by_url(f'https://www.amazon.com/dp/{asin}')
+        
+        batch_id = new_batch_id()
+        job = get_video_jobs().submit_batch(batch_id, items, profile, formats=formats, fetch_product=fetch_product)
+        
+        return jsonify({
+            'success': True,
+            'video_id': batch_id,
+            'batch_id': batch_id,
+            'total': job['total'],
+            'profile': profile,
+            'formats': formats,
+            'manifest_url': versioned_video_url(job['manifest']),
+            'message': 'Batch video generation started'
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/video/profiles')
+def list_render_profiles():
+    """List available render profiles"""
+    return jsonify({
+        'default': DEFAULT_PROFILE,
+        'profiles': [p.to_dict() for p in RENDER_PROFILES.values()],
+        'formats': {name: f'{w}:{h}' for name, (w, h) in OUTPUT_FORMATS.items()}
+    })
+
+
+def _file_version(path):
+    """Fingerprint of a file's current content (changes whenever the file is re-rendered)"""
+    stat = os.stat(path)
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+
+def versioned_video_url(filename):
+    """URL of a file in output_videos, fingerprinted with ?v= so it can be cached forever"""
+    try:
+        return url_for('serve_video', filename=filename,
+                       v=_file_version(os.path.join(app.config['UPLOAD_FOLDER'], filename)))
+    except OSError:
+        return url_for('serve_video', filename=filename)
+
+
+def _job_with_urls(status):
+    """Add direct links to whichever artifacts of a job are ready"""
+    if status.get('type') == 'batch':
+        status['manifest_url'] = versioned_video_url(status['manifest'])
+        for item in status['items']:
+            item['urls'] = {
+                output_format: versioned_video_url(filename)
+                for output_format, filename in item['videos'].items()
+            }
+        return status
+    for artifact in ('preview', 'final'):
+        filename = status[artifact].get('filename')
+        if filename:
+            status[artifact]['url'] = versioned_video_url(filename)
+    if 'files' in status['final']:
+        status['final']['urls'] = {
+            output_format: versioned_video_url(filename)
+            for output_format, filename in status['final']['files'].items()
+        }
+    return status
+
+
 @app.route('/api/video/status/<video_id>')
 def video_status_check(video_id):
-    """Check video generation status"""
-    status = video_status.get(video_id, {'status': 'not_found'})
-    return jsonify(status)
+    """Check video generation status (includes per-artifact progress and ETA)"""
+    status = get_video_jobs().get(video_id)
+    if status is None:
+        return jsonify({'status': 'not_found'})
+    return jsonify(_job_with_urls(status))
+
+
+@app.route('/api/video/events')
+def video_events():
+    """Server-Sent Events stream of status/progress changes for one or more jobs (?ids=a,b)"""
+    video_ids = [video_id for video_id in request.args.get('ids', '').split(',') if video_id]
+    if not video_ids:
+        return jsonify({'error': 'ids parameter required'}), 400
+    
+    from video_jobs import FINISHED_STATES
+    jobs = get_video_jobs()
+    
+    def stream():
+        # The full current state is sent on every (re)connect, so Last-Event-ID needs no replay
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        sent = {}
+        version = jobs.version
+        started = last_write = time.time()
+        while True:
+            for video_id in video_ids:
+                status = jobs.get(video_id)
+                status = _job_with_urls(status) if status else {'status': 'not_found'}
+                if sent.get(video_id) != status:
+                    sent[video_id] = status
+                    last_write = time.time()
+                    payload = json.dumps(dict(status, video_id=video_id))
+                    yield f"id: {version}\nevent: status\ndata: {payload}\n\n"
+            
+            if all(status['status'] in FINISHED_STATES + ('not_found',) for status in sent.values()):
+                yield "event: end\ndata: {}\n\n"
+                return
+            if time.time() - started > SSE_MAX_STREAM:
+                return  # EventSource reconnects by itself
+            if time.time() - last_write >= SSE_HEARTBEAT:
+                last_write = time.time()
+                yield ": heartbeat\n\n"  # keeps proxies from closing an idle stream
+            
+            # Coalesce per-frame progress updates, then block until something changes
+            time.sleep(SSE_MIN_INTERVAL)
+            version = jobs.wait_for_change(version, timeout=SSE_HEARTBEAT)
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',  # nginx: do not buffer the stream
+    })
+
+
+@app.route('/api/video/cancel/<video_id>', methods=['POST'])
+def cancel_video(video_id):
+    """Cancel a queued or running video job (partial files are removed)"""
+    status = get_video_jobs().cancel(video_id)
+    if status is None:
+        return jsonify({'error': 'Video job not found'}), 404
+    return jsonify(_job_with_urls(status))
+
+
+@app.route('/api/video/jobs')
+def list_video_jobs():
+    """List unfinished video jobs (for spotting a backed-up queue)"""
+    jobs = get_video_jobs().list_active()
+    return jsonify({
+        'count': len(jobs),
+        'jobs': {video_id: _job_with_urls(status) for video_id, status in jobs.items()}
+    })
+
+
+@app.route('/api/startup')
+def startup_timings():
+    """How long this worker took to import the app and to load each lazily-initialised part (ms; null = not loaded yet)"""
+    return jsonify(startup_report)
+
+
+@app.route('/api/storage')
+def storage_usage():
+    """Disk usage of temp_files/ and output_videos/ against their quotas, and bytes reclaimed so far"""
+    return jsonify(start_background_tasks().usage())
+
+
+# Admin-only endpoints are enabled by setting ADMIN_TOKEN; without it they answer 404
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+
+
+def _is_admin() -> bool:
+    if not ADMIN_TOKEN:
+        return False
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not supplied and request.headers.get('Authorization', '').startswith('Bearer '):
+        supplied = request.headers['Authorization'][len('Bearer '):].strip()
+    return hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+@app.route('/api/admin/profile')
+def sample_profile():
+    """Sample every thread of this worker (requests and render workers) for ?seconds=N and return
+    collapsed stacks - feed to flamegraph.pl, speedscope or inferno.
+    ?interval= seconds between samples, ?thread= only threads whose name contains it (e.g. video-render),
+    ?idle=1 keeps threads that are just waiting"""
+    if not _is_admin():
+        abort(404)
+    try:
+        profile = sampling_profiler.sample(
+            request.args.get('seconds', 10, type=float),
+            interval=request.args.get('interval', sampling_profiler.PROFILE_INTERVAL, type=float),
+            include_idle=request.args.get('idle') == '1',
+            thread_filter=request.args.get('thread') or None,
+        )
+    except sampling_profiler.ProfilerBusy:
+        return jsonify({'error': 'A profile is already running in this worker'}), 409
+    filename = f"profile_{profile['pid']}_{time.strftime('%Y%m%d_%H%M%S')}.folded"
+    return Response(sampling_profiler.collapsed(profile), mimetype='text/plain', headers={
+        'Content-Disposition': f'attachment; filename={filename}',
+        'X-Profile-Samples': str(profile['samples']),
+        'X-Profile-Seconds': str(profile['seconds']),
+        'X-Profile-PID': str(profile['pid']),
+    })
 
 
 @app.route('/api/videos')
 def list_videos():
-    """List all generated videos"""
+    """List generated videos from the catalog, newest first.
+    Filters: asin, profile, format, q (title / filename); pagination: page, per_page (max 200)"""
     try:
-        videos_dir = app.config['UPLOAD_FOLDER']
-        if not os.path.exists(videos_dir):
-            return jsonify({'videos': []})
+        try:
+            page = max(1, int(request.args.get('page', 1)))
+            per_page = min(200, max(1, int(request.args.get('per_page', 50))))
+        except ValueError:
+            return jsonify({'error': 'page and per_page must be integers'}), 400
+        
+        entries, total = get_video_generator().catalog.query(
+            asin=request.args.get('asin'),
+            profile=request.args.get('profile'),
+            output_format=request.args.get('format'),
+            search=request.args.get('q'),
+            offset=(page - 1) * per_page,
+            limit=per_page,
+        )
         
         videos = []
-        for filename in os.listdir(videos_dir):
-            if filename.endswith('.mp4'):
-                filepath = os.path.join(videos_dir, filename)
-                file_size = os.path.getsize(filepath)
-                videos.append({
-                    'filename': filename,
-                    'size': file_size,
-                    'url': url_for('serve_video', filename=filename)
-                })
+        for entry in entries:
+            video = dict(entry, url=versioned_video_url(entry['filename']))
+            # Poster JPEG / animated WebP next to the video, so grids don't have to load the MP4
+            for name in ('poster', 'preview'):
+                preview_filename = video.pop(name, None)
+                if preview_filename:
+                    video[f'{name}_url'] = versioned_video_url(preview_filename)
+            videos.append(video)
         
-        return jsonify({'videos': videos})
+        return jsonify({
+            'videos': videos,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total + per_page - 1) // per_page
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/videos/<filename>')
 def serve_video(filename):
-    """Serve video files"""
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    """Serve video files (byte ranges -> 206, ETag / Last-Modified revalidation, optional server offload)"""
+    path = safe_join(app.config['UPLOAD_FOLDER'], filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    
+    if VIDEO_OFFLOAD == 'x-accel':
+        # nginx serves the file itself (including Range) from an internal location
+        response = Response(status=200, mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = VIDEO_ACCEL_PREFIX + quote(filename)
+    else:
+        # With USE_X_SENDFILE the body is left to the front server as well
+        response = send_file(path, conditional=True, etag=True, max_age=0)
+    
+    # A ?v= that matches the file's fingerprint names immutable content; anything else revalidates
+    if request.args.get('v') == _file_version(path):
+        response.headers['Cache-Control'] = f'public, max-age={VIDEO_CACHE_MAX_AGE}, immutable'
+    else:
+        response.headers['Cache-Control'] = 'public, no-cache'
+    return response
 
 
 @app.route('/api/category', methods=['POST'])
@@ -290,7 +732,7 @@ def get_category_products():
 def get_saved_products():
     """Get all saved products"""
     try:
-        products = product_manager.get_all_products()
+        products = get_product_manager().get_all_products()
         return jsonify({
             'success': True,
             'products': products,
@@ -312,13 +754,13 @@ def add_product():
         # Use affiliate_link if provided, otherwise use url
         if affiliate_link and not product_url:
             product_url = affiliate_link
-            print("[API] Received affiliate link")
+            log.debug("Received affiliate link")
         
         # If URL provided, fetch product
         if product_url and not product_data:
             # Auto-detect store from URL
             store = detect_store_from_url(product_url)
-            print(f"[API] Auto-detected store: {store} for URL: {product_url[:50]}...")
+            log.debug("Auto-detected store: %s", store, extra={'url': product_url[:80]})
             
             fetcher = get_fetcher(store)
             
@@ -330,7 +772,7 @@ def add_product():
                 is_affiliate = 'aff_platform' in product_url or 'aff_trace_key' in product_url
             
             if is_affiliate:
-                print("[API] Processing affiliate link...")
+                log.debug("Processing affiliate link")
             
             product_data = fetcher.fetch_product_by_url(product_url)
             if not product_data:
@@ -340,7 +782,7 @@ def add_product():
             return jsonify({'error': 'Product data or URL required'}), 400
         
         # Add product
-        success = product_manager.add_product(product_data)
+        success = get_product_manager().add_product(product_data)
         
         if success:
             return jsonify({
@@ -352,8 +794,7 @@ def add_product():
         else:
             return jsonify({'error': 'Failed to save product'}), 500
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        log.exception("Error adding product: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -361,7 +802,7 @@ def add_product():
 def remove_product(asin):
     """Remove product from saved list"""
     try:
-        success = product_manager.remove_product(asin)
+        success = get_product_manager().remove_product(asin)
         if success:
             return jsonify({'success': True, 'message': 'Product removed'})
         else:
@@ -378,9 +819,9 @@ def search_saved_products():
         query = data.get('query', '')
         
         if not query:
-            products = product_manager.get_all_products()
+            products = get_product_manager().get_all_products()
         else:
-            products = product_manager.search_products(query)
+            products = get_product_manager().search_products(query)
         
         return jsonify({
             'success': True,
@@ -409,7 +850,7 @@ def import_products():
             tmp_path = tmp.name
         
         # Import products
-        count = product_manager.import_from_file(tmp_path)
+        count = get_product_manager().import_from_file(tmp_path)
         
         # Cleanup
         os.unlink(tmp_path)
@@ -430,7 +871,7 @@ def export_products():
         import tempfile
         tmp_path = tempfile.mktemp(suffix='.json')
         
-        success = product_manager.export_to_file(tmp_path)
+        success = get_product_manager().export_to_file(tmp_path)
         
         if success:
             from flask import send_file
@@ -475,10 +916,10 @@ def update_product(asin):
         if 'discount' in data:
             updates['discount'] = data['discount']
         
-        success = product_manager.update_product(asin, updates)
+        success = get_product_manager().update_product(asin, updates)
         
         if success:
-            updated_product = product_manager.get_product_by_asin(asin)
+            updated_product = get_product_manager().get_product_by_asin(asin)
             return jsonify({
                 'success': True,
                 'message': 'Product updated successfully',
@@ -612,6 +1053,11 @@ def translate_text():
 
 
 if __name__ == '__main__':
+    # python app.py --profile-startup [bench_startup options] - זמני import ועלייה, בלי להפעיל את השרת
+    if '--profile-startup' in sys.argv:
+        import bench_startup
+        sys.exit(bench_startup.main([arg for arg in sys.argv[1:] if arg != '--profile-startup']))
+    
     # Create necessary directories
     os.makedirs('output_videos', exist_ok=True)
     os.makedirs('temp_files', exist_ok=True)
@@ -0,0 +1,360 @@
+"""
+מדידת ביצועים מקצה לקצה של VideoGenerator: תמונה בודדת, מצגת וסרטון מוצר, לכל פרופיל רינדור.
+קבצי fixture מקומיים (נוצרים פעם אחת, דטרמיניסטיים) מוגשים משרת HTTP מקומי - כך נמדד גם נתיב ההורדה.
+כל מקרה רץ בתהליך נפרד (peak RSS לכל מקרה), התוצאות נכתבות ל-JSON ומושוות ל-baseline שמור
+End-to-end render benchmark - wall / CPU time, peak RSS and encode fps per render path and profile, with baseline regression checks
+"""
+# -*- coding: utf-8 -*-
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+FIXTURES_DIR = 'bench_fixtures'
+BASELINE_FILE = 'bench_baseline.json'
+DEFAULT_PROFILES = ['preview', 'standard']
+PATHS = ['single_image', 'slideshow', 'product_video']
+
+# מוצרים לדוגמה; {base} מוחלף בכתובת השרת המקומי
+FIXTURE_PRODUCTS = {
+    'single_image': {
+        'title': 'Wireless Noise Cancelling Headphones with 40 Hour Battery Life',
+        'price': '$79.99', 'original_price': '$129.99', 'discount': '38%',
+        'rating': 4.6, 'reviews_count': 12873,
+        'image_url': '{base}/product_0.jpg',
+        'affiliate_url': 'https://www.amazon.com/dp/B0BENCH001',
+    },
+    'slideshow': {
+        'title': 'Stainless Steel Insulated Water Bottle, 32 oz',
+        'price': '$24.95', 'original_price': '$34.95', 'discount': '29%',
+        'rating': 4.8, 'reviews_count': 5310,
+        'image_url': '{base}/product_0.jpg',
+        'image_urls': ['{base}/product_0.jpg', '{base}/product_1.jpg', '{base}/product_2.jpg', '{base}/product_3.jpg'],
+        'affiliate_url': 'https://www.amazon.com/dp/B0BENCH002',
+    },
+    'product_video': {
+        'title': 'Portable Blender for Shakes and Smoothies',
+        'price': '$29.99', 'original_price': '', 'discount': '',
+        'rating': 4.3, 'reviews_count': 2204,
+        'image_url': '{base}/product_0.jpg',
+        'video_url': '{base}/product_video.mp4',
+        'affiliate_url': 'https://www.amazon.com/dp/B0BENCH003',
+    },
+}
+
+# אחוז שינוי מותר מול ה-baseline; הכיוון: כמה עלייה (זמן, זיכרון) או ירידה (fps) נחשבת רגרסיה
+DEFAULT_THRESHOLDS = {'wall_s': 20.0, 'cpu_s': 20.0, 'peak_rss_mb': 15.0, 'encode_fps': 20.0}
+HIGHER_IS_BETTER = {'encode_fps'}
+
+
+# --- fixtures ---
+
+def create_fixtures(directory: str = FIXTURES_DIR) -> str:
+    """תמונות מוצר (1000x1000) וסרטון מוצר (720x1280, 10 שניות); נוצרים רק אם חסרים"""
+    os.makedirs(directory, exist_ok=True)
+    for index in range(4):
+        path = os.path.join(directory, f'product_{index}.jpg')
+        if os.path.exists(path):
+            continue
+        ys, xs = np.mgrid[0:1000, 0:1000]
+        image = np.zeros((1000, 1000, 3), dtype=np.uint8)
+        image[..., 0] = (xs * 255 // 1000 + index * 60) % 256
+        image[..., 1] = (ys * 255 // 1000)
+        image[..., 2] = ((xs // 50 + ys // 50 + index) % 2) * 180
+        picture = Image.fromarray(image)
+        draw = ImageDraw.Draw(picture)
+        draw.ellipse((250, 250, 750, 750), fill=(240, 240, 240), outline=(20, 20, 20), width=12)
+        draw.rectangle((400, 150 + index * 40, 600, 350 + index * 40), fill=(30, 90, 200))
+        picture.save(path, quality=90)
+    
+    video_path = os.path.join(directory, 'product_video.mp4')
+    if not os.path.exists(video_path):
+        from moviepy.config import get_setting
+        subprocess.run([
+            get_setting('FFMPEG_BINARY'), '-y', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'testsrc2=size=720x1280:rate=30', '-t', '10',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '-movflags', '+faststart', video_path,
+        ], check=True)
+    return directory
+
+
+def serve_fixtures(directory: str) -> ThreadingHTTPServer:
+    """שרת HTTP מקומי לתיקיית ה-fixtures (פורט פנוי); server.base_url היא הכתובת"""
+    handler = functools.partial(_QuietHandler, directory=os.path.abspath(directory))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, name='bench-fixtures', daemon=True).start()
+    return server
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """קבצים סטטיים עם תמיכה ב-Range (כמו CDN) - ffmpeg מדלג בסרטון המוצר ומלופף אותו"""
+    
+    def send_head(self):
+        range_header = self.headers.get('Range', '')
+        path = self.translate_path(self.path)
+        if not range_header.startswith('bytes=') or not os.path.isfile(path):
+            return super().send_head()
+        size = os.path.getsize(path)
+        start, _, end = range_header[len('bytes='):].partition('-')
+        start = int(start or 0)
+        end = min(int(end), size - 1) if end else size - 1
+        if start >= size:
+            self.send_error(416)
+            return None
+        f = open(path, 'rb')
+        f.seek(start)
+        self.send_response(206)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        self._remaining = end - start + 1
+        return f
+    
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, '_remaining', None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        self._remaining = None
+        while remaining > 0:
+            chunk = source.read(min(64 * 1024, remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def fixture_product(path: str, base_url: str) -> Dict:
+    product = json.loads(json.dumps(FIXTURE_PRODUCTS[path]).replace('{base}', base_url))
+    product['asin'] = product['affiliate_url'].rsplit('/', 1)[-1]
+    return product
+
+
+# --- מקרה אחד (בתהליך נפרד) ---
+
+def run_case(path: str, profile: str, formats: List[str], base_url: str, repeat: int) -> Dict:
+    """רינדור repeat פעמים בתהליך הזה; הריצה המהירה מדווחת, ו-peak RSS הוא של כל התהליך"""
+    import resource
+    
+    work_dir = tempfile.mkdtemp(prefix='bench_render_')
+    # קטלוג הסרטונים ותיקיות הפלט של הריצה - לא של השרת
+    os.environ['VIDEO_CATALOG'] = os.path.join(work_dir, 'videos.json')
+    from template_compositor import RenderMonitor
+    from video_generator import VideoGenerator
+    
+    generator = VideoGenerator(output_dir=os.path.join(work_dir, 'out'), temp_dir=os.path.join(work_dir, 'tmp'))
+    product = fixture_product(path, base_url)
+    runs = []
+    for _ in range(repeat):
+        encode = {'started': None, 'ended': None, 'frames': 0}
+        
+        def on_progress(phase: str, done: float, total: float):
+            if phase != 'encode':
+                return
+            now = time.perf_counter()
+            if encode['started'] is None:
+                encode['started'] = now
+            encode['ended'] = now
+            encode['frames'] = max(encode['frames'], int(total or done))
+        
+        self_before = resource.getrusage(resource.RUSAGE_SELF)
+        children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        started = time.perf_counter()
+        videos = generator.create_product_videos(product, formats=formats, profile=profile,
+                                                  monitor=RenderMonitor(on_progress=on_progress))
+        wall = time.perf_counter() - started
+        self_after = resource.getrusage(resource.RUSAGE_SELF)
+        children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        if not videos:
+            raise RuntimeError(f'{path}/{profile}: render failed')
+        
+        encode_seconds = (encode['ended'] or 0) - (encode['started'] or 0)
+        frames = encode['frames'] * len(formats)
+        runs.append({
+            'wall_s': round(wall, 3),
+            'cpu_s': round((self_after.ru_utime + self_after.ru_stime) - (self_before.ru_utime + self_before.ru_stime), 3),
+            # ffmpeg (מקודדים, פענוח סרטון המוצר) - תהליכים נפרדים
+            'ffmpeg_cpu_s': round((children_after.ru_utime + children_after.ru_stime)
+                                  - (children_before.ru_utime + children_before.ru_stime), 3),
+            'frames': frames,
+            'encode_fps': round(frames / encode_seconds, 1) if encode_seconds > 0 else None,
+            'output_bytes': sum(os.path.getsize(video) for video in videos.values()),
+        })
+    
+    shutil.rmtree(work_dir, ignore_errors=True)
+    best = min(runs, key=lambda run: run['wall_s'])
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss ב-KB בלינוקס, בבתים ב-macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    best.update({
+        'peak_rss_mb': round(usage.ru_maxrss / scale, 1),
+        'ffmpeg_peak_rss_mb': round(children.ru_maxrss / scale, 1),
+        'runs': len(runs),
+    })
+    return best
+
+
+def measure(path: str, profile: str, formats: List[str], base_url: str, repeat: int) -> Optional[Dict]:
+    command = [sys.executable, os.path.abspath(__file__), '--run-case', path, '--profiles', profile,
+               '--formats', *formats, '--base-url', base_url, '--repeat', str(repeat)]
+    env = dict(os.environ, LOG_LEVEL=os.getenv('LOG_LEVEL', 'WARNING'), TRACE_FILE='')
+    result = subprocess.run(command, capture_output=True, text=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=1800)
+    for line in result.stdout.splitlines():
+        if line.startswith('@@'):
+            return json.loads(line[2:])
+    print(f"[X] {path}/{profile} failed:\n{(result.stderr or result.stdout)[-2000:]}")
+    return None
+
+
+# --- השוואה ל-baseline ---
+
+def compare(results: Dict, baseline: Dict, thresholds: Dict[str, float]) -> List[str]:
+    """רשימת רגרסיות (ריקה = הכול בתוך הספים). מקרים שאין להם baseline לא נבדקים"""
+    regressions = []
+    for case, current in results['cases'].items():
+        reference = baseline.get('cases', {}).get(case)
+        if not reference:
+            continue
+        for metric, limit in thresholds.items():
+            old, new = reference.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > limit:
+                regressions.append(f"{case} {metric}: {old} -> {new} ({change:+.1f}% worse, limit {limit:.0f}%)")
+    return regressions
+
+
+def _delta(current: Dict, reference: Optional[Dict], metric: str) -> str:
+    if not reference or not reference.get(metric) or current.get(metric) is None:
+        return ''
+    return f"{(current[metric] - reference[metric]) / reference[metric] * 100:+.0f}%"
+
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for value in values or []:
+        metric, _, limit = value.partition('=')
+        if metric not in DEFAULT_THRESHOLDS or not limit:
+            raise SystemExit(f"Bad --threshold {value!r}; expected one of {', '.join(DEFAULT_THRESHOLDS)}=<percent>")
+        thresholds[metric] = float(limit)
+    return thresholds
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end VideoGenerator benchmark with baseline comparison')
+    parser.add_argument('--paths', nargs='+', default=PATHS, choices=PATHS, help='render paths (default: all)')
+    parser.add_argument('--profiles', nargs='+', default=DEFAULT_PROFILES,
+                        help='render profiles (default: preview standard; add final for the full-quality path)')
+    parser.add_argument('--formats', nargs='+', default=['vertical'], help='output formats per render (default: vertical)')
+    parser.add_argument('--repeat', type=int, default=3, help='renders per case, fastest is reported (default: 3)')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='fixture directory, created if missing')
+    parser.add_argument('--json', dest='json_path', default=None, help='write results to this file')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f'baseline to compare against (default: {BASELINE_FILE})')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--threshold', action='append', metavar='METRIC=PERCENT',
+                        help='allowed regression, e.g. wall_s=10 or encode_fps=15 (defaults: '
+                             + ', '.join(f'{metric}={limit:.0f}' for metric, limit in DEFAULT_THRESHOLDS.items()) + ')')
+    parser.add_argument('--run-case', choices=PATHS, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.run_case:
+        # תהליך הילד: מקרה אחד, תוצאה בשורה אחת ל-stdout
+        print('@@' + json.dumps(run_case(args.run_case, args.profiles[0], args.formats, args.base_url, args.repeat)))
+        return 0
+    
+    thresholds = parse_thresholds(args.threshold)
+    server = serve_fixtures(create_fixtures(args.fixtures))
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    
+    print("=" * 60)
+    print(f"Render benchmark - formats: {', '.join(args.formats)}, repeat: {args.repeat}")
+    print("=" * 60)
+    print(f"{'case':<26} {'wall':>8} {'cpu':>8} {'ffmpeg':>8} {'rss':>8} {'fps':>7}   vs baseline (wall / fps)")
+    
+    results = {'environment': environment(), 'formats': args.formats, 'cases': {}}
+    failed = False
+    try:
+        for path in args.paths:
+            for profile in args.profiles:
+                case = f'{path}/{profile}'
+                result = measure(path, profile, args.formats, server.base_url, args.repeat)
+                if result is None:
+                    failed = True
+                    continue
+                results['cases'][case] = result
+                reference = baseline.get('cases', {}).get(case)
+                fps = f"{result['encode_fps']:7.1f}" if result['encode_fps'] else f"{'-':>7}"
+                print(f"{case:<26} {result['wall_s']:7.2f}s {result['cpu_s']:7.2f}s {result['ffmpeg_cpu_s']:7.2f}s "
+                      f"{result['peak_rss_mb']:6.0f}MB {fps}   "
+                      f"{_delta(result, reference, 'wall_s'):>5} / {_delta(result, reference, 'encode_fps'):>5}")
+    finally:
+        server.shutdown()
+    
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[OK] Results written to {args.json_path}")
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"[OK] Baseline saved to {args.baseline}")
+        return 1 if failed else 0
+    
+    if not baseline:
+        print(f"\n[!] No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 1 if failed else 0
+    regressions = compare(results, baseline, thresholds)
+    if regressions:
+        print(f"\n[X] {len(regressions)} regression(s) against {args.baseline} "
+              f"(commit {baseline.get('environment', {}).get('commit')}):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\n[OK] Within thresholds of {args.baseline}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+מדידת זמן עלייה: זמן import לכל מודול, טעינת products.json לפי גודל הקטלוג, וזמן עד הבקשה הראשונה
+Startup profiling: per-module import time, ProductManager load vs catalog size, time to first request
+"""
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from product_manager import ProductManager
+
+
+# ספריות כבדות ומודולים של הפרויקט; מה שלא מותקן מדולג
+MODULES = [
+    'moviepy.editor', 'numpy', 'PIL.Image', 'cv2', 'bs4', 'requests', 'pandas', 'flask',
+    'product_fetcher', 'template_compositor', 'video_generator', 'video_jobs', 'app',
+]
+CATALOG_SIZES = [100, 1000, 10000]
+
+# רץ בתהליך נפרד: import של app ואז בקשות דרך test_client, כל אחת עם הזמן מתחילת התהליך
+FIRST_REQUEST_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+import app
+timings = {'import app': time.perf_counter() - started}
+client = app.app.test_client()
+for url in %r:
+    request_started = time.perf_counter()
+    status = client.get(url).status_code
+    timings['GET ' + url] = time.perf_counter() - request_started
+    timings['GET ' + url + ' (since start)'] = time.perf_counter() - started
+    timings['GET ' + url + ' status'] = status
+print('@@' + json.dumps(timings))
+'''
+
+
+def _python(code: str, *flags, env=None) -> subprocess.CompletedProcess:
+    """תהליך Python נקי (import שכבר נטען לא נמדד שוב)"""
+    return subprocess.run([sys.executable, *flags, '-c', code], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)), env=env, timeout=300)
+
+
+def measure_import(module: str, repeat: int = 3):
+    """זמן import מצטבר של מודול (הטוב מבין כמה ריצות) ו-5 תתי-המודולים עם זמן ה-self הגבוה ביותר"""
+    best, heaviest = None, []
+    for _ in range(repeat):
+        result = _python(f'import {module}', '-X', 'importtime')
+        if result.returncode != 0:
+            return None, []
+        rows = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            rows.append((int(self_us), int(cumulative_us), name.strip()))
+        # השורה של המודול עצמו היא האחרונה
+        total = rows[-1][1] / 1000.0 if rows else 0.0
+        if best is None or total < best:
+            best = total
+            heaviest = sorted(rows, key=lambda row: row[0], reverse=True)[:5]
+    return best, [(name, self_us / 1000.0) for self_us, _, name in heaviest]
+
+
+def synthetic_catalog(path: str, size: int):
+    """products.json עם size מוצרים (על בסיס המוצרים השמורים, או מוצר לדוגמה)"""
+    samples = ProductManager().get_all_products() or [{
+        'title': 'Sample product', 'price': '$19.99', 'original_price': '$29.99', 'rating': '4.5',
+        'image_url': 'https://example.com/image.jpg', 'affiliate_url': 'https://www.amazon.com/dp/B000000000',
+    }]
+    products = []
+    for i in range(size):
+        product = dict(samples[i % len(samples)])
+        product['asin'] = f'B{i:09d}'
+        products.append(product)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'last_updated': None, 'products': products}, f, ensure_ascii=False, indent=2)
+
+
+def measure_catalog(size: int, repeat: int = 3) -> float:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'products.json')
+        synthetic_catalog(path, size)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            ProductManager(path)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+
+def measure_first_request(urls, preload: bool):
+    env = dict(os.environ, PRELOAD_APP='1' if preload else '0')
+    result = _python(FIRST_REQUEST_SCRIPT % (list(urls),), env=env)
+    for line in result.stdout.splitlines():
+        if line.startswith('@@'):
+            return json.loads(line[2:])
+    print(f"[!] First-request run failed:\n{result.stderr[-2000:]}")
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Profile import time and startup of the web app')
+    parser.add_argument('--modules', nargs='+', default=MODULES, help='modules to time (default: heavy libs + app)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=CATALOG_SIZES,
+                        help='products.json sizes to time ProductManager against (default: 100 1000 10000)')
+    parser.add_argument('--urls', nargs='+', default=['/', '/api/products/saved', '/api/videos'],
+                        help='requests timed after import (the last one loads the video subsystem)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement, best is reported (default: 3)')
+    parser.add_argument('--max-app-import-ms', type=float, default=None,
+                        help='exit with status 1 if "import app" is slower than this (for catching regressions)')
+    parser.add_argument('--json', dest='json_path', default=None, help='also write the report to this file')
+    args = parser.parse_args(argv)
+    
+    print("=" * 60)
+    print("Startup profile")
+    print("=" * 60)
+    
+    # 1. import לכל מודול, מהאיטי למהיר
+    imports = {}
+    heaviest = {}
+    for module in args.modules:
+        total, rows = measure_import(module, args.repeat)
+        if total is None:
+            print(f"[SKIP] {module}: not installed")
+            continue
+        imports[module] = total
+        heaviest[module] = rows
+    print(f"\n{'module':<24} {'import':>10}")
+    for module, total in sorted(imports.items(), key=lambda item: item[1], reverse=True):
+        print(f"{module:<24} {total:8.1f}ms")
+    if 'app' in heaviest:
+        print("\nSlowest modules imported by app (self time):")
+        for name, self_ms in heaviest['app']:
+            print(f"  {name:<40} {self_ms:8.1f}ms")
+    
+    # 2. ProductManager מול גודל הקטלוג
+    catalog = {size: measure_catalog(size, args.repeat) for size in args.sizes}
+    print(f"\n{'products.json size':<24} {'load':>10}")
+    for size, elapsed in catalog.items():
+        print(f"{size:<24} {elapsed:8.1f}ms")
+    
+    # 3. זמן עד הבקשה הראשונה - טעינה עצלה מול PRELOAD_APP (כמו תהליך האב של gunicorn)
+    first_request = {}
+    for label, preload in (('lazy', False), ('preload', True)):
+        timings = measure_first_request(args.urls, preload)
+        if timings is None:
+            continue
+        first_request[label] = timings
+        print(f"\nFirst requests ({label}):")
+        print(f"  {'import app':<30} {timings['import app'] * 1000:8.1f}ms")
+        for url in args.urls:
+            print(f"  {'GET ' + url:<30} {timings['GET ' + url] * 1000:8.1f}ms  "
+                  f"(served {timings['GET ' + url + ' (since start)'] * 1000:.0f}ms after start, "
+                  f"status {timings['GET ' + url + ' status']})")
+    
+    report = {
+        'imports_ms': imports,
+        'app_heaviest_self_ms': heaviest.get('app', []),
+        'product_manager_ms': catalog,
+        'first_request_s': first_request,
+    }
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Report written to {args.json_path}")
+    
+    if args.max_app_import_ms is not None and imports.get('app', 0) > args.max_app_import_ms:
+        print(f"\n[X] import app took {imports['app']:.0f}ms (limit {args.max_app_import_ms:.0f}ms)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,9 @@ if sys.platform == 'win32':
 
 from product_fetcher import get_fetcher
 from video_generator import VideoGenerator
+from log_config import configure_logging
+
+configure_logging()
 
 
 def example_basic_usage():
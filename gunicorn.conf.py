@@ -0,0 +1,26 @@
+"""
+הגדרות gunicorn - gunicorn app:app -c gunicorn.conf.py
+עם preload_app האפליקציה והמודולים הכבדים (moviepy, numpy, PIL, products.json) נטענים פעם אחת בתהליך האב,
+וה-workers נוצרים ממנו ב-fork וחולקים את הדפים בזיכרון (copy-on-write) במקום לטעון כל אחד בעצמו
+"""
+# -*- coding: utf-8 -*-
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+# gthread נדרש ל-SSE: כל לשונית פתוחה מחזיקה חיבור
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '16'))
+
+# PRELOAD_APP=0 - כל worker טוען את האפליקציה בעצמו (והמודולים הכבדים נטענים בשימוש הראשון)
+preload_app = os.getenv('PRELOAD_APP', '1').lower() in ('1', 'true', 'yes')
+# app.py קורא את המשתנה כשהוא נטען: מחמם מראש ולא מפעיל threads בתהליך האב
+os.environ['PRELOAD_APP'] = '1' if preload_app else '0'
+
+
+def post_fork(server, worker):
+    # threads לא שורדים fork - ה-janitor מופעל בכל worker אחרי שנוצר
+    if preload_app:
+        import app
+        app.startup_report['pid'] = os.getpid()
+        app.start_background_tasks()
@@ -0,0 +1,617 @@
+"""
+בדיקת עומס ל-API של האתר: gunicorn אמיתי מול שרת stub מקומי שמגיש דפי Amazon/AliExpress מוקלטים,
+כך שהמשיכה, הפענוח, השמירה והרינדור רצים כמו בייצור - בלי רשת ובלי חסימות של החנויות.
+לכל רמת מקביליות: זמני תגובה p50/p95/p99 ותפוקה (בקשות בשנייה) לכל תרחיש, לתכנון הקיבולת של הפריסה
+Load-test harness - closed-loop clients against gunicorn with the stores stubbed (STORE_STUB_URL), latency percentiles and throughput
+"""
+# -*- coding: utf-8 -*-
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from metrics import percentile
+
+
+PAGES_DIR = 'loadtest_pages'
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# תרחיש -> משקל; --scenarios מחליף (למשל saved=5 generate=1)
+SCENARIO_SETS = {
+    'mixed': {'saved': 30, 'search': 20, 'product_saved': 20, 'product_fetch': 10,
+              'add_amazon': 8, 'add_aliexpress': 4, 'generate': 2},
+    'read': {'saved': 50, 'search': 25, 'product_saved': 25},
+    'scrape': {'product_fetch': 50, 'add_amazon': 35, 'add_aliexpress': 15},
+    'render': {'generate': 1},
+}
+
+# מוצרים חדשים (add / product_fetch) נבחרים מתוך מאגר קבוע - הקטלוג גדל עד גודל המאגר ולא בלי סוף
+NEW_PRODUCTS_POOL = 500
+
+TITLE_WORDS = ['Wireless', 'Portable', 'Stainless', 'Smart', 'Bluetooth', 'Ergonomic', 'Waterproof', 'Compact',
+               'Headphones', 'Blender', 'Water Bottle', 'Desk Lamp', 'Backpack', 'Keyboard', 'Speaker', 'Charger',
+               'Kitchen Scale', 'Yoga Mat', 'Phone Stand', 'Air Fryer']
+
+
+# --- דפי החנויות ---
+
+# דף Amazon סינתטי עם כל הסלקטורים שה-fetcher מחפש; {padding} מנפח אותו לגודל של דף אמיתי (פענוח ה-HTML נמדד)
+AMAZON_PAGE = """<!DOCTYPE html>
+<html lang="en-us"><head><meta charset="utf-8"><title>Amazon.com: {title}</title>
+<meta name="description" content="{title} - loadtest stub page">
+<script type="application/ld+json">{ld_json}</script></head>
+<body><div id="dp-container">
+<div id="titleSection"><h1 id="title"><span id="productTitle" class="a-size-large product-title-word-break">{title}</span></h1></div>
+<div id="averageCustomerReviews"><span id="acrPopover"><span class="a-icon-alt">{rating} out of 5 stars</span></span>
+<span id="acrCustomerReviewText">{reviews} ratings</span></div>
+<div id="corePrice_feature_div"><span class="a-price" data-a-color="base"><span class="a-offscreen">${price}</span></span>
+<span class="a-price a-text-price"><span class="a-offscreen">${original_price}</span></span></div>
+<div id="imageBlock_feature_div"><div id="main-image-container">
+<img id="landingImage" src="{base}/images/product_0.jpg" alt="{title}"></div>
+<div id="altImages"><ul>{thumbnails}</ul></div></div>
+<div id="feature-bullets"><ul class="a-unordered-list">{bullets}</ul></div>
+{padding}
+</div></body></html>
+"""
+
+ALIEXPRESS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - AliExpress</title>
+<meta property="og:image" content="{base}/images/product_1.jpg">
+<meta name="description" content="{title} - loadtest stub page"></head>
+<body><div class="product-main">
+<h1 data-pl="product-title">{title}</h1>
+<div class="product-price"><span class="price-current">US ${price}</span>
+<span class="price-original">US ${original_price}</span></div>
+<div class="overview-rating-average">{rating}</div><a class="reviews-count">{reviews} Reviews</a>
+<div class="image-view-magnifier-wrap"><img class="magnifier-image" src="{base}/images/product_1.jpg"></div>
+{padding}
+</div></body></html>
+"""
+
+
+def _stub_product(product_id: str) -> Dict:
+    """נתוני מוצר דטרמיניסטיים לכל מזהה - אותו ASIN מחזיר תמיד אותו דף"""
+    rng = random.Random(product_id)
+    price = round(rng.uniform(9, 199), 2)
+    return {
+        'title': f"Loadtest {' '.join(rng.sample(TITLE_WORDS, 3))} {product_id}",
+        'price': f'{price:.2f}',
+        'original_price': f'{price * rng.uniform(1.1, 1.6):.2f}',
+        'rating': round(rng.uniform(3.5, 5), 1),
+        'reviews': rng.randint(10, 50000),
+    }
+
+
+def _padding(kb: int) -> str:
+    """סימון מוצרים קשורים (כמו בדף אמיתי) עד לגודל המבוקש"""
+    block = ('<div class="a-carousel-card"><a class="a-link-normal" href="/dp/B0PADDING0"><span class="a-size-base">'
+             'Customers also viewed this item</span></a><span class="a-price"><span class="a-offscreen-x">$1.00</span>'
+             '</span></div>\n')
+    return '<div id="similarities_feature_div">' + block * max(0, kb * 1024 // len(block)) + '</div>'
+
+
+def synthetic_page(store: str, product_id: str, base_url: str, padding_kb: int) -> str:
+    product = _stub_product(product_id)
+    if store == 'amazon':
+        images = [f'{base_url}/images/product_{index}.jpg' for index in range(3)]
+        ld_json = json.dumps({
+            '@context': 'https://schema.org', '@type': 'Product', 'name': product['title'], 'image': images,
+            'offers': {'@type': 'Offer', 'price': product['price'], 'priceCurrency': 'USD'},
+        })
+        return AMAZON_PAGE.format(
+            base=base_url, ld_json=ld_json, padding=_padding(padding_kb),
+            thumbnails=''.join(f'<li><img src="{url}"></li>' for url in images[1:]),
+            bullets=''.join(f'<li><span class="a-list-item">Feature {index} of {product["title"]}</span></li>'
+                            for index in range(5)),
+            **product,
+        )
+    return ALIEXPRESS_PAGE.format(base=base_url, padding=_padding(padding_kb), **product)
+
+
+def _product_image(index: int) -> bytes:
+    from PIL import Image, ImageDraw
+    
+    picture = Image.new('RGB', (800, 800), ((index * 70) % 256, 120, 200 - index * 40))
+    draw = ImageDraw.Draw(picture)
+    draw.ellipse((150, 150, 650, 650), fill=(240, 240, 240), outline=(20, 20, 20), width=10)
+    draw.rectangle((320, 100 + index * 60, 480, 300 + index * 60), fill=(30, 90, 200))
+    buffer = io.BytesIO()
+    picture.save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class StubStore:
+    """שרת ה-stub: /<host>/<path> של החנות (כמו ש-StubStoreAdapter ב-product_fetcher שולח) ותמונות המוצרים.
+    דף מוקלט ב-loadtest_pages/<store>/<id>.html (או default.html) מוגש כמו שהוא; אחרת דף סינתטי"""
+    
+    def __init__(self, pages_dir: str = PAGES_DIR, latency_ms: float = 0, padding_kb: int = 400,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.pages_dir = pages_dir
+        self.latency_ms = latency_ms
+        self.padding_kb = padding_kb
+        self.hits: Counter = Counter()
+        self._lock = threading.Lock()
+        self._images = {f'product_{index}.jpg': _product_image(index) for index in range(3)}
+        self._pages: Dict = {}
+        
+        stub = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                stub.handle(self)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f'http://{host}:{self.server.server_address[1]}'
+    
+    def start(self) -> 'StubStore':
+        threading.Thread(target=self.server.serve_forever, name='loadtest-stub', daemon=True).start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _count(self, kind: str):
+        with self._lock:
+            self.hits[kind] += 1
+    
+    def _page(self, store: str, product_id: str) -> bytes:
+        for name in (f'{product_id}.html', 'default.html'):
+            path = os.path.join(self.pages_dir, store, name)
+            if os.path.isfile(path):
+                key = path
+                break
+        else:
+            key = (store, product_id)
+        page = self._pages.get(key)
+        if page is None:
+            if isinstance(key, tuple):
+                page = synthetic_page(store, product_id, self.base_url, self.padding_kb).encode('utf-8')
+            else:
+                with open(key, 'rb') as f:
+                    page = f.read()
+            self._pages[key] = page
+        return page
+    
+    def handle(self, request: BaseHTTPRequestHandler):
+        path = urlparse(request.path).path
+        if self.latency_ms:
+            # זמן תגובה של החנות (±50%) - ה-workers של gunicorn מחכים לו כמו בייצור
+            time.sleep(self.latency_ms * random.uniform(0.5, 1.5) / 1000)
+        
+        body, content_type, kind = None, 'text/html; charset=utf-8', 'not_found'
+        image = re.match(r'^/images/([\w.]+)$', path)
+        amazon = re.search(r'amazon\.[^/]+/(?:.*/)?(?:dp|gp/product)/([A-Z0-9]{10})', path)
+        aliexpress = re.search(r'aliexpress\.[^/]+/item/(\d+)\.html', path)
+        if image and image.group(1) in self._images:
+            body, content_type, kind = self._images[image.group(1)], 'image/jpeg', 'image'
+        elif amazon:
+            body, kind = self._page('amazon', amazon.group(1)), 'amazon'
+        elif aliexpress:
+            body, kind = self._page('aliexpress', aliexpress.group(1)), 'aliexpress'
+        self._count(kind)
+        
+        if body is None:
+            request.send_error(404)
+            return
+        request.send_response(200)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+def record_page(url: str, pages_dir: str = PAGES_DIR, default: bool = False) -> str:
+    """שמירת דף מוצר אמיתי ל-loadtest_pages/<store>/<id>.html (default.html - לכל מזהה שאין לו דף משלו)"""
+    asin = re.search(r'/(?:dp|gp/product)/([A-Z0-9]{10})', url)
+    item = re.search(r'/item/(\d+)\.html', url)
+    if asin and 'amazon.' in url:
+        store, product_id = 'amazon', asin.group(1)
+    elif item and 'aliexpress.' in url:
+        store, product_id = 'aliexpress', item.group(1)
+    else:
+        raise ValueError(f'Not an Amazon /dp/ or AliExpress /item/ URL: {url}')
+    response = requests.get(url, timeout=30, headers={
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+    })
+    response.raise_for_status()
+    os.makedirs(os.path.join(pages_dir, store), exist_ok=True)
+    path = os.path.join(pages_dir, store, 'default.html' if default else f'{product_id}.html')
+    with open(path, 'wb') as f:
+        f.write(response.content)
+    return path
+
+
+# --- השרת הנבדק ---
+
+def seed_catalog(path: str, size: int, base_url: str) -> List[Dict]:
+    """products.json עם size מוצרים (תמונות מה-stub) - הקטלוג שהבקשות קוראות ומחפשות בו"""
+    products = []
+    for index in range(size):
+        asin = f'B0LT{index:06d}'
+        product = _stub_product(asin)
+        products.append({
+            'asin': asin,
+            'title': product['title'],
+            'price': f"${product['price']}",
+            'original_price': f"${product['original_price']}",
+            'discount': '',
+            'rating': product['rating'],
+            'reviews_count': product['reviews'],
+            'image_url': f'{base_url}/images/product_0.jpg',
+            'image_urls': [f'{base_url}/images/product_{image}.jpg' for image in range(3)],
+            'affiliate_url': f'https://www.amazon.com/dp/{asin}?tag=loadtest-20',
+            'description': f"Feature list of {product['title']}",
+            'added_at': datetime.now().isoformat(),
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'last_updated': datetime.now().isoformat(), 'products': products}, f, ensure_ascii=False, indent=2)
+    return products
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class GunicornTarget:
+    """gunicorn עם gunicorn.conf.py של הפריסה, בתיקיית עבודה זמנית (products.json, output_videos, videos.json משלו)"""
+    
+    def __init__(self, workdir: str, stub_url: str, workers: int, threads: int, env: Optional[Dict] = None):
+        self.workdir = workdir
+        self.port = _free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.log_path = os.path.join(workdir, 'gunicorn.log')
+        self.env = dict(os.environ, STORE_STUB_URL=stub_url, WEB_CONCURRENCY=str(workers),
+                        GUNICORN_THREADS=str(threads), **(env or {}))
+        self.process: Optional[subprocess.Popen] = None
+    
+    def start(self, timeout: float = 120) -> 'GunicornTarget':
+        command = [sys.executable, '-m', 'gunicorn', 'app:app', '-c', os.path.join(REPO_DIR, 'gunicorn.conf.py'),
+                   '--bind', f'127.0.0.1:{self.port}', '--chdir', self.workdir, '--pythonpath', REPO_DIR]
+        self._log = open(self.log_path, 'ab')
+        self.process = subprocess.Popen(command, cwd=self.workdir, env=self.env, stdout=self._log, stderr=subprocess.STDOUT)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited with {self.process.returncode}, see {self.log_path}')
+            try:
+                if requests.get(f'{self.base_url}/api/startup', timeout=2).ok:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.25)
+        self.stop()
+        raise RuntimeError(f'gunicorn did not answer within {timeout:.0f}s, see {self.log_path}')
+    
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if getattr(self, '_log', None):
+            self._log.close()
+
+
+# --- תרחישים ---
+
+class ScenarioContext:
+    """מה שהתרחישים צריכים: המוצרים השמורים, כתובת ה-stub ופרופיל הרינדור"""
+    
+    def __init__(self, catalog: List[Dict], stub_url: str, render_profile: str):
+        self.asins = [product['asin'] for product in catalog]
+        self.products = catalog
+        self.words = sorted({word for product in catalog for word in product['title'].split()[1:-1]}) or TITLE_WORDS
+        self.stub_url = stub_url
+        self.render_profile = render_profile
+
+
+def _new_asin(rng: random.Random) -> str:
+    return f'B0NW{rng.randrange(NEW_PRODUCTS_POOL):06d}'
+
+
+def _new_item_id(rng: random.Random) -> int:
+    return 1005000000000 + rng.randrange(NEW_PRODUCTS_POOL)
+
+
+# הכותרות של מוצרי הדמה שה-fetchers מחזירים כשהגריפה נכשלה ({id} = ASIN או מזהה הפריט)
+FALLBACK_TITLES = ('Product {id}', 'AliExpress Product', 'מוצר AliExpress {id}')
+
+
+def _scraped(product_id) -> Callable:
+    """בדיקת תשובה: המוצר נגרף מהדף שה-stub הגיש (סינתטי או מוקלט) - לא מוצר הדמה של ה-fetcher"""
+    fallbacks = {title.format(id=product_id) for title in FALLBACK_TITLES}
+    
+    def check(response) -> Optional[str]:
+        title = ((response.json().get('product') or {}).get('title') or '').strip()
+        return 'fallback' if not title or title in fallbacks else None
+    return check
+
+
+def _fetch_scenario(rng: random.Random, ctx: ScenarioContext):
+    asin = _new_asin(rng)
+    return 'GET', f'/api/product/{asin}', None, _scraped(asin)
+
+
+def _add_amazon_scenario(rng: random.Random, ctx: ScenarioContext):
+    asin = _new_asin(rng)
+    return 'POST', '/api/products/add', {'url': f'https://www.amazon.com/dp/{asin}?tag=loadtest-20'}, _scraped(asin)
+
+
+def _add_aliexpress_scenario(rng: random.Random, ctx: ScenarioContext):
+    item_id = _new_item_id(rng)
+    return 'POST', '/api/products/add', {'url': f'https://www.aliexpress.com/item/{item_id}.html'}, _scraped(item_id)
+
+
+# כל תרחיש: (rng, ctx) -> (method, path, json body, בדיקת תשובה או None)
+SCENARIOS: Dict[str, Callable] = {
+    'saved': lambda rng, ctx: ('GET', '/api/products/saved', None, None),
+    'search': lambda rng, ctx: ('POST', '/api/products/search', {'query': rng.choice(ctx.words)}, None),
+    'product_saved': lambda rng, ctx: ('GET', f'/api/product/{rng.choice(ctx.asins)}', None, None),
+    'product_fetch': _fetch_scenario,
+    'add_amazon': _add_amazon_scenario,
+    'add_aliexpress': _add_aliexpress_scenario,
+    'generate': lambda rng, ctx: ('POST', '/api/video/generate',
+                                  {'product': rng.choice(ctx.products), 'profile': ctx.render_profile, 'preview': False},
+                                  None),
+}
+
+
+def parse_scenarios(set_name: str, overrides: Optional[List[str]]) -> Dict[str, float]:
+    if not overrides:
+        return SCENARIO_SETS[set_name]
+    weights = {}
+    for value in overrides:
+        name, _, weight = value.partition('=')
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}'. Available: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+# --- הרצת העומס ---
+
+def run_level(base_url: str, ctx: ScenarioContext, weights: Dict[str, float], concurrency: int,
+              duration: float, warmup: float, timeout: float, seed: int) -> Dict:
+    """לולאה סגורה: concurrency לקוחות, כל אחד שולח בקשה ומחכה לתשובה לפני הבאה.
+    בקשות שהסתיימו בזמן החימום לא נספרות"""
+    names, cumulative = list(weights), []
+    total_weight = 0.0
+    for name in names:
+        total_weight += weights[name]
+        cumulative.append(total_weight)
+    samples: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, Counter] = {name: Counter() for name in names}
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+    
+    def client(index: int):
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            pick = rng.random() * total_weight
+            name = names[next(position for position, bound in enumerate(cumulative) if pick < bound)]
+            method, path, body, check = SCENARIOS[name](rng, ctx)
+            request_started = time.perf_counter()
+            error = None
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=timeout)
+                if response.status_code != 200:
+                    error = f'http_{response.status_code}'
+                elif check:
+                    error = check(response)
+            except requests.Timeout:
+                error = 'timeout'
+            except requests.RequestException as e:
+                error = type(e).__name__
+            finished = time.perf_counter()
+            if request_started < measure_from:
+                continue
+            with lock:
+                if error:
+                    errors[name][error] += 1
+                else:
+                    samples[name].append(finished - request_started)
+        session.close()
+    
+    clients = [threading.Thread(target=client, args=(index,), name=f'loadtest-client-{index}', daemon=True)
+               for index in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    # הבקשות האחרונות מסתיימות אחרי ה-deadline - התפוקה מחושבת על הזמן בפועל
+    elapsed = time.perf_counter() - measure_from
+    
+    scenarios = {name: summarize(samples[name], errors[name], elapsed) for name in names}
+    overall = summarize([value for name in names for value in samples[name]],
+                        sum(errors.values(), Counter()), elapsed)
+    return {'concurrency': concurrency, 'seconds': round(elapsed, 2), 'scenarios': scenarios, 'total': overall}
+
+
+def summarize(latencies: List[float], errors: Counter, elapsed: float) -> Dict:
+    ordered = sorted(latencies)
+    failed = sum(errors.values())
+    return {
+        'requests': len(ordered) + failed,
+        'errors': failed,
+        'error_kinds': dict(errors),
+        'rps': round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 1) if ordered else 0.0,
+        'p95_ms': round(percentile(ordered, 95) * 1000, 1) if ordered else 0.0,
+        'p99_ms': round(percentile(ordered, 99) * 1000, 1) if ordered else 0.0,
+        'max_ms': round(ordered[-1] * 1000, 1) if ordered else 0.0,
+    }
+
+
+def wait_for_renders(base_url: str, timeout: float) -> bool:
+    """מחכה שתור הרינדור יתרוקן לפני הרמה הבאה (עם כמה workers - רק התור של ה-worker שעונה)"""
+    deadline = time.time() + timeout
+    idle = 0
+    while time.time() < deadline:
+        try:
+            idle = idle + 1 if requests.get(f'{base_url}/api/video/jobs', timeout=5).json().get('count') == 0 else 0
+        except (requests.RequestException, ValueError):
+            idle = 0
+        if idle >= 3:
+            return True
+        time.sleep(1)
+    return False
+
+
+def print_level(result: Dict):
+    print(f"\nconcurrency {result['concurrency']}  ({result['seconds']}s)")
+    print(f"  {'scenario':<16}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(result['scenarios'].items()) + [('total', result['total'])]
+    for name, stats in rows:
+        print(f"  {name:<16}{stats['requests']:>9}{stats['errors']:>8}{stats['rps']:>9.1f}"
+              f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+    for name, stats in result['scenarios'].items():
+        if stats['error_kinds']:
+            kinds = ', '.join(f'{kind}={count}' for kind, count in sorted(stats['error_kinds'].items()))
+            print(f'  ! {name}: {kinds}')
+
+
+def environment(args, weights: Dict[str, float]) -> Dict:
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'target': args.target or 'spawned gunicorn',
+        'workers': None if args.target else args.workers,
+        'threads': None if args.target else args.threads,
+        'catalog_size': args.catalog_size,
+        'stub_latency_ms': args.stub_latency_ms,
+        'scenarios': weights,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ['record']:
+        parser = argparse.ArgumentParser(prog='loadtest.py record', description='Save real product pages for the stub store')
+        parser.add_argument('urls', nargs='+', help='Amazon /dp/<ASIN> or AliExpress /item/<id>.html URLs')
+        parser.add_argument('--default', action='store_true', help='save as the page served for every id of that store')
+        parser.add_argument('--pages', default=PAGES_DIR, help=f'page directory (default: {PAGES_DIR})')
+        args = parser.parse_args(argv[1:])
+        for url in args.urls:
+            print(record_page(url, args.pages, args.default))
+        return 0
+    
+    parser = argparse.ArgumentParser(description='Load test the Flask API against gunicorn with the stores stubbed '
+                                                 '(python loadtest.py record <url> saves real pages for the stub)')
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16],
+                        help='concurrent clients; several values run one after the other (default: 1 4 16)')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds per concurrency level (default: 30)')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds before each level (default: 5)')
+    parser.add_argument('--set', dest='scenario_set', default='mixed', choices=SCENARIO_SETS,
+                        help='scenario mix (default: mixed)')
+    parser.add_argument('--scenarios', nargs='+', metavar='NAME=WEIGHT',
+                        help=f"custom mix instead of --set ({', '.join(SCENARIOS)})")
+    parser.add_argument('--target', help='existing server (e.g. http://127.0.0.1:5000, started with STORE_STUB_URL) '
+                                         'instead of spawning gunicorn')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_CONCURRENCY', '2')),
+                        help='gunicorn workers when spawning (default: WEB_CONCURRENCY or 2)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('GUNICORN_THREADS', '16')),
+                        help='gunicorn threads per worker when spawning (default: GUNICORN_THREADS or 16)')
+    parser.add_argument('--catalog-size', type=int, default=200, help='saved products seeded into products.json (default: 200)')
+    parser.add_argument('--render-profile', default='preview', help='profile for the generate scenario (default: preview)')
+    parser.add_argument('--drain', type=float, default=0, metavar='SECONDS',
+                        help='wait up to SECONDS for the render queue to empty after each level')
+    parser.add_argument('--timeout', type=float, default=60, help='per-request timeout in seconds (default: 60)')
+    parser.add_argument('--stub-host', default='127.0.0.1', help='stub bind address (reachable from --target)')
+    parser.add_argument('--stub-port', type=int, default=0, help='stub port (default: any free port)')
+    parser.add_argument('--stub-latency-ms', type=float, default=0, help='simulated store response time (default: 0)')
+    parser.add_argument('--page-kb', type=int, default=400, help='size of the synthetic store pages (default: 400)')
+    parser.add_argument('--pages', default=PAGES_DIR, help=f'recorded page directory (default: {PAGES_DIR})')
+    parser.add_argument('--keep', action='store_true', help='keep the spawned server work directory (logs, products.json)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the request mix')
+    parser.add_argument('--json', dest='json_path', default=None, help='write results to this file')
+    args = parser.parse_args(argv)
+    
+    try:
+        weights = parse_scenarios(args.scenario_set, args.scenarios)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    
+    stub = StubStore(args.pages, args.stub_latency_ms, args.page_kb, args.stub_host, args.stub_port).start()
+    print(f'stub store: {stub.base_url}')
+    workdir = tempfile.mkdtemp(prefix='loadtest_')
+    target = None
+    try:
+        catalog = seed_catalog(os.path.join(workdir, 'products.json'), args.catalog_size, stub.base_url)
+        if args.target:
+            base_url = args.target.rstrip('/')
+            # השרת הקיים משתמש בקטלוג שלו - המוצרים הזרועים משמשים רק את תרחיש generate
+            saved = requests.get(f'{base_url}/api/products/saved', timeout=args.timeout).json().get('products') or []
+            catalog = [product for product in saved if product.get('asin')] or catalog
+        else:
+            target = GunicornTarget(workdir, stub.base_url, args.workers, args.threads).start()
+            base_url = target.base_url
+            print(f'gunicorn: {base_url} ({args.workers} workers x {args.threads} threads, work dir {workdir})')
+        ctx = ScenarioContext(catalog, stub.base_url, args.render_profile)
+        
+        levels = []
+        for concurrency in args.concurrency:
+            result = run_level(base_url, ctx, weights, concurrency, args.duration, args.warmup, args.timeout, args.seed)
+            levels.append(result)
+            print_level(result)
+            if args.drain and 'generate' in weights and not wait_for_renders(base_url, args.drain):
+                print(f'  render queue still busy after {args.drain:.0f}s')
+        print(f"\nstub requests: {', '.join(f'{kind}={count}' for kind, count in sorted(stub.hits.items())) or 'none'}")
+        
+        if args.json_path:
+            with open(args.json_path, 'w', encoding='utf-8') as f:
+                json.dump({'environment': environment(args, weights), 'levels': levels, 'stub_requests': dict(stub.hits)},
+                          f, indent=2)
+        failed = sum(level['total']['errors'] for level in levels)
+        return 1 if failed else 0
+    finally:
+        if target:
+            target.stop()
+        stub.stop()
+        if args.keep:
+            print(f'work dir kept: {workdir}')
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+לוגים מובנים עם רמות ושם לכל תת-מערכת, שנכתבים מ-thread נפרד (הקוד החם לא מחכה ל-stdout)
+Structured logging - per-subsystem loggers, a non-blocking queue handler and sampling of chatty debug lines
+"""
+# -*- coding: utf-8 -*-
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Dict, Optional
+
+import metrics
+import tracing
+
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()  # text / json (שורה אחת לכל רשומה)
+# שורות debug עם אותה תבנית: נכתבת 1 מכל N (1 = כולן)
+LOG_DEBUG_SAMPLE = max(1, int(os.getenv('LOG_DEBUG_SAMPLE', '10')))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+
+ROOT_LOGGER = 'goodsells'
+
+# שדות של LogRecord עצמו - כל השאר הגיע מ-extra ונכתב כשדה מובנה
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+DROPPED = metrics.counter('log_records_dropped', 'Log records dropped because the log queue was full')
+SAMPLED_OUT = metrics.counter('log_records_sampled_out', 'Debug log records skipped by sampling')
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """logger של תת-מערכת (למשל 'fetcher.amazon', 'video', 'products', 'web')"""
+    return logging.getLogger(f'{ROOT_LOGGER}.{subsystem}')
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS and not key.startswith('_')}
+
+
+class SamplingFilter(logging.Filter):
+    """רשומות debug: הראשונה מכל תבנית (logger + מחרוזת הפורמט) נכתבת, ואחריה אחת מכל rate.
+    הרשומה שנכתבת מסומנת ב-sampled=rate. warning ומעלה לא נדגמות"""
+    
+    def __init__(self, rate: int = LOG_DEBUG_SAMPLE):
+        super().__init__()
+        self.rate = rate
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if len(self._counts) > 10000:
+                self._counts.clear()  # תבניות דינמיות (f-string) לא מנפחות את הזיכרון
+        if count % self.rate:
+            SAMPLED_OUT.inc()
+            return False
+        if count:
+            record.sampled = self.rate
+        return True
+
+
+def _add_request_id(record: logging.LogRecord) -> bool:
+    """רשומה שנכתבה בתוך בקשה (או עבודת רינדור) מקבלת את מזהה ה-trace שלה - לחיפוש ב-traces.jsonl"""
+    trace_id = tracing.current_trace_id()
+    if trace_id is not None and not hasattr(record, 'request_id'):
+        record.request_id = trace_id
+    return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """הכנסה לתור בלי לחכות; כשהתור מלא (stdout איטי) הרשומה נזרקת ונספרת"""
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DROPPED.inc()
+
+
+class TextFormatter(logging.Formatter):
+    """שורה קריאה: זמן, רמה, תת-מערכת, הודעה ושדות key=value"""
+    
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON בשורה אחת: ts, level, logger, msg ושדות ה-extra"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, stream=None) -> logging.Logger:
+    """הגדרה חד-פעמית לתהליך: QueueHandler על ה-logger הראשי ו-thread שכותב ל-stdout.
+    קריאות נוספות רק משנות את הרמה"""
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel((level or LOG_LEVEL).upper())
+    with _configure_lock:
+        if _handler is not None:
+            return root
+        
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == 'json' else TextFormatter())
+        _handler = NonBlockingQueueHandler(None)
+        _handler.addFilter(SamplingFilter())
+        _handler.addFilter(_add_request_id)
+        _start_listener(output)
+        root.addHandler(_handler)
+        root.propagate = False  # בלי כפילויות דרך ה-root של gunicorn/werkzeug
+        
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            # ה-thread של ה-listener לא עובר fork (gunicorn preload) - מפעילים חדש בתהליך הבן
+            os.register_at_fork(after_in_child=_restart_listener)
+    return root
+
+
+def _start_listener(*handlers: logging.Handler):
+    """תור חדש ל-handler ו-listener חדש שכותב ממנו ל-handlers"""
+    global _listener
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    """ריקון התור ביציאה (stop מחכה שה-thread יכתוב את מה שנשאר)"""
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener():
+    """בתהליך הבן: המנעול של התור הישן עלול להישאר נעול (thread אחר החזיק אותו ב-fork),
+    ולכן לא נוגעים בו - תור ו-listener חדשים עם אותו פלט. מה שנשאר בתור הישן נכתב ע"י האב"""
+    if _listener is not None:
+        _start_listener(*_listener.handlers)
@@ -25,37 +25,62 @@ if sys.platform == 'win32':
 from dotenv import load_dotenv
 from product_fetcher import get_fetcher
 from video_generator import VideoGenerator
+from render_profiles import RENDER_PROFILES, DEFAULT_PROFILE, OUTPUT_FORMATS, parse_formats
+from product_manager import ProductManager
+from video_batch import VideoBatch, select_products
+from video_pipeline import VideoPipeline, DOWNLOAD_WORKERS, RENDER_WORKERS
+from run_checkpoint import RunCheckpoint, run_manifest_path
+from log_config import configure_logging
 import argparse
+from typing import List, Optional
 
 load_dotenv()
+configure_logging()
 
 
-def create_videos_from_keywords(keywords: str, store: str = 'amazon', count: int = 5):
-    """יצירת סרטונים ממילות מפתח"""
+def create_videos_from_keywords(keywords: str, store: str = 'amazon', count: int = 5, profile: str = DEFAULT_PROFILE,
+                                formats: Optional[List[str]] = None, download_workers: Optional[int] = None,
+                                render_workers: Optional[int] = None, resume: bool = False,
+                                manifest_path: Optional[str] = None):
+    """יצירת סרטונים ממילות מפתח (הורדה ורינדור חופפים - הנכסים של המוצר הבא יורדים בזמן הקידוד).
+    כל ריצה נשמרת ב-checkpoint; resume מדלג על מוצרים שכבר נוצרו ומריץ שוב את מה שנכשל"""
     print(f"🔍 Searching for products: '{keywords}' on {store}")
     
     # משיכת מוצרים
     fetcher = get_fetcher(store)
-    products = fetcher.search_products(keywords, max_results=count)
+    products = fetcher.search_products(keywords, max_results=count) or []
+    if products:
+        print(f"[OK] Found {len(products)} products")
+    
+    # יצירת סרטונים
+    generator = VideoGenerator()
+    formats = parse_formats(formats)
+    manifest_path = manifest_path or run_manifest_path(generator.output_dir, store, keywords, profile, ','.join(formats))
+    checkpoint = RunCheckpoint(manifest_path, profile, formats, resume=resume,
+                               source={'keywords': keywords, 'store': store, 'count': count})
+    
+    # מוצרים שנכשלו או נקטעו בריצה הקודמת וכבר לא בתוצאות החיפוש (סדר אחר, גבול --count) - נכנסים לתור מהמניפסט
+    if resume:
+        retry = checkpoint.unfinished_products(products)
+        if retry:
+            print(f"[OK] Re-queued {len(retry)} unfinished products from the checkpoint")
+            products = products + retry
     
     if not products:
         print("[X] No products found")
         return
     
-    print(f"[OK] Found {len(products)} products")
-    
-    # יצירת סרטונים
-    generator = VideoGenerator()
+    pipeline = VideoPipeline(generator, profile=profile, formats=formats, checkpoint=checkpoint,
+                             download_workers=download_workers, render_workers=render_workers)
     created_videos = []
     
-    for i, product in enumerate(products, 1):
-        print(f"\n[VIDEO] [{i}/{len(products)}] Processing: {product.get('title', 'Unknown')}")
-        video_path = generator.create_product_video(product)
-        
-        if video_path:
+    for record in pipeline.run(products):
+        product, videos = record['product'], record['videos']
+        if videos:
             created_videos.append({
                 'product': product.get('title', 'Unknown'),
-                'video_path': video_path,
+                'video_path': next(iter(videos.values())),
+                'videos': videos,
                 'affiliate_url': product.get('affiliate_url', '')
             })
     
@@ -66,14 +91,18 @@ def create_videos_from_keywords(keywords: str, store: str = 'amazon', count: int
     print(f"[OK] Created {len(created_videos)} videos:")
     for item in created_videos:
         print(f"  • {item['product']}")
-        print(f"    Video: {item['video_path']}")
+        for video_path in item['videos'].values():
+            print(f"    Video: {video_path}")
         print(f"    Affiliate: {item['affiliate_url']}")
         print()
+    pipeline.print_summary()
+    print(f"[OK] Checkpoint: {manifest_path} (rerun with --resume to continue)")
     
     return created_videos
 
 
-def create_video_from_url(product_url: str, store: str = 'amazon'):
+def create_video_from_url(product_url: str, store: str = 'amazon', profile: str = DEFAULT_PROFILE,
+                          formats: Optional[List[str]] = None):
     """יצירת סרטון ממוצר בודד לפי URL"""
     print(f"🔗 Fetching product from URL: {product_url}")
     
@@ -89,13 +118,48 @@ def create_video_from_url(product_url: str, store: str = 'amazon'):
     
     # יצירת סרטון
     generator = VideoGenerator()
-    video_path = generator.create_product_video(product)
+    videos = generator.create_product_videos(product, formats=formats, profile=profile)
     
-    if video_path:
-        print(f"\n[OK] Video created: {video_path}")
+    if videos:
+        print()
+        for video_path in videos.values():
+            print(f"[OK] Video created: {video_path}")
         print(f"[LINK] Affiliate URL: {product.get('affiliate_url', '')}")
     
-    return video_path
+    return next(iter(videos.values()), None)
+
+
+def create_videos_batch(asins: Optional[List[str]] = None, query: Optional[str] = None,
+                        profile: str = DEFAULT_PROFILE, formats: Optional[List[str]] = None) -> Optional[dict]:
+    """יצירת סרטונים לקבוצת מוצרים מהקטלוג השמור (ASINs / חיפוש / הכל) עם מניפסט - מתאים ל-cron"""
+    items = select_products(ProductManager(), asins=asins, query=query)
+    if not items:
+        print("[X] No saved products matched")
+        return None
+    
+    print(f"[OK] Batch of {len(items)} products")
+    
+    # ASIN שלא שמור בקטלוג נמשך מ-Amazon כשמגיע תורו (כמו ב-/api/video/batch) - ASIN הוא מזהה של Amazon, בלי קשר ל---store
+    def fetch_product(asin):
+        return get_fetcher('amazon').fetch_product_by_url(f'https://www.amazon.com/dp/{asin}')
+    
+    batch = VideoBatch(VideoGenerator(), items, profile=profile, formats=formats, fetch_product=fetch_product)
+    manifest = batch.run()
+    
+    # סיכום
+    print("\n" + "="*50)
+    print("[SUMMARY]")
+    print("="*50)
+    for item in manifest['items']:
+        mark = '[OK]' if item['status'] == 'completed' else '[X]'
+        print(f"  {mark} {item['title'] or item['asin']}")
+        for filename in item['videos'].values():
+            print(f"    Video: {filename}")
+        if item['error']:
+            print(f"    Error: {item['error']}")
+    print(f"\n[OK] Manifest: {batch.manifest_path}")
+    
+    return manifest
 
 
 def main():
@@ -113,6 +177,20 @@ def main():
   
   # יצירת סרטונים מ-AliExpress
   python main.py --keywords "שעון חכם" --store aliexpress --count 5
+  
+  # תצוגה מקדימה מהירה (רזולוציה נמוכה)
+  python main.py --url "https://amazon.com/dp/EXAMPLE123" --profile draft
+  
+  # אנכי, ריבועי ורוחבי בעבודה אחת
+  python main.py --url "https://amazon.com/dp/EXAMPLE123" --formats vertical,square,landscape
+  
+  # ריצה ארוכה שנקטעה - ממשיכים מאותה נקודה
+  python main.py --keywords "שעון חכם" --count 50 --resume
+  
+  # אצווה מהקטלוג השמור (למשל מ-cron) - כל המוצרים / לפי חיפוש / לפי ASINs
+  python main.py --saved --profile standard
+  python main.py --saved --query "headphones"
+  python main.py --asins B0EXAMPLE1,B0EXAMPLE2
         """
     )
     
@@ -143,19 +221,93 @@ def main():
         help='מספר מוצרים ליצירה (default: 5)'
     )
     
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=DEFAULT_PROFILE,
+        choices=list(RENDER_PROFILES),
+        help=f'פרופיל רינדור: draft / standard / final (default: {DEFAULT_PROFILE})'
+    )
+    
+    parser.add_argument(
+        '--formats',
+        type=str,
+        default='vertical',
+        help=f'יחסי תמונה מופרדים בפסיקים: {", ".join(OUTPUT_FORMATS)} (default: vertical)'
+    )
+    
+    parser.add_argument(
+        '--download-workers',
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f'מספר הורדות נכסים במקביל עם --keywords (default: {DOWNLOAD_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--render-workers',
+        type=int,
+        default=RENDER_WORKERS,
+        help=f'מספר רינדורים במקביל עם --keywords (default: {RENDER_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='המשך ריצת --keywords מה-checkpoint: מדלג על מוצרים שכבר נוצרו ומריץ שוב את מה שנכשל'
+    )
+    
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        help='נתיב קובץ ה-checkpoint (default: output_videos/run_<פרמטרי הריצה>.json)'
+    )
+    
+    parser.add_argument(
+        '--saved',
+        action='store_true',
+        help='אצווה: כל המוצרים השמורים בקטלוג (או רק אלה שמתאימים ל---query)'
+    )
+    
+    parser.add_argument(
+        '--query',
+        type=str,
+        help='אצווה: חיפוש בקטלוג השמור (עם --saved)'
+    )
+    
+    parser.add_argument(
+        '--asins',
+        type=str,
+        help='אצווה: רשימת ASINs מופרדים בפסיקים'
+    )
+    
     args = parser.parse_args()
     
     # בדיקת פרמטרים
-    if not args.keywords and not args.url:
+    if not args.keywords and not args.url and not args.saved and not args.asins:
         parser.print_help()
-        print("\n[X] Error: You must provide either --keywords or --url")
+        print("\n[X] Error: You must provide --keywords, --url, --saved or --asins")
         sys.exit(1)
     
+    if args.query and not args.saved:
+        parser.error('--query requires --saved')
+    
+    try:
+        formats = parse_formats(args.formats)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # יצירת סרטונים
-    if args.url:
-        create_video_from_url(args.url, args.store)
+    if args.saved or args.asins:
+        asins = [asin.strip() for asin in (args.asins or '').split(',') if asin.strip()]
+        manifest = create_videos_batch(asins, args.query, args.profile, formats)
+        # קוד יציאה לא-אפס אם משהו נכשל (ל-cron)
+        if not manifest or manifest['failed'] or manifest['status'] != 'completed':
+            sys.exit(1)
+    elif args.url:
+        create_video_from_url(args.url, args.store, args.profile, formats)
     else:
-        create_videos_from_keywords(args.keywords, args.store, args.count)
+        create_videos_from_keywords(args.keywords, args.store, args.count, args.profile, formats,
+                                    args.download_workers, args.render_workers, args.resume, args.manifest)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,234 @@
+"""
+מדדים בתוך התהליך בפורמט Prometheus (text exposition) - מונים, מדדים והיסטוגרמות, בלי תלות חיצונית
+In-process Prometheus-style metrics: counters, gauges and histograms rendered at GET /metrics
+"""
+# -*- coding: utf-8 -*-
+import bisect
+import functools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+log = logging.getLogger('goodsells.metrics')  # לא דרך log_config - הוא עצמו רושם מדדים כאן
+
+# גבולות ברירת מחדל (שניות) - מבקשת HTTP מהירה ועד רינדור מלא
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Optional[Tuple[str, str]], float]]:
+        raise NotImplementedError
+    
+    def render(self) -> str:
+        # מונים נחשפים עם הסיומת _total (כמו ב-prometheus_client)
+        family = self.name + '_total' if self.kind == 'counter' else self.name
+        lines = [f'# HELP {family} {self.documentation}', f'# TYPE {family} {self.kind}']
+        for suffix, values, extra, value in self.samples():
+            lines.append(f'{family}{suffix}{_format_labels(self.labelnames, values, extra)} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """מונה שרק עולה (למשל מספר שגיאות)"""
+    kind = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def samples(self):
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """ערך נוכחי. function: נקרא בזמן ה-scrape ומחזיר מספר, או {ערכי תוויות (tuple): מספר} -
+    כך מצב שכבר קיים (עומק תור, מטמון) נחשף בלי לעדכן מונה בכל שינוי"""
+    kind = 'gauge'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], object]] = None, kind: Optional[str] = None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        if kind:
+            self.kind = kind  # 'counter' למונה שהערך שלו מגיע מ-function
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+    
+    def samples(self):
+        if self.function is not None:
+            try:
+                values = self.function()
+            except Exception as e:
+                log.warning("Metric %s failed: %s", self.name, e)
+                return []
+            if not isinstance(values, dict):
+                values = {(): values}
+            return [('', tuple(str(part) for part in key), None, value)
+                    for key, value in sorted(values.items()) if value is not None]
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """היסטוגרמה: ספירה לכל דלי (לא מצטברת - מצטברת רק ב-render), סכום וספירה.
+    observe הוא חיפוש בינארי והוספה תחת מנעול"""
+    kind = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}  # key -> [counts per bucket + inf, sum, count]
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """מדידת זמן הבלוק (גם כשהוא נכשל)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def samples(self):
+        with self._lock:
+            series = {key: ([*counts], total, count) for key, (counts, total, count) in self._series.items()}
+        samples = []
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append(('_bucket', key, ('le', _format_value(bound)), cumulative))
+            samples.append(('_sum', key, None, total))
+            samples.append(('_count', key, None, count))
+        return samples
+
+
+class MetricsRegistry:
+    """כל המדדים של התהליך; מודול שנטען רושם את שלו (מודולים שטרם נטענו לא מופיעים)"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # טעינה חוזרת של מודול (למשל reload) מחזירה את המדד הקיים
+            existing = self._metrics.get(metric.name)
+            if existing is not None and type(existing) is type(metric):
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], object]] = None, kind: Optional[str] = None) -> Gauge:
+        metric = self._register(Gauge(name, documentation, labelnames, function=function, kind=kind))
+        if function is not None:
+            metric.function = function  # המופע האחרון (למשל מנהל עבודות חדש) הוא שנמדד
+        return metric
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets=buckets))
+    
+    def render(self) -> str:
+        """כל המדדים בפורמט text exposition (version 0.0.4)"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+def timed(metric: Histogram, **labels):
+    """decorator: מדידת זמן הפונקציה להיסטוגרמה עם תוויות קבועות"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metric.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(values: Sequence[float], percent: float) -> Optional[float]:
+    """nearest-rank: הערך הקטן ביותר שלפחות percent אחוז מהערכים קטנים ממנו או שווים לו (None לרשימה ריקה)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    # percent * n / 100 ולא (percent / 100) * n - כשהתוצאה שלמה היא מדויקת, ו-ceil לא קופץ לדרגה הבאה
+    return ordered[max(0, math.ceil(percent * len(ordered) / 100.0) - 1)]
@@ -21,18 +21,80 @@ import base64
 from urllib.parse import quote, urlparse, parse_qs
 from bs4 import BeautifulSoup
 import re
+import functools
+from contextlib import contextmanager
+import logging
+
+from requests.adapters import HTTPAdapter
+
+import metrics
+import tracing
+from log_config import get_logger
 
 load_dotenv()
 
+# STORE_STUB_URL (למשל http://127.0.0.1:8900): כל בקשות החנויות נשלחות לשרת stub מקומי במקום לאתר האמיתי
+# (בדיקות עומס - loadtest.py). הנתיב נשמר עם שם המארח בתחילתו: https://www.amazon.com/dp/X -> <stub>/www.amazon.com/dp/X
+STORE_STUB_URL = os.getenv('STORE_STUB_URL', '').rstrip('/')
+
+# זמן משיכה לכל חנות ולכל שלב (download / parse / title / price ...); total = כל fetch_product_by_url
+SCRAPE_SECONDS = metrics.histogram('scrape_duration_seconds', 'Product scraping time per store and extraction stage',
+                                   ['store', 'stage'])
+SCRAPE_ERRORS = metrics.counter('scrape_errors', 'Product page scrapes that failed (network or parsing)', ['store'])
+
+
+@contextmanager
+def timed_stage(store: str, stage: str, span_name: Optional[str] = None):
+    """שלב משיכה: היסטוגרמה ב-/metrics ו-span ב-trace של הבקשה (אם יש)"""
+    started = time.perf_counter()
+    try:
+        with tracing.span(span_name or stage, store=store) as stage_span:
+            yield stage_span
+    finally:
+        SCRAPE_SECONDS.observe(time.perf_counter() - started, store=store, stage=stage)
+
+
+def scrape_stage(stage: str, span_name: Optional[str] = None):
+    """decorator: מדידת זמן המתודה כשלב משיכה של החנות (self.store)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with timed_stage(self.store, stage, span_name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StubStoreAdapter(HTTPAdapter):
+    """מפנה כל בקשה של ה-session לשרת ה-stub (STORE_STUB_URL), עם המארח המקורי כחלק מהנתיב"""
+    
+    def __init__(self, stub_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.stub_url = stub_url
+    
+    def send(self, request, **kwargs):
+        if not request.url.startswith(self.stub_url + '/'):
+            parsed = urlparse(request.url)
+            request.url = f"{self.stub_url}/{parsed.netloc}{parsed.path or '/'}" + (f'?{parsed.query}' if parsed.query else '')
+            request.headers.pop('Host', None)
+        return super().send(request, **kwargs)
+
 
 class ProductFetcher:
     """מחלקה בסיסית למשיכת מוצרים"""
     
+    store = 'unknown'  # תווית המדדים
+    
     def __init__(self):
+        self.log = get_logger(f'fetcher.{self.store}')
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        if STORE_STUB_URL:
+            adapter = StubStoreAdapter(STORE_STUB_URL)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
     
     def fetch_product(self, product_url: str) -> Optional[Dict]:
         """משיכת מידע מוצר - צריך להיות מיושם בכל מחלקה יורשת"""
@@ -42,6 +104,8 @@ class ProductFetcher:
 class AmazonProductFetcher(ProductFetcher):
     """משיכת מוצרים מ-Amazon Associates"""
     
+    store = 'amazon'
+    
     def __init__(self):
         super().__init__()
         self.access_key = os.getenv('AMAZON_ACCESS_KEY')
@@ -72,10 +136,11 @@ class AmazonProductFetcher(ProductFetcher):
         ).decode()
         return signature
     
+    @scrape_stage('search')
     def search_products(self, keywords: str, max_results: int = 10) -> List[Dict]:
         """חיפוש מוצרים ב-Amazon"""
         if not self.access_key or not self.secret_key:
-            print("[!] Amazon API credentials not configured. Using mock data.")
+            self.log.warning("Amazon API credentials not configured. Using mock data.")
             return self._get_mock_products()
         
         try:
@@ -95,28 +160,29 @@ class AmazonProductFetcher(ProductFetcher):
             return self._get_mock_products()
             
         except Exception as e:
-            print(f"[X] Error fetching from Amazon: {e}")
+            self.log.error("Error fetching from Amazon: %s", e)
             return self._get_mock_products()
     
+    @scrape_stage('total', span_name='fetch_product')
     def fetch_product_by_url(self, product_url: str) -> Optional[Dict]:
         """משיכת מוצר לפי URL - משתמש ב-web scraping"""
         # Check if it's an affiliate link and normalize it
         if 'tag=' in product_url or 'linkId=' in product_url or 'ref=' in product_url:
-            print("[AFFILIATE] Detected affiliate link, normalizing...")
+            self.log.debug("Detected affiliate link, normalizing")
             original_url = product_url
             product_url = self._normalize_affiliate_link(product_url)
             if product_url != original_url:
-                print(f"[OK] Normalized affiliate link to: {product_url[:80]}...")
+                self.log.debug("Normalized affiliate link to: %s", product_url[:80])
         
         # Handle Amazon short URLs (amzn.to)
         if 'amzn.to' in product_url or 'amazon.com/shorturl' in product_url:
-            print("[RESOLVE] Resolving Amazon short URL...")
+            self.log.debug("Resolving Amazon short URL")
             resolved_url = self._resolve_amazon_short_url(product_url)
             if not resolved_url:
-                print("[X] Failed to resolve short URL or URL doesn't point to a product")
+                self.log.error("Failed to resolve short URL or URL doesn't point to a product")
                 return None
             product_url = resolved_url
-            print(f"[OK] Using resolved URL: {product_url[:100]}...")
+            self.log.debug("Using resolved URL: %s", product_url[:100])
         
         # Check if URL is a category/browse page - if so, handle it differently
         if self._is_category_page(product_url):
@@ -126,33 +192,28 @@ class AmazonProductFetcher(ProductFetcher):
         # Check if it's a VDP (Video Detail Page) link
         is_vdp = '/vdp/' in product_url
         if is_vdp:
-            print("[VDP] Detected Video Detail Page link")
+            self.log.debug("Detected Video Detail Page link")
         
         # Extract ASIN from URL
         asin = self._extract_asin(product_url)
         if not asin:
-            print("[X] Could not extract ASIN from URL")
-            print(f"[INFO] URL received: {product_url}")
-            print("\n[INFO] Supported product URL formats:")
-            print("       • https://www.amazon.com/dp/B08N5WRWNW")
-            print("       • https://www.amazon.com/gp/product/B08N5WRWNW")
-            print("       • https://www.amazon.com/vdp/...?product=B0D1G7XF9X (VDP link)")
-            print("       • https://amzn.to/XXXXX (short URL)")
-            print("\n[INFO] Make sure you're using a direct product page URL, not a category or search page")
+            self.log.error(
+                "Could not extract ASIN from URL - use a product page URL (/dp/<ASIN>, /gp/product/<ASIN>, "
+                "/vdp/...?product=<ASIN> or amzn.to), not a category or search page", extra={'url': product_url}
+            )
             return None
         
-        print(f"[SCRAPE] Scraping Amazon product page for ASIN: {asin}")
+        self.log.debug("Scraping Amazon product page for ASIN: %s", asin)
         
         # If it's a VDP link, try to extract video from VDP page first
         vdp_video_url = None
         if is_vdp:
-            print("[VDP] Attempting to extract video from VDP page...")
+            self.log.debug("Attempting to extract video from VDP page")
             vdp_video_url = self._extract_video_from_vdp_page(product_url)
             if vdp_video_url:
-                print(f"[OK] Found video on VDP page:")
-                print(f"     VIDEO URL: {vdp_video_url}")
+                self.log.debug("Found video on VDP page", extra={'video_url': vdp_video_url})
             else:
-                print("[!] Could not extract video from VDP page")
+                self.log.warning("Could not extract video from VDP page")
         
         # Get the regular product page URL
         regular_product_url = f'https://www.amazon.com/dp/{asin}'
@@ -163,17 +224,18 @@ class AmazonProductFetcher(ProductFetcher):
         # If we found a video on VDP page and product page doesn't have one, use VDP video
         if vdp_video_url and product_data and not product_data.get('video_url'):
             product_data['video_url'] = vdp_video_url
-            print(f"[OK] Using video from VDP page")
+            self.log.debug("Using video from VDP page")
         
         if product_data:
             return product_data
         else:
-            print("[!] Scraping failed, using mock data")
+            self.log.warning("Scraping failed, using mock data")
             return self._get_mock_product(asin)
     
+    @scrape_stage('category')
     def fetch_products_from_category(self, category_url: str, max_products: int = 20) -> List[Dict]:
         """משיכת כל המוצרים מדף קטגוריה"""
-        print(f"[CATEGORY] Extracting products from category page...")
+        self.log.info("Extracting products from category page")
         
         try:
             # Set headers to mimic a browser
@@ -192,10 +254,10 @@ class AmazonProductFetcher(ProductFetcher):
             product_urls = self._extract_product_urls_from_category(soup)
             
             if not product_urls:
-                print("[!] No product URLs found on category page")
+                self.log.warning("No product URLs found on category page")
                 return []
             
-            print(f"[OK] Found {len(product_urls)} product links")
+            self.log.info("Found %s product links", len(product_urls))
             
             # Limit to max_products
             product_urls = product_urls[:max_products]
@@ -203,27 +265,25 @@ class AmazonProductFetcher(ProductFetcher):
             # Fetch each product
             products = []
             for i, url in enumerate(product_urls, 1):
-                print(f"\n[PRODUCT] [{i}/{len(product_urls)}] Fetching: {url}")
+                self.log.debug("[%s/%s] Fetching: %s", i, len(product_urls), url)
                 asin = self._extract_asin(url)
                 if asin:
                     product = self._scrape_amazon_product(url, asin)
                     if product:
                         products.append(product)
                     else:
-                        print(f"[!] Failed to scrape product {asin}, skipping...")
+                        self.log.warning("Failed to scrape product %s, skipping", asin)
                 else:
-                    print(f"[!] Could not extract ASIN from {url}, skipping...")
+                    self.log.warning("Could not extract ASIN from %s, skipping", url)
                 
                 # Small delay to avoid being blocked
                 time.sleep(1)
             
-            print(f"\n[OK] Successfully fetched {len(products)} products from category")
+            self.log.info("Successfully fetched %s products from category", len(products))
             return products
             
         except Exception as e:
-            print(f"[X] Error fetching products from category: {e}")
-            import traceback
-            traceback.print_exc()
+            self.log.exception("Error fetching products from category: %s", e)
             return []
     
     def _extract_product_urls_from_category(self, soup: BeautifulSoup) -> List[str]:
@@ -287,10 +347,11 @@ class AmazonProductFetcher(ProductFetcher):
         
         return False
     
+    @scrape_stage('resolve')
     def _resolve_amazon_short_url(self, short_url: str) -> Optional[str]:
         """פתרון קישור קצר של Amazon (amzn.to) לקישור המלא"""
         try:
-            print(f"[RESOLVE] Resolving short URL: {short_url}")
+            self.log.debug("Resolving short URL: %s", short_url)
             
             # Set headers to avoid being blocked
             headers = {
@@ -306,42 +367,36 @@ class AmazonProductFetcher(ProductFetcher):
             response = self.session.get(short_url, headers=headers, allow_redirects=True, timeout=15)
             final_url = response.url
             
-            print(f"[RESOLVE] Final URL after redirects: {final_url}")
+            self.log.debug("Final URL after redirects: %s", final_url)
             
             # Check if resolved URL is a category page or "Keep shopping" page
             if self._is_category_page(final_url):
-                print(f"[!] Warning: Short URL resolved to a category page: {final_url}")
-                print("[INFO] You need a direct product URL. Please use a product page link instead.")
+                self.log.warning("Short URL resolved to a category page, not a product page", extra={'url': final_url})
                 return None
             
             # Check for "Keep shopping" or other non-product pages
             if 'keep shopping' in response.text.lower() or 'browse' in final_url.lower():
-                print(f"[!] Warning: Short URL resolved to a browse/shopping page, not a product page")
-                print("[INFO] This short link doesn't point to a specific product. Please use a direct product URL.")
+                self.log.warning("Short URL resolved to a browse/shopping page, not a product page", extra={'url': final_url})
                 return None
             
             # Try to extract ASIN from the final URL
             asin = self._extract_asin(final_url)
             if not asin:
-                print(f"[!] Warning: Could not extract ASIN from resolved URL: {final_url}")
-                print("[INFO] The short link may not point to a valid product page.")
+                self.log.warning("Could not extract ASIN from resolved URL", extra={'url': final_url})
                 # Still return the URL - let the caller try to handle it
                 return final_url
             
-            print(f"[OK] Successfully resolved short URL to product: {final_url}")
-            print(f"[OK] Extracted ASIN: {asin}")
+            self.log.debug("Resolved short URL to product %s", asin, extra={'url': final_url})
             return final_url
             
         except requests.exceptions.TooManyRedirects:
-            print(f"[X] Error: Too many redirects for short URL")
+            self.log.error("Too many redirects for short URL")
             return None
         except requests.exceptions.Timeout:
-            print(f"[X] Error: Timeout while resolving short URL")
+            self.log.error("Timeout while resolving short URL")
             return None
         except Exception as e:
-            print(f"[X] Error resolving short URL: {e}")
-            import traceback
-            traceback.print_exc()
+            self.log.exception("Error resolving short URL: %s", e)
             return None
     
     def _extract_asin(self, url: str) -> Optional[str]:
@@ -397,11 +452,15 @@ class AmazonProductFetcher(ProductFetcher):
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = self.session.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            with timed_stage(self.store, 'download') as stage_span:
+                response = self.session.get(url, headers=headers, timeout=15)
+                if stage_span is not None:
+                    stage_span.set(status=response.status_code, bytes=len(response.content))
+                response.raise_for_status()
             
             # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timed_stage(self.store, 'parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             # Extract product title
             title = self._extract_title(soup)
@@ -415,20 +474,18 @@ class AmazonProductFetcher(ProductFetcher):
             if not video_url:
                 video_url = self._extract_product_video(soup)
                 if video_url:
-                    print(f"[OK] Found product video on product page:")
-                    print(f"     VIDEO URL: {video_url}")
+                    self.log.debug("Found product video on product page", extra={'video_url': video_url})
                 else:
-                    print("[INFO] No product video found on product page, will use images")
+                    self.log.debug("No product video found on product page, will use images")
             else:
-                print(f"[OK] Using video from VDP:")
-                print(f"     VIDEO URL: {video_url}")
+                self.log.debug("Using video from VDP", extra={'video_url': video_url})
             
             # Extract image URLs (multiple images for slideshow)
             image_urls = self._extract_all_images(soup)
             if not image_urls:
-                print("[!] Warning: Could not extract product images from page")
+                self.log.warning("Could not extract product images from page", extra={'asin': asin})
             else:
-                print(f"[OK] Found {len(image_urls)} product image(s)")
+                self.log.debug("Found %s product image(s)", len(image_urls))
             
             # Extract main image URL (for backward compatibility)
             image_url = image_urls[0] if image_urls else None
@@ -454,35 +511,30 @@ class AmazonProductFetcher(ProductFetcher):
                 'description': description or 'High quality recommended product'
             }
             
-            # Print detailed information
-            print(f"\n[OK] Successfully scraped product:")
-            print(f"     Title: {product['title']}")
-            print(f"     Price: {product['price']}")
-            if product['original_price']:
-                print(f"     Original Price: {product['original_price']}")
-            if product['discount']:
-                print(f"     Discount: {product['discount']}")
-            print(f"     Rating: {product['rating']} ({product['reviews_count']} reviews)")
-            print(f"     Image: {'Found' if image_url else 'Not found - will use placeholder'}")
-            if product.get('video_url'):
-                print(f"     Video: FOUND")
-                print(f"     VIDEO URL: {product['video_url']}")
-            else:
-                print(f"     Video: Not found - will use images/slideshow")
-            if description:
-                print(f"     Description: {description[:100]}...")
+            # שורה אחת לכל מוצר; הפרטים כשדות מובנים
+            self.log.info("Scraped product %s", asin, extra={
+                'title': product['title'][:80],
+                'price': product['price'],
+                'original_price': product['original_price'] or None,
+                'discount': product['discount'] or None,
+                'rating': product['rating'],
+                'reviews': product['reviews_count'],
+                'images': len(image_urls),
+                'video': bool(product.get('video_url')),
+            })
             
             return product
             
         except requests.exceptions.RequestException as e:
-            print(f"[X] Network error scraping Amazon: {e}")
+            SCRAPE_ERRORS.inc(store=self.store)
+            self.log.error("Network error scraping Amazon: %s", e)
             return None
         except Exception as e:
-            print(f"[X] Error scraping Amazon product: {e}")
-            import traceback
-            traceback.print_exc()
+            SCRAPE_ERRORS.inc(store=self.store)
+            self.log.exception("Error scraping Amazon product: %s", e)
             return None
     
+    @scrape_stage('title')
     def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
         """חילוץ כותרת מוצר - משופר עם JSON-LD ו-selectors נוספים"""
         # First, try JSON-LD structured data (most reliable)
@@ -547,6 +599,7 @@ class AmazonProductFetcher(ProductFetcher):
         
         return None
     
+    @scrape_stage('price')
     def _extract_price(self, soup: BeautifulSoup) -> Dict[str, str]:
         """חילוץ מחיר מוצר - משופר עם JSON-LD ו-selectors נוספים"""
         price_data = {
@@ -693,6 +746,7 @@ class AmazonProductFetcher(ProductFetcher):
         
         return price_data
     
+    @scrape_stage('image')
     def _extract_image(self, soup: BeautifulSoup) -> Optional[str]:
         """חילוץ תמונת מוצר"""
         # Try multiple selectors for main product image
@@ -786,9 +840,10 @@ class AmazonProductFetcher(ProductFetcher):
         
         return None
     
+    @scrape_stage('vdp')
     def _extract_video_from_vdp_page(self, vdp_url: str) -> Optional[str]:
         """חילוץ סרטון מדף VDP (Video Detail Page)"""
-        print("[VDP] Extracting video from VDP page using requests...")
+        self.log.debug("Extracting video from VDP page using requests")
         try:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -863,10 +918,11 @@ class AmazonProductFetcher(ProductFetcher):
                     continue
             
         except Exception as e:
-            print(f"[!] Error extracting video from VDP page: {e}")
+            self.log.warning("Error extracting video from VDP page: %s", e)
         
         return None
     
+    @scrape_stage('video')
     def _extract_product_video(self, soup: BeautifulSoup) -> Optional[str]:
         """חילוץ סרטון מוצר אם קיים מדף מוצר רגיל"""
         # Try to find video in various formats
@@ -931,6 +987,7 @@ class AmazonProductFetcher(ProductFetcher):
         
         return None
     
+    @scrape_stage('images')
     def _extract_all_images(self, soup: BeautifulSoup) -> List[str]:
         """חילוץ כל תמונות המוצר"""
         image_urls = []
@@ -996,6 +1053,7 @@ class AmazonProductFetcher(ProductFetcher):
         # Limit to first 10 images
         return image_urls[:10]
     
+    @scrape_stage('rating')
     def _extract_rating(self, soup: BeautifulSoup) -> Dict[str, any]:
         """חילוץ דירוג וביקורות"""
         rating_data = {
@@ -1047,6 +1105,7 @@ class AmazonProductFetcher(ProductFetcher):
         
         return rating_data
     
+    @scrape_stage('description')
     def _extract_description(self, soup: BeautifulSoup) -> Optional[str]:
         """חילוץ תיאור מוצר - משופר עם JSON-LD ו-selectors נוספים"""
         # First, try JSON-LD structured data
@@ -1155,7 +1214,7 @@ class AmazonProductFetcher(ProductFetcher):
             
             return clean_url
         except Exception as e:
-            print(f"[!] Error normalizing affiliate link: {e}")
+            self.log.warning("Error normalizing affiliate link: %s", e)
             return affiliate_link
     
     def _create_affiliate_url(self, url: str, asin: str) -> str:
@@ -1230,6 +1289,8 @@ class AmazonProductFetcher(ProductFetcher):
 class AliExpressProductFetcher(ProductFetcher):
     """משיכת מוצרים מ-AliExpress Affiliate"""
     
+    store = 'aliexpress'
+    
     def __init__(self):
         super().__init__()
         self.app_key = os.getenv('ALIEXPRESS_APP_KEY')
@@ -1237,6 +1298,7 @@ class AliExpressProductFetcher(ProductFetcher):
         # AliExpress affiliate tracking parameter
         self.affiliate_tracking = os.getenv('ALIEXPRESS_AFFILIATE_TRACKING', '')
     
+    @scrape_stage('search')
     def search_products(self, keywords: str, max_results: int = 10) -> List[Dict]:
         """חיפוש מוצרים ב-AliExpress"""
         try:
@@ -1261,26 +1323,27 @@ class AliExpressProductFetcher(ProductFetcher):
                     if product:
                         products.append(product)
                 except Exception as e:
-                    print(f"[!] Error extracting product {i+1}: {e}")
+                    self.log.warning("Error extracting product %s: %s", i+1, e)
                     continue
             
             if products:
                 return products
             else:
-                print("[!] No products found via scraping, using mock data")
+                self.log.warning("No products found via scraping, using mock data")
                 return self._get_mock_products()
                 
         except Exception as e:
-            print(f"[X] Error fetching from AliExpress: {e}")
+            self.log.error("Error fetching from AliExpress: %s", e)
             return self._get_mock_products()
     
+    @scrape_stage('total', span_name='fetch_product')
     def fetch_product_by_url(self, product_url: str) -> Optional[Dict]:
         """משיכת מוצר לפי URL"""
         try:
             # Clean URL and add affiliate tracking if needed
             clean_url = self._clean_affiliate_url(product_url)
             
-            print(f"[FETCH] Fetching AliExpress product from: {clean_url}")
+            self.log.debug("Fetching AliExpress product from: %s", clean_url)
             
             # Set better headers for AliExpress
             headers = {
@@ -1295,39 +1358,46 @@ class AliExpressProductFetcher(ProductFetcher):
                 'Sec-Fetch-Site': 'none'
             }
             
-            response = self.session.get(clean_url, headers=headers, timeout=15)
-            response.raise_for_status()
+            with timed_stage(self.store, 'download') as stage_span:
+                response = self.session.get(clean_url, headers=headers, timeout=15)
+                if stage_span is not None:
+                    stage_span.set(status=response.status_code, bytes=len(response.content))
+                response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with timed_stage(self.store, 'parse'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             # Debug: Print page title to verify we got the right page
             page_title = soup.find('title')
             if page_title:
-                print(f"[DEBUG] Page title: {page_title.get_text(strip=True)[:100]}")
+                self.log.debug("Page title: %s", page_title.get_text(strip=True)[:100])
             
             # Extract product information
             product = self._scrape_aliexpress_product(soup, clean_url)
             
             if product:
-                print(f"[OK] Successfully scraped AliExpress product: {product.get('title', 'Unknown')}")
-                print(f"[OK] Price extracted: {product.get('price', 'N/A')}")
+                self.log.info("Scraped AliExpress product", extra={
+                    'title': product.get('title', 'Unknown')[:80], 'price': product.get('price', 'N/A'),
+                })
                 if not product.get('price') or product.get('price') == '$0':
-                    print("[!] WARNING: Price extraction may have failed. Price is missing or $0.")
+                    self.log.warning("Price extraction may have failed - price is missing or $0", extra={'url': clean_url})
                 return product
             else:
-                print("[!] Failed to extract product data, using fallback")
+                self.log.warning("Failed to extract product data, using fallback")
                 product_id = self._extract_product_id(clean_url)
                 if product_id:
                     return self._get_mock_product(product_id)
                 return None
                 
         except Exception as e:
-            print(f"[X] Error fetching AliExpress product: {e}")
+            SCRAPE_ERRORS.inc(store=self.store)
+            self.log.error("Error fetching AliExpress product: %s", e)
             product_id = self._extract_product_id(product_url)
             if product_id:
                 return self._get_mock_product(product_id)
             return None
     
+    @scrape_stage('extract')
     def _scrape_aliexpress_product(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """חילוץ מידע מוצר מ-AliExpress"""
         try:
@@ -1566,12 +1636,11 @@ class AliExpressProductFetcher(ProductFetcher):
             
             # Debug: Print what we found
             if not price:
-                print("[!] WARNING: Could not extract price using any method")
-                print(f"[DEBUG] Title found: {title is not None}")
-                print(f"[DEBUG] Image found: {image_url is not None}")
-                # Try to find any price-like text in the page for debugging
-                all_text = soup.get_text()[:500]  # First 500 chars
-                print(f"[DEBUG] Sample page text: {all_text[:200]}...")
+                self.log.warning("Could not extract price using any method",
+                                 extra={'title_found': title is not None, 'image_found': image_url is not None})
+                # Try to find any price-like text in the page for debugging (get_text על כל הדף - רק כשיש debug)
+                if self.log.isEnabledFor(logging.DEBUG):
+                    self.log.debug("Sample page text: %s", soup.get_text()[:200])
             
             # Build product dictionary
             product = {
@@ -1602,7 +1671,7 @@ class AliExpressProductFetcher(ProductFetcher):
             return product
             
         except Exception as e:
-            print(f"[!] Error scraping AliExpress product: {e}")
+            self.log.warning("Error scraping AliExpress product: %s", e)
             return None
     
     def _find_price_in_json(self, data, depth=0):
@@ -1736,6 +1805,8 @@ class AliExpressProductFetcher(ProductFetcher):
 class eBayProductFetcher(ProductFetcher):
     """משיכת מוצרים מ-eBay Partner Network"""
     
+    store = 'ebay'
+    
     def __init__(self):
         super().__init__()
         self.app_id = os.getenv('EBAY_APP_ID')
@@ -1743,10 +1814,11 @@ class eBayProductFetcher(ProductFetcher):
         self.dev_id = os.getenv('EBAY_DEV_ID')
         self.affiliate_campaign_id = os.getenv('EBAY_AFFILIATE_CAMPAIGN_ID', '')
     
+    @scrape_stage('search')
     def search_products(self, keywords: str, max_results: int = 10) -> List[Dict]:
         """חיפוש מוצרים ב-eBay"""
         if not self.app_id:
-            print("[!] eBay API credentials not configured. Using mock data.")
+            self.log.warning("eBay API credentials not configured. Using mock data.")
             return self._get_mock_products()
         
         try:
@@ -1755,9 +1827,10 @@ class eBayProductFetcher(ProductFetcher):
             # For now, we'll use mock data
             return self._get_mock_products()
         except Exception as e:
-            print(f"[X] Error fetching from eBay: {e}")
+            self.log.error("Error fetching from eBay: %s", e)
             return self._get_mock_products()
     
+    @scrape_stage('total', span_name='fetch_product')
     def fetch_product_by_url(self, product_url: str) -> Optional[Dict]:
         """משיכת מוצר לפי URL"""
         # Extract item ID from eBay URL
@@ -3,9 +3,20 @@ Product Manager - ניהול מוצרים שמורים
 """
 import json
 import os
+import time
 from typing import List, Dict, Optional
 from datetime import datetime
 
+import metrics
+import tracing
+from log_config import get_logger
+
+
+log = get_logger('products')
+
+SAVE_SECONDS = metrics.histogram('product_manager_save_seconds', 'Time to write products.json',
+                                 buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+
 
 class ProductManager:
     """מחלקה לניהול מוצרים שמורים"""
@@ -14,6 +25,7 @@ class ProductManager:
         self.storage_file = storage_file
         self.products = []
         self.load_products()
+        metrics.gauge('saved_products', 'Products in products.json', function=lambda: len(self.products))
     
     def load_products(self):
         """טעינת מוצרים מקובץ"""
@@ -23,23 +35,26 @@ class ProductManager:
                     data = json.load(f)
                     self.products = data.get('products', [])
             except Exception as e:
-                print(f"[!] Error loading products: {e}")
+                log.warning("Error loading products: %s", e)
                 self.products = []
         else:
             self.products = []
     
     def save_products(self):
         """שמירת מוצרים לקובץ"""
+        started = time.perf_counter()
         try:
             data = {
                 'last_updated': datetime.now().isoformat(),
                 'products': self.products
             }
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with tracing.span('save_products', products=len(self.products)):
+                with open(self.storage_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            SAVE_SECONDS.observe(time.perf_counter() - started)
             return True
         except Exception as e:
-            print(f"[!] Error saving products: {e}")
+            log.error("Error saving products: %s", e)
             return False
     
     def add_product(self, product: Dict) -> bool:
@@ -121,6 +136,10 @@ class ProductManager:
                 results.append(product)
         return results
     
+    def get_asin(self, product: Dict) -> Optional[str]:
+        """ה-ASIN של מוצר (מהקישור או מהשדה asin)"""
+        return self._extract_asin_from_product(product)
+    
     def _extract_asin_from_product(self, product: Dict) -> Optional[str]:
         """חילוץ ASIN ממוצר"""
         # Try from affiliate_url
@@ -148,7 +167,7 @@ class ProductManager:
                 
                 return count
         except Exception as e:
-            print(f"[!] Error importing products: {e}")
+            log.warning("Error importing products: %s", e)
             return 0
     
     def export_to_file(self, file_path: str) -> bool:
@@ -162,5 +181,5 @@ class ProductManager:
                 }, f, ensure_ascii=False, indent=2)
             return True
         except Exception as e:
-            print(f"[!] Error exporting products: {e}")
+            log.warning("Error exporting products: %s", e)
             return False
@@ -0,0 +1,104 @@
+"""
+פרופילי רינדור - רזולוציה, fps והגדרות מקודד לכל רמת איכות
+Render quality profiles (resolution, fps, x264 preset, CRF, threads)
+"""
+# -*- coding: utf-8 -*-
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+class RenderProfile:
+    """הגדרות רינדור בעלות שם"""
+    
+    def __init__(self, name: str, size: Tuple[int, int], fps: int, preset: str, crf: int, threads: int,
+                 output_format: str = 'vertical'):
+        self.name = name
+        self.size = size  # (רוחב, גובה)
+        self.fps = fps
+        self.preset = preset  # x264 preset
+        self.crf = crf
+        self.threads = threads
+        self.output_format = output_format
+    
+    def scale_from(self, design_size: Tuple[int, int]) -> float:
+        """יחס קנה המידה מהגודל שעליו התבנית מתוכננת (1080x1920) - התבנית נכנסת כולה לפריים"""
+        return min(self.size[0] / design_size[0], self.size[1] / design_size[1])
+    
+    def for_format(self, output_format: str) -> 'RenderProfile':
+        """אותו פרופיל ביחס תמונה אחר (הצלע הקצרה נשמרת)"""
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        if output_format == self.output_format:
+            return self
+        ratio_w, ratio_h = OUTPUT_FORMATS[output_format]
+        short_side = min(self.size)
+        if ratio_w >= ratio_h:
+            size = (_even(short_side * ratio_w / ratio_h), short_side)
+        else:
+            size = (short_side, _even(short_side * ratio_h / ratio_w))
+        return RenderProfile(self.name, size, self.fps, self.preset, self.crf, self.threads, output_format)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'width': self.size[0],
+            'height': self.size[1],
+            'fps': self.fps,
+            'preset': self.preset,
+            'crf': self.crf,
+            'threads': self.threads,
+            'format': self.output_format,
+        }
+
+
+def _even(value: float) -> int:
+    """libx264 עם yuv420p דורש מידות זוגיות"""
+    return int(round(value / 2.0)) * 2
+
+
+# יחסי תמונה לפלט: Reels/TikTok, פוסט בפיד, YouTube
+OUTPUT_FORMATS = {
+    'vertical': (9, 16),
+    'square': (1, 1),
+    'landscape': (16, 9),
+}
+DEFAULT_FORMAT = 'vertical'
+
+
+RENDER_PROFILES = {
+    # תצוגה מקדימה ראשונית - מוכנה תוך שניות, לפני הרינדור המלא
+    'preview': RenderProfile('preview', (360, 640), fps=15, preset='ultrafast', crf=32, threads=2),
+    # טיוטה מהירה
+    'draft': RenderProfile('draft', (540, 960), fps=24, preset='ultrafast', crf=30, threads=2),
+    # איכות טובה בזמן סביר
+    'standard': RenderProfile('standard', (720, 1280), fps=30, preset='veryfast', crf=23, threads=4),
+    # האיכות המלאה - ההגדרות הקודמות של המערכת (medium, 4 threads, ו-CRF 23 שהוא ברירת המחדל של libx264)
+    'final': RenderProfile('final', (1080, 1920), fps=30, preset='medium', crf=23, threads=4),
+}
+
+DEFAULT_PROFILE = os.getenv('RENDER_PROFILE', 'final')
+PREVIEW_PROFILE = 'preview'
+
+
+def get_profile(name: Optional[str] = None) -> RenderProfile:
+    """קבלת פרופיל לפי שם (ברירת מחדל: RENDER_PROFILE או final)"""
+    name = name or DEFAULT_PROFILE
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile '{name}'. Available: {', '.join(RENDER_PROFILES)}")
+    return RENDER_PROFILES[name]
+
+
+def parse_formats(formats) -> List[str]:
+    """רשימת פורמטים מרשימה או ממחרוזת מופרדת בפסיקים (ברירת מחדל: אנכי בלבד)"""
+    if not formats:
+        return [DEFAULT_FORMAT]
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    result = []
+    for output_format in formats:
+        output_format = output_format.strip().lower()
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+        if output_format not in result:
+            result.append(output_format)
+    return result
@@ -0,0 +1,154 @@
+"""
+קובץ checkpoint לריצות ארוכות - המשך ריצה שנקטעה בלי לקודד מחדש מה שכבר נוצר
+Run checkpoint manifest - lets a crashed batch run resume with --resume
+"""
+# -*- coding: utf-8 -*-
+import os
+import re
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+def write_json_atomic(path: str, data: Dict):
+    """כתיבה לקובץ זמני והחלפה - קובץ חלקי לא נשאר אם התהליך נקטע באמצע"""
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def product_id(product: Dict) -> str:
+    """מזהה יציב למוצר: ASIN אם יש, אחרת הקישור, אחרת הכותרת"""
+    if product.get('asin'):
+        return product['asin']
+    for key in ('affiliate_url', 'url', 'product_url'):
+        url = product.get(key) or ''
+        match = re.search(r'/(?:dp|gp/product)/([A-Z0-9]{10})', url)
+        if match:
+            return match.group(1)
+    return product.get('affiliate_url') or product.get('url') or product.get('title', 'unknown')
+
+
+def product_fingerprint(product: Dict, profile: str, formats: List[str]) -> str:
+    """טביעת אצבע של כל מה שמשפיע על הסרטון - שינוי במחיר, בתמונות או בפרופיל מחייב רינדור מחדש"""
+    relevant = {
+        key: product.get(key)
+        for key in ('title', 'price', 'original_price', 'discount', 'rating', 'image_url', 'image_urls', 'video_url')
+    }
+    relevant.update(profile=profile, formats=list(formats))
+    payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def run_manifest_path(output_dir: str, *key_parts) -> str:
+    """נתיב ברירת מחדל לפי פרמטרי הריצה, כך ש---resume מוצא אותו בלי לציין קובץ"""
+    key = '_'.join(str(part) for part in key_parts if part)
+    slug = re.sub(r'[^A-Za-z0-9_-]+', '-', key).strip('-')[:60] or 'run'
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(output_dir, f'run_{slug}_{digest}.json')
+
+
+class RunCheckpoint:
+    """מניפסט ריצה: לכל מוצר - מזהה, נתוני המוצר, טביעת אצבע, קבצי פלט וסטטוס. נשמר אחרי כל שינוי סטטוס.
+    עם resume: מוצר שהושלם (אותה טביעת אצבע והקבצים קיימים) מדולג; נכשל או שנקטע באמצע - נכנס שוב לתור,
+    גם אם החיפוש החדש כבר לא מחזיר אותו (unfinished_products)"""
+    
+    def __init__(self, path: str, profile: str, formats: List[str], source: Optional[Dict] = None,
+                 resume: bool = False):
+        self.path = path
+        self.profile = profile
+        self.formats = list(formats)
+        self._lock = threading.Lock()
+        
+        self.manifest = None
+        if resume:
+            self.manifest = self._load()
+            if self.manifest is None:
+                print(f"[!] No checkpoint found at {path}, starting fresh")
+            else:
+                print(f"[OK] Resuming from checkpoint: {path}")
+        if self.manifest is None:
+            self.manifest = {
+                'created_at': datetime.now().isoformat(),
+                'source': source or {},
+                'items': {},
+            }
+        self.manifest.update(profile=profile, formats=self.formats)
+    
+    def _load(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"[!] Could not read checkpoint {self.path}: {e}")
+            return None
+    
+    def completed_videos(self, product: Dict) -> Optional[Dict[str, str]]:
+        """הסרטונים מריצה קודמת אם המוצר כבר הושלם ולא השתנה (אחרת None)"""
+        with self._lock:
+            item = self.manifest['items'].get(product_id(product))
+        if not item or item.get('status') != 'completed':
+            return None
+        if item.get('fingerprint') != product_fingerprint(product, self.profile, self.formats):
+            return None
+        videos = item.get('videos') or {}
+        if not videos or not all(os.path.exists(path) for path in videos.values()):
+            return None
+        return videos
+    
+    def mark(self, product: Dict, status: str, videos: Optional[Dict[str, str]] = None,
+             error: Optional[str] = None):
+        """עדכון סטטוס של מוצר (pending / processing / completed / failed) ושמירה"""
+        key = product_id(product)
+        with self._lock:
+            item = self.manifest['items'].setdefault(key, {'product_id': key, 'attempts': 0})
+            item.update(
+                title=product.get('title', ''),
+                product=product,
+                fingerprint=product_fingerprint(product, self.profile, self.formats),
+                status=status,
+                updated_at=datetime.now().isoformat(),
+            )
+            if status == 'processing':
+                item['attempts'] = item.get('attempts', 0) + 1
+                item['error'] = None
+            if videos is not None:
+                item['videos'] = videos
+            if error is not None:
+                item['error'] = error
+            self._save()
+    
+    def unfinished_products(self, products: Iterable[Dict] = ()) -> List[Dict]:
+        """מוצרים מהמניפסט שלא הושלמו (failed / processing / pending) ואינם ב-products - להוספה לתור בהמשך ריצה.
+        פריטים ממניפסט ישן בלי נתוני מוצר לא ניתנים לשחזור ומדולגים"""
+        present = {product_id(product) for product in products}
+        with self._lock:
+            return [
+                item['product'] for key, item in self.manifest['items'].items()
+                if item.get('status') in ('failed', 'processing', 'pending') and key not in present and item.get('product')
+            ]
+    
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {}
+            for item in self.manifest['items'].values():
+                counts[item['status']] = counts.get(item['status'], 0) + 1
+            return counts
+    
+    def _save(self):
+        """נקרא כשהמנעול מוחזק"""
+        self.manifest['updated_at'] = datetime.now().isoformat()
+        try:
+            write_json_atomic(self.path, self.manifest)
+        except OSError as e:
+            print(f"[!] Could not write checkpoint: {e}")
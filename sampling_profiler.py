@@ -0,0 +1,165 @@
+"""
+פרופיילר דוגם לתהליך חי: כל כמה מילישניות נלקחת המחסנית של כל thread (Flask ו-workers של הרינדור),
+והתוצאה נכתבת כ-collapsed stacks - הפורמט ש-flamegraph.pl, speedscope ו-inferno קוראים
+Sampling profiler - periodic sys._current_frames() snapshots of every thread, written as collapsed stacks
+"""
+# -*- coding: utf-8 -*-
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from log_config import get_logger
+
+
+log = get_logger('profiler')
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '120'))
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', '0.01'))  # 100 דגימות בשנייה
+# אות שמפעיל פרופיל ברקע (למשל SIGUSR2 עם python app.py; תחת gunicorn אות שהוא לא משתמש בו, כמו SIGRTMIN)
+PROFILE_SIGNAL = os.getenv('PROFILE_SIGNAL', '')
+PROFILE_SIGNAL_SECONDS = float(os.getenv('PROFILE_SIGNAL_SECONDS', '30'))
+
+# פונקציות שבהן thread ממתין (תור ריק, select, accept) - לא נספרות אלא אם ביקשו include_idle
+IDLE_FRAMES = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'), ('selectors.py', 'select'), ('socket.py', 'accept'),
+    ('socketserver.py', 'serve_forever'), ('thread.py', '_worker'),
+}
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """כבר רץ פרופיל בתהליך הזה"""
+
+
+def _frame_label(code, cache: Dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        # site-packages/moviepy/video/fx/resize.py -> moviepy/video/fx/resize.py
+        for marker in ('site-packages' + os.sep, 'dist-packages' + os.sep):
+            if marker in filename:
+                filename = filename.split(marker, 1)[1]
+                break
+        else:
+            filename = os.path.relpath(filename) if not filename.startswith('<') else filename
+            if filename.startswith('..'):
+                filename = os.path.basename(filename)
+        # ';' מפריד בין פריימים בפורמט - לא יכול להופיע בתוך התווית
+        label = cache[code] = f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+    return label
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def sample(seconds: float, interval: float = PROFILE_INTERVAL, include_idle: bool = False,
+           thread_filter: Optional[str] = None) -> Dict:
+    """דגימת כל ה-threads במשך seconds. מחזיר את המחסניות המצטברות ({stack: count}) ונתוני הריצה.
+    thread_filter: רק threads שהשם שלהם מכיל את המחרוזת (למשל 'video-render')"""
+    seconds = max(0.1, min(seconds, PROFILE_MAX_SECONDS))
+    interval = max(0.001, interval)
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        own = threading.get_ident()
+        stacks: Counter = Counter()
+        labels: Dict = {}
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                name = names.get(ident, f'thread-{ident}')
+                if thread_filter and thread_filter not in name:
+                    continue
+                if not include_idle and _is_idle(frame):
+                    continue
+                parts = []
+                while frame is not None:
+                    parts.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+                parts.append(name.replace(';', ':').replace(' ', '_'))
+                stacks[';'.join(reversed(parts))] += 1
+            samples += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+    return {
+        'stacks': stacks,
+        'samples': samples,
+        'seconds': round(elapsed, 2),
+        'interval': interval,
+        'pid': os.getpid(),
+    }
+
+
+def collapsed(profile: Dict) -> str:
+    """שורה לכל מחסנית: "thread;outer;...;inner count" (מהנפוצה לנדירה)"""
+    return ''.join(f'{stack} {count}\n' for stack, count in profile['stacks'].most_common())
+
+
+def write_profile(profile: Dict, directory: str = PROFILE_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"profile_{profile['pid']}_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(collapsed(profile))
+    return path
+
+
+def profile_to_file(seconds: float = PROFILE_SIGNAL_SECONDS, **options) -> Optional[str]:
+    try:
+        profile = sample(seconds, **options)
+    except ProfilerBusy:
+        log.warning("Profiler already running, signal ignored")
+        return None
+    path = write_profile(profile)
+    log.info("Profile written to %s", path, extra={'samples': profile['samples'], 'seconds': profile['seconds']})
+    return path
+
+
+def install_signal_handler(signal_name: str = PROFILE_SIGNAL) -> bool:
+    """אות (למשל SIGUSR2) מפעיל פרופיל של PROFILE_SIGNAL_SECONDS ב-thread נפרד וכותב אותו ל-PROFILE_DIR.
+    חייב להיקרא מה-thread הראשי; כבוי כש-PROFILE_SIGNAL ריק"""
+    if not signal_name:
+        return False
+    name, _, offset = signal_name.upper().partition('+')  # גם SIGRTMIN+2
+    signum = getattr(signal, name if name.startswith('SIG') else f'SIG{name}', None)
+    if signum is None or (offset and not offset.isdigit()):
+        log.warning("Unknown PROFILE_SIGNAL: %s", signal_name)
+        return False
+    
+    def handler(signum, frame):
+        # ה-handler רץ בתוך ה-thread הראשי - הדגימה עצמה ב-thread משלה
+        threading.Thread(target=profile_to_file, name='sampling-profiler', daemon=True).start()
+    
+    try:
+        signal.signal(signum + int(offset or 0), handler)
+    except (ValueError, OSError) as e:
+        log.warning("Could not install profiler signal %s: %s", signal_name, e)
+        return False
+    log.info("Sampling profiler armed on %s", signal_name, extra={'pid': os.getpid()})
+    return True
+
+
+if __name__ == '__main__':
+    # דוגמה: python sampling_profiler.py 5 - פרופיל של התהליך הזה עצמו (בדיקת הפורמט)
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    worker = threading.Thread(target=lambda: sum(i * i for i in range(10 ** 9)), name='busy', daemon=True)
+    worker.start()
+    print(collapsed(sample(seconds)), end='')
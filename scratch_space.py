@@ -0,0 +1,247 @@
+"""
+ניהול קבצים זמניים ומכסות דיסק: תיקיית עבודה לכל עבודה ו-janitor שמנקה את temp_files/ ו-output_videos/
+Scratch space - per-job working directories, plus a background janitor enforcing size/age quotas
+"""
+# -*- coding: utf-8 -*-
+import fnmatch
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+import metrics
+from log_config import get_logger
+
+
+log = get_logger('janitor')
+
+MB = 1024 * 1024
+
+# מכסות (0 = ללא הגבלה)
+TEMP_MAX_MB = float(os.getenv('TEMP_MAX_MB', '2048'))
+TEMP_MAX_AGE_HOURS = float(os.getenv('TEMP_MAX_AGE_HOURS', '24'))
+OUTPUT_MAX_MB = float(os.getenv('OUTPUT_MAX_MB', '10240'))
+OUTPUT_MAX_AGE_DAYS = float(os.getenv('OUTPUT_MAX_AGE_DAYS', '30'))
+JANITOR_INTERVAL = float(os.getenv('JANITOR_INTERVAL', '600'))
+# קבצים שהשתנו לאחרונה לא נמחקים גם בחריגה ממכסה - ייתכן שעדיין נכתבים
+JANITOR_MIN_AGE = float(os.getenv('JANITOR_MIN_AGE', '600'))
+
+# קבצים שנלווים לסרטון (פוסטר ותצוגה מונפשת, <שם>.jpg / <שם>.webp) נמחקים יחד איתו
+SIDECAR_EXTENSIONS = ('.jpg', '.webp')
+# מניפסטים של ריצות ואצוות (checkpoint ל---resume) - קטנים, ולא נכנסים למכסות
+KEEP_PATTERNS = ('run_*.json', 'batch_*.json')
+
+
+def _remove(path: str) -> int:
+    """מחיקת קובץ או תיקייה; מחזיר כמה בתים התפנו"""
+    size = _size(path)
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except OSError:
+        return 0
+    return size
+
+
+def _size(path: str) -> int:
+    if os.path.isdir(path) and not os.path.islink(path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class ScratchSpace:
+    """תיקיית עבודה נפרדת לכל עבודה בתוך temp_files/, שנמחקת בסיום - בהצלחה, בכישלון או בביטול"""
+    
+    def __init__(self, root: str = 'temp_files'):
+        self.root = root
+        self._active: Set[str] = set()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+    
+    def create(self, label: str = 'job') -> str:
+        """פתיחת תיקיית עבודה (חובה לשחרר עם release)"""
+        label = ''.join(c for c in label[:30] if c.isalnum() or c in '-_') or 'job'
+        path = tempfile.mkdtemp(prefix=f'job_{label}_', dir=self.root)
+        with self._lock:
+            self._active.add(os.path.abspath(path))
+        return path
+    
+    def release(self, path: Optional[str]):
+        """מחיקת תיקיית העבודה וכל מה שבתוכה"""
+        if not path:
+            return
+        with self._lock:
+            self._active.discard(os.path.abspath(path))
+        shutil.rmtree(path, ignore_errors=True)
+    
+    @contextmanager
+    def job_dir(self, label: str = 'job') -> Iterator[str]:
+        path = self.create(label)
+        try:
+            yield path
+        finally:
+            self.release(path)
+    
+    def active(self) -> Set[str]:
+        """תיקיות של עבודות שרצות כרגע (ה-janitor לא נוגע בהן)"""
+        with self._lock:
+            return set(self._active)
+
+
+class DiskJanitor:
+    """thread ברקע שאוכף מכסת גיל וגודל על כל תיקייה: קודם נמחק מה שישן מדי,
+    ואז הישנים ביותר עד שהתיקייה חוזרת מתחת למכסת הגודל"""
+    
+    def __init__(self, scratch: Optional[ScratchSpace] = None, output_dir: str = 'output_videos',
+                 interval: Optional[float] = None, min_age: Optional[float] = None,
+                 on_remove: Optional[Callable[[str], None]] = None):
+        """on_remove: נקרא עם הנתיב של כל קובץ שנמחק (למשל להסרה מקטלוג הסרטונים)"""
+        self.scratch = scratch or ScratchSpace()
+        self.on_remove = on_remove
+        self.interval = interval or JANITOR_INTERVAL
+        self.min_age = JANITOR_MIN_AGE if min_age is None else min_age
+        # תיקייה -> (מכסת גודל בבתים, גיל מקסימלי בשניות); 0 = ללא הגבלה
+        self.quotas = {
+            self.scratch.root: (TEMP_MAX_MB * MB, TEMP_MAX_AGE_HOURS * 3600),
+            output_dir: (OUTPUT_MAX_MB * MB, OUTPUT_MAX_AGE_DAYS * 86400),
+        }
+        self.reclaimed_bytes = 0
+        self.removed_files = 0
+        self.last_run: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = None
+        metrics.gauge('disk_reclaimed_bytes', 'Bytes freed by the disk janitor', kind='counter',
+                      function=lambda: self.reclaimed_bytes)
+        metrics.gauge('disk_removed_files', 'Files and directories removed by the disk janitor', kind='counter',
+                      function=lambda: self.removed_files)
+        metrics.gauge('scratch_active_jobs', 'Job working directories currently in use',
+                      function=lambda: len(self.scratch.active()))
+    
+    def start(self) -> 'DiskJanitor':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='disk-janitor', daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                log.warning("Janitor error: %s", e)
+            self._stop.wait(self.interval)
+    
+    def run_once(self) -> Dict:
+        """מעבר ניקוי אחד על כל התיקיות; מחזיר כמה בתים וקבצים התפנו בכל תיקייה"""
+        report = {}
+        for directory, (max_bytes, max_age) in self.quotas.items():
+            reclaimed, removed = self._enforce(directory, max_bytes, max_age)
+            report[directory] = {'reclaimed_bytes': reclaimed, 'removed': removed}
+            if removed:
+                log.info("Reclaimed %.1f MB in %s", reclaimed / MB, directory, extra={'removed': removed})
+        self.last_run = time.time()
+        return report
+    
+    def _entries(self, directory: str) -> List[Dict]:
+        """יחידות מחיקה: קובץ או תיקייה, וסרטון .mp4 יחד עם הקבצים הנלווים שלו (paths).
+        mtime של קבוצה הוא של הקובץ החדש בה"""
+        protected = self.scratch.active()
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        videos = {os.path.splitext(name)[0] for name in names if name.endswith('.mp4')}
+        groups: Dict[str, Dict] = {}
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.abspath(path) in protected or any(fnmatch.fnmatch(name, pattern) for pattern in KEEP_PATTERNS):
+                continue
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            stem, extension = os.path.splitext(name)
+            key = stem + '.mp4' if extension in SIDECAR_EXTENSIONS and stem in videos else name
+            entry = groups.setdefault(key, {'path': os.path.join(directory, key), 'paths': [], 'mtime': 0, 'size': 0})
+            entry['paths'].append(path)
+            entry['mtime'] = max(entry['mtime'], mtime)
+            entry['size'] += _size(path)
+        return list(groups.values())
+    
+    def _enforce(self, directory: str, max_bytes: float, max_age: float):
+        now = time.time()
+        entries = sorted(self._entries(directory), key=lambda entry: entry['mtime'])
+        reclaimed = removed = 0
+        
+        # 1. גיל
+        if max_age:
+            for entry in [entry for entry in entries if now - entry['mtime'] > max(max_age, self.min_age)]:
+                reclaimed += self._remove_entry(entry)
+                removed += len(entry['paths'])
+                entries.remove(entry)
+        
+        # 2. גודל - הישנים ראשונים
+        if max_bytes:
+            total = sum(entry['size'] for entry in entries)
+            for entry in entries:
+                if total <= max_bytes:
+                    break
+                if now - entry['mtime'] < self.min_age:
+                    continue
+                freed = self._remove_entry(entry)
+                total -= entry['size']
+                reclaimed += freed
+                removed += len(entry['paths'])
+        
+        self.reclaimed_bytes += reclaimed
+        self.removed_files += removed
+        return reclaimed, removed
+    
+    def _remove_entry(self, entry: Dict) -> int:
+        freed = 0
+        for path in entry['paths']:
+            freed += _remove(path)
+            if self.on_remove is not None:
+                try:
+                    self.on_remove(path)
+                except Exception as e:
+                    log.warning("Janitor callback error: %s", e)
+        return freed
+    
+    def usage(self) -> Dict:
+        """שימוש נוכחי מול המכסות, וסה"כ שפונה מאז שהתהליך עלה"""
+        directories = {}
+        for directory, (max_bytes, max_age) in self.quotas.items():
+            entries = self._entries(directory)
+            directories[directory] = {
+                'bytes': sum(entry['size'] for entry in entries),
+                'entries': len(entries),
+                'max_bytes': int(max_bytes) or None,
+                'max_age_seconds': int(max_age) or None,
+            }
+        return {
+            'directories': directories,
+            'active_jobs': len(self.scratch.active()),
+            'reclaimed_bytes': self.reclaimed_bytes,
+            'removed': self.removed_files,
+            'last_run': self.last_run,
+            'interval_seconds': self.interval,
+        }
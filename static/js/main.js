@@ -169,9 +169,81 @@ async function generateVideo(productTitle, product) {
     }
 }
 
-// Check video generation status
-async function checkVideoStatus(videoId) {
-    const maxAttempts = 60; // 5 minutes max
+// Consecutive EventSource errors before switching to polling (e.g. a proxy that buffers or cuts the stream)
+const SSE_MAX_ERRORS = 3;
+
+// Show a link to the quick preview - window.open outside a click is blocked by popup blockers
+function showPreviewNotice(url) {
+    const notice = document.createElement('div');
+    notice.className = 'preview-notice';
+    notice.innerHTML = `
+        <span><i class="fas fa-eye"></i> תצוגה מקדימה מוכנה! הסרטון באיכות מלאה עדיין בהכנה.</span>
+        <a class="btn btn-primary" target="_blank" rel="noopener"><i class="fas fa-play"></i> פתח תצוגה מקדימה</a>
+        <button type="button" class="preview-notice-close" aria-label="סגור">&times;</button>
+    `;
+    const link = notice.querySelector('a');
+    link.href = url;
+    link.addEventListener('click', () => notice.remove());
+    notice.querySelector('button').addEventListener('click', () => notice.remove());
+    document.body.appendChild(notice);
+}
+
+// Handle a video status update - returns true once the job is finished
+function handleVideoStatus(status, state) {
+    // Quick preview is ready while the full render continues
+    if (!state.previewShown && status.preview && status.preview.status === 'completed' && status.status === 'processing') {
+        state.previewShown = true;
+        showPreviewNotice(status.preview.url);
+    }
+    
+    if (status.status === 'completed') {
+        alert(`הסרטון נוצר בהצלחה!\n${status.filename}`);
+        return true;
+    } else if (status.status === 'failed') {
+        alert('יצירת הסרטון נכשלה: ' + status.message);
+        return true;
+    } else if (status.status === 'cancelled') {
+        alert('יצירת הסרטון בוטלה');
+        return true;
+    } else if (status.status === 'not_found') {
+        alert('עבודת הסרטון לא נמצאה (ייתכן שהשרת הופעל מחדש)');
+        return true;
+    }
+    return false;
+}
+
+// Check video generation status - the server pushes updates (SSE), polling is the fallback
+function checkVideoStatus(videoId) {
+    const state = { previewShown: false };
+    
+    if (!window.EventSource) {
+        pollVideoStatus(videoId, state);
+        return;
+    }
+    
+    // EventSource reconnects by itself after network errors or server-side stream rotation;
+    // if it keeps failing without delivering anything, fall back to polling
+    const source = new EventSource(`/api/video/events?ids=${encodeURIComponent(videoId)}`);
+    let errors = 0;
+    source.addEventListener('status', (event) => {
+        errors = 0;
+        if (handleVideoStatus(JSON.parse(event.data), state)) {
+            source.close();
+        }
+    });
+    source.addEventListener('end', () => source.close());
+    source.addEventListener('error', () => {
+        errors++;
+        if (errors >= SSE_MAX_ERRORS) {
+            source.close();
+            pollVideoStatus(videoId, state);
+        }
+    });
+}
+
+// Poll video generation status (browsers without EventSource, or when the event stream keeps failing)
+function pollVideoStatus(videoId, state) {
+    const maxAttempts = 100; // 5 minutes max
     let attempts = 0;
     
     const checkInterval = setInterval(async () => {
@@ -181,12 +253,8 @@ async function checkVideoStatus(videoId) {
             const response = await fetch(`/api/video/status/${videoId}`);
             const status = await response.json();
             
-            if (status.status === 'completed') {
-                clearInterval(checkInterval);
-                alert(`הסרטון נוצר בהצלחה!\n${status.filename}`);
-            } else if (status.status === 'failed') {
+            if (handleVideoStatus(status, state)) {
                 clearInterval(checkInterval);
-                alert('יצירת הסרטון נכשלה: ' + status.message);
             } else if (attempts >= maxAttempts) {
                 clearInterval(checkInterval);
                 alert('זמן יצירת הסרטון פג. נסה שוב מאוחר יותר.');
@@ -194,7 +262,7 @@ async function checkVideoStatus(videoId) {
         } catch (error) {
             console.error('Error checking video status:', error);
         }
-    }, 5000); // Check every 5 seconds
+    }, 3000); // Check every 3 seconds
 }
 
 // Allow Enter key to trigger search
@@ -0,0 +1,353 @@
+"""
+מרכיב תבנית ישיר: ערבוב שכבות ב-numpy וכתיבת פריימים גולמיים ל-ffmpeg
+Template compositor - numpy blending piped straight into an ffmpeg encoder
+"""
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from moviepy.config import get_setting
+
+import metrics
+import tracing
+
+
+RENDER_PHASE_SECONDS = metrics.histogram('render_phase_seconds', 'Time spent in each render phase (download / composite / encode / batch)',
+                                         ['phase'])
+ENCODER_FPS = metrics.histogram('render_encoder_fps', 'Frames encoded per second, per render', ['encoder'],
+                                buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240, 360))
+ENCODED_FRAMES = metrics.counter('render_encoded_frames', 'Frames written to encoders', ['encoder'])
+
+
+class RenderCancelled(Exception):
+    """הרינדור בוטל (בקשת ביטול מהמשתמש)"""
+
+
+class RenderMonitor:
+    """דיווח התקדמות ובדיקת ביטול לרינדור אחד.
+    מועבר במפורש בשרשרת הקריאות כי VideoGenerator אחד משותף לכמה threads.
+    כל שלב נרשם גם כ-span תחת ה-span שהיה פעיל כשה-monitor נוצר (העבודה או פריט האצווה)"""
+    
+    def __init__(self, on_progress: Optional[Callable[[str, float, float], None]] = None,
+                 cancel_event: Optional[threading.Event] = None):
+        self.on_progress = on_progress
+        self.cancel_event = cancel_event
+        self._phase = None
+        self._phase_started = 0.0
+        self._trace = tracing.current_span()
+        self._phase_span = None
+    
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def check(self):
+        """RenderCancelled אם התבקש ביטול"""
+        if self.cancelled:
+            raise RenderCancelled()
+    
+    def report(self, phase: str, done: float = 0, total: float = 0):
+        """שלב נוכחי (download / composite / encode) וכמה ממנו הושלם.
+        שלב נגמר כשמתחיל שלב אחר או כשהושלם כולו - ואז הזמן שלו נרשם ב-/metrics"""
+        if phase != self._phase:
+            self._end_phase()
+            self._phase, self._phase_started = phase, time.perf_counter()
+            if self._trace is not None:
+                self._phase_span = self._trace.child(phase)
+        if total and done >= total:
+            self._end_phase()
+        if self.on_progress is not None:
+            self.on_progress(phase, done, total)
+    
+    def _end_phase(self):
+        if self._phase is not None:
+            RENDER_PHASE_SECONDS.observe(time.perf_counter() - self._phase_started, phase=self._phase)
+            self._phase = None
+            if self._phase_span is not None:
+                self._phase_span.end()
+                self._phase_span = None
+
+
+class OverlayLayer:
+    """שכבת-על מתוזמנת בתבנית (תמונת RGBA, מיקום, זמן, fade)"""
+    
+    def __init__(self, image: np.ndarray, start: float, duration: float, y: int,
+                 fade_in: float = 0.0, fade_out: float = 0.0):
+        self.image = image
+        self.start = start
+        self.duration = duration
+        self.y = y  # x תמיד ממורכז
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+    
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+    
+    def scaled(self, scale: float) -> 'OverlayLayer':
+        """עותק של השכבה בקנה מידה אחר (לפרופילי רזולוציה נמוכה)"""
+        h, w = self.image.shape[:2]
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        image = cv2.resize(self.image, size, interpolation=cv2.INTER_AREA)
+        return OverlayLayer(image, self.start, self.duration, int(round(self.y * scale)),
+                            self.fade_in, self.fade_out)
+    
+    def fade_factor(self, t: float) -> float:
+        """מקדם ה-fade בזמן t (0 כשהשכבה לא מוצגת), כמו fadein/fadeout של moviepy"""
+        if not (self.start <= t < self.end):
+            return 0.0
+        local_t = t - self.start
+        factor = 1.0
+        if self.fade_in and local_t < self.fade_in:
+            factor *= local_t / self.fade_in
+        remaining = self.duration - local_t
+        if self.fade_out and remaining < self.fade_out:
+            factor *= remaining / self.fade_out
+        return max(factor, 0.0)
+
+
+class BackgroundSegment:
+    """קטע רקע במסך מלא: קליפ moviepy, ואופציונלית פונקציה שכותבת פריים ישירות למאגר"""
+    
+    def __init__(self, clip, start: float = 0.0,
+                 render_into: Optional[Callable[[float, np.ndarray], None]] = None):
+        self.clip = clip
+        self.start = start
+        self.duration = clip.duration
+        self._render_into = render_into
+    
+    @classmethod
+    def from_zoom(cls, zoom, start: float = 0.0) -> 'BackgroundSegment':
+        """קטע רקע ממנוע זום - הפריים נכתב ישירות למאגר בלי העתקה נוספת"""
+        clip = zoom.make_clip().set_position('center')
+        return cls(clip, start, lambda t, dst: zoom.render_frame(zoom.frame_index(t), dst))
+    
+    def is_playing(self, t: float) -> bool:
+        return self.start <= t < self.start + self.duration
+    
+    def render(self, t: float, dst: np.ndarray):
+        """כתיבת הפריים של זמן t (יחסי לתחילת הקטע) לתוך dst"""
+        if self._render_into is not None:
+            self._render_into(t, dst)
+            return
+        
+        frame = self.clip.get_frame(t)
+        if frame.shape == dst.shape:
+            np.copyto(dst, frame)
+            return
+        
+        # קליפ בגודל אחר (למשל סרטון צר) - ממורכז על רקע שחור
+        dst.fill(0)
+        dst_h, dst_w = dst.shape[:2]
+        src_h, src_w = frame.shape[:2]
+        x, y = (dst_w - src_w) // 2, (dst_h - src_h) // 2
+        sx, sy = max(-x, 0), max(-y, 0)
+        x, y = max(x, 0), max(y, 0)
+        w, h = min(src_w - sx, dst_w - x), min(src_h - sy, dst_h - y)
+        dst[y:y + h, x:x + w] = frame[sy:sy + h, sx:sx + w, :3]
+
+
+class _PreparedLayer:
+    """שכבה מוכנה לערבוב: חתוכה לתיבת האלפא, עם אלפא וצבע מוכפל מחושבים מראש"""
+    
+    def __init__(self, layer: OverlayLayer, frame_size: Tuple[int, int], times: List[float]):
+        frame_w, frame_h = frame_size
+        image = layer.image
+        h, w = image.shape[:2]
+        x = (frame_w - w) // 2
+        y = layer.y
+        
+        # חיתוך לאזור שבו האלפא לא אפס - רוב שכבת הטקסט שקופה
+        alpha = image[:, :, 3] if image.shape[2] == 4 else np.full((h, w), 255, np.uint8)
+        rows = np.flatnonzero(alpha.any(axis=1))
+        cols = np.flatnonzero(alpha.any(axis=0))
+        if rows.size == 0:
+            self.empty = True
+            return
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = cols[0], cols[-1] + 1
+        
+        # חיתוך לגבולות הפריים
+        fx0, fy0 = max(x + left, 0), max(y + top, 0)
+        fx1, fy1 = min(x + right, frame_w), min(y + bottom, frame_h)
+        self.empty = fx0 >= fx1 or fy0 >= fy1
+        if self.empty:
+            return
+        
+        crop = image[fy0 - y:fy1 - y, fx0 - x:fx1 - x]
+        crop_alpha = alpha[fy0 - y:fy1 - y, fx0 - x:fx1 - x]
+        self.region = (slice(fy0, fy1), slice(fx0, fx1))
+        self.alpha = crop_alpha[:, :, None].astype(np.float32) / 255.0
+        self.premultiplied = crop[:, :, :3].astype(np.float32) * self.alpha
+        self.factors = np.array([layer.fade_factor(t) for t in times], dtype=np.float32)
+        self.visible = np.array([layer.start <= t < layer.end for t in times])
+        self._scratch = np.empty(self.premultiplied.shape, dtype=np.float32)
+        self._blend = np.empty(self.premultiplied.shape, dtype=np.float32)
+    
+    def blend(self, frame: np.ndarray, index: int):
+        """ערבוב השכבה לתוך הפריים במקום: out = bg * (1 - a) + fade * rgb * a"""
+        if self.empty or not self.visible[index]:
+            return
+        region = frame[self.region]
+        scratch, blend = self._scratch, self._blend
+        np.copyto(blend, region)
+        np.multiply(blend, self.alpha, out=scratch)
+        blend -= scratch
+        np.multiply(self.premultiplied, self.factors[index], out=scratch)
+        blend += scratch
+        np.add(blend, 0.5, out=blend)
+        np.copyto(region, blend, casting='unsafe')
+
+
+class TemplateCompositor:
+    """מרכיב לתבנית הקבועה (רקע/זום + שכבות טקסט מתוזמנות) שמקודד דרך pipe ל-ffmpeg"""
+    
+    def __init__(self, size: Tuple[int, int], duration: float, fps: int,
+                 backgrounds: List[BackgroundSegment], layers: List[OverlayLayer],
+                 audio_source: Optional[str] = None):
+        """audio_source: קובץ שפס הקול שלו (אם יש) נכנס לפלט - סרטון המוצר"""
+        self.size = (int(size[0]), int(size[1]))
+        self.duration = duration
+        self.fps = fps
+        self.backgrounds = backgrounds
+        self.audio_source = audio_source
+        self.n_frames = int(round(duration * fps))
+        self.times = [i / fps for i in range(self.n_frames)]
+        
+        # חישוב מראש של מסכות האלפא ועקומות ה-fade לכל הפריימים
+        self.layers = [_PreparedLayer(layer, self.size, self.times) for layer in layers]
+        self._frame = np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+    
+    def render_frame(self, index: int) -> np.ndarray:
+        """הרכבת פריים לתוך המאגר המשותף (נדרס בפריים הבא)"""
+        t = self.times[index]
+        frame = self._frame
+        
+        # רקע: הקטע האחרון שמתנגן מכסה את כל הפריים
+        for segment in reversed(self.backgrounds):
+            if segment.is_playing(t):
+                segment.render(t - segment.start, frame)
+                break
+        else:
+            frame.fill(0)
+        
+        for layer in self.layers:
+            layer.blend(frame, index)
+        return frame
+    
+    def write_videofile(self, output_path: str, codec: str = 'libx264', preset: str = 'medium',
+                        threads: int = 4, crf: Optional[int] = None,
+                        monitor: Optional[RenderMonitor] = None) -> str:
+        """רינדור כל הפריימים וכתיבתם כ-rawvideo ל-stdin של ffmpeg"""
+        return write_videofiles([(self, output_path)], codec=codec, preset=preset,
+                                threads=threads, crf=crf, monitor=monitor)[0]
+
+
+class FFmpegPipeEncoder:
+    """תהליך ffmpeg שמקבל פריימי rgb24 גולמיים ב-stdin ומקודד לקובץ.
+    audio_source: קלט שני שפס הקול שלו (אם יש) מקודד ל-aac ומלופף עד duration (אורך הווידאו)"""
+    
+    def __init__(self, output_path: str, size: Tuple[int, int], fps: int, codec: str = 'libx264',
+                 preset: str = 'medium', threads: int = 4, crf: Optional[int] = None,
+                 audio_source: Optional[str] = None, duration: Optional[float] = None):
+        self.output_path = output_path
+        width, height = size
+        cmd = [
+            get_setting('FFMPEG_BINARY'), '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', f'{width}x{height}', '-pix_fmt', 'rgb24', '-r', str(fps),
+            '-i', '-',
+        ]
+        if audio_source:
+            # מקור בלי פס קול (1:a?) נותן פלט שקט; -shortest לבדו משאיר עודף של פריימי aac - לכן גם -t
+            cmd += ['-stream_loop', '-1', '-i', audio_source,
+                    '-map', '0:v', '-map', '1:a?', '-c:a', 'aac', '-shortest']
+            if duration:
+                cmd += ['-t', f'{duration:.3f}']
+        else:
+            cmd += ['-an']
+        cmd += ['-vcodec', codec, '-preset', preset, '-threads', str(threads)]
+        if crf is not None:
+            cmd += ['-crf', str(crf)]
+        cmd += ['-pix_fmt', 'yuv420p', '-movflags', '+faststart', output_path]
+        
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.PIPE)
+        self._broken = False
+    
+    def write(self, frame: np.ndarray):
+        if self._broken:
+            return
+        try:
+            self.proc.stdin.write(memoryview(frame))
+        except BrokenPipeError:
+            self._broken = True  # ffmpeg יצא מוקדם - השגיאה שלו מדווחת ב-close
+    
+    def close(self) -> str:
+        """סיום הקידוד; RuntimeError אם ffmpeg נכשל"""
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr = self.proc.stderr.read()
+        self.proc.stderr.close()
+        if self.proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+        return self.output_path
+    
+    def abort(self):
+        """עצירת התהליך ומחיקת קובץ חלקי"""
+        # סגירת ה-pipe - אחרת כל רינדור שבוטל או נכשל משאיר file descriptor פתוח ב-worker
+        if not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        self.proc.kill()
+        self.proc.wait()
+        if not self.proc.stderr.closed:
+            self.proc.stderr.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+
+def write_videofiles(outputs: List[Tuple[TemplateCompositor, str]], codec: str = 'libx264',
+                     preset: str = 'medium', threads: int = 4, crf: Optional[int] = None,
+                     monitor: Optional[RenderMonitor] = None) -> List[str]:
+    """רינדור כמה פלטים במעבר אחד על ציר הזמן, מקודד נפרד לכל פלט.
+    הפריים של כל פלט נכתב מיד לאחר ההרכבה, כך שמקורות משותפים נקראים בסדר
+    הזמן פעם אחת לכל נקודת זמן. אם פלט אחד נכשל או שהרינדור בוטל - כל הקבצים החלקיים נמחקים"""
+    monitor = monitor or RenderMonitor()
+    encoders = []
+    started = time.perf_counter()
+    try:
+        for compositor, output_path in outputs:
+            encoders.append(FFmpegPipeEncoder(output_path, compositor.size, compositor.fps, codec=codec,
+                                              preset=preset, threads=threads, crf=crf,
+                                              audio_source=compositor.audio_source,
+                                              duration=compositor.n_frames / compositor.fps))
+        
+        n_frames = max(compositor.n_frames for compositor, _ in outputs)
+        for index in range(n_frames):
+            monitor.check()
+            for (compositor, _), encoder in zip(outputs, encoders):
+                if index < compositor.n_frames:
+                    encoder.write(compositor.render_frame(index))
+            monitor.report('encode', index + 1, n_frames)
+        
+        closed = []
+        for encoder in encoders:
+            closed.append(encoder.close())
+        frames = sum(compositor.n_frames for compositor, _ in outputs)
+        ENCODER_FPS.observe(frames / max(time.perf_counter() - started, 1e-6), encoder='template')
+        ENCODED_FRAMES.inc(frames, encoder='template')
+        return closed
+    except BaseException:
+        for encoder in encoders:
+            encoder.abort()
+        raise
@@ -0,0 +1,51 @@
+"""
+בדיקות למדדים ולאחוזונים
+Tests for metrics (nearest-rank percentiles and Prometheus text exposition)
+"""
+# -*- coding: utf-8 -*-
+import pytest
+
+from metrics import MetricsRegistry, percentile
+
+
+@pytest.mark.parametrize('values, expected', [
+    ([5.0], {50: 5.0, 95: 5.0, 99: 5.0}),
+    ([1.0, 2.0], {50: 1.0, 95: 2.0, 99: 2.0}),
+    ([3.0, 1.0, 2.0, 4.0], {50: 2.0, 95: 4.0, 99: 4.0}),
+    (list(range(1, 11)), {50: 5, 95: 10, 99: 10}),
+    (list(range(1, 21)), {50: 10, 95: 19, 99: 20}),
+    (list(range(1, 101)), {50: 50, 95: 95, 99: 99}),
+])
+def test_percentile_nearest_rank(values, expected):
+    for percent, value in expected.items():
+        assert percentile(values, percent) == value
+
+
+def test_percentile_edges():
+    assert percentile([], 95) is None
+    assert percentile([7.0, 3.0], 0) == 3.0
+    assert percentile([7.0, 3.0], 100) == 7.0
+
+
+def test_render_histogram_and_counter_lines():
+    registry = MetricsRegistry()
+    renders = registry.histogram('render_seconds', 'Render time', ['profile'], buckets=(1, 2.5))
+    errors = registry.counter('render_errors', 'Failed renders', ['stage'])
+    for value in (0.5, 1.0, 2.0, 4.0):
+        renders.observe(value, profile='final')
+    errors.inc(stage='encode')
+    errors.inc(2, stage='encode')
+    
+    lines = registry.render().splitlines()
+    assert lines == [
+        '# HELP render_errors_total Failed renders',
+        '# TYPE render_errors_total counter',
+        'render_errors_total{stage="encode"} 3',
+        '# HELP render_seconds Render time',
+        '# TYPE render_seconds histogram',
+        'render_seconds_bucket{profile="final",le="1"} 2',
+        'render_seconds_bucket{profile="final",le="2.5"} 3',
+        'render_seconds_bucket{profile="final",le="+Inf"} 4',
+        'render_seconds_sum{profile="final"} 7.5',
+        'render_seconds_count{profile="final"} 4',
+    ]
@@ -0,0 +1,86 @@
+"""
+בדיקות ל-checkpoint של ריצות ארוכות
+Tests for run_checkpoint (resume, fingerprints, atomic writes)
+"""
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import pytest
+
+from run_checkpoint import RunCheckpoint, product_id, write_json_atomic
+
+
+def _product(asin, price='$10'):
+    return {'asin': asin, 'title': f'Product {asin}', 'price': price, 'image_urls': [f'https://img/{asin}.jpg']}
+
+
+def _video(tmp_path, name):
+    path = tmp_path / name
+    path.write_bytes(b'video')
+    return str(path)
+
+
+def test_completed_item_is_skipped_on_resume(tmp_path):
+    manifest = str(tmp_path / 'run.json')
+    product = _product('B000000001')
+    checkpoint = RunCheckpoint(manifest, 'final', ['vertical'])
+    videos = {'vertical': _video(tmp_path, 'a.mp4')}
+    checkpoint.mark(product, 'processing')
+    checkpoint.mark(product, 'completed', videos=videos)
+    
+    resumed = RunCheckpoint(manifest, 'final', ['vertical'], resume=True)
+    assert resumed.completed_videos(product) == videos
+    assert resumed.counts() == {'completed': 1}
+
+
+def test_missing_output_file_is_rendered_again(tmp_path):
+    manifest = str(tmp_path / 'run.json')
+    product = _product('B000000001')
+    checkpoint = RunCheckpoint(manifest, 'final', ['vertical'])
+    video = _video(tmp_path, 'a.mp4')
+    checkpoint.mark(product, 'completed', videos={'vertical': video})
+    os.remove(video)
+    
+    assert RunCheckpoint(manifest, 'final', ['vertical'], resume=True).completed_videos(product) is None
+
+
+def test_changed_fingerprint_is_rendered_again(tmp_path):
+    manifest = str(tmp_path / 'run.json')
+    product = _product('B000000001')
+    checkpoint = RunCheckpoint(manifest, 'final', ['vertical'])
+    checkpoint.mark(product, 'completed', videos={'vertical': _video(tmp_path, 'a.mp4')})
+    
+    # מחיר חדש, פרופיל אחר או פורמטים אחרים - הסרטון הישן כבר לא מתאים
+    resumed = RunCheckpoint(manifest, 'final', ['vertical'], resume=True)
+    assert resumed.completed_videos(_product('B000000001', price='$8')) is None
+    assert RunCheckpoint(manifest, 'draft', ['vertical'], resume=True).completed_videos(product) is None
+    assert RunCheckpoint(manifest, 'final', ['vertical', 'square'], resume=True).completed_videos(product) is None
+
+
+def test_unfinished_items_missing_from_new_search_are_requeued(tmp_path):
+    manifest = str(tmp_path / 'run.json')
+    checkpoint = RunCheckpoint(manifest, 'final', ['vertical'])
+    done, failed, interrupted, pending, still_listed = (_product(f'B00000000{i}') for i in range(1, 6))
+    checkpoint.mark(done, 'completed', videos={'vertical': _video(tmp_path, 'a.mp4')})
+    checkpoint.mark(failed, 'failed', error='boom')
+    checkpoint.mark(interrupted, 'processing')
+    checkpoint.mark(pending, 'pending')
+    checkpoint.mark(still_listed, 'failed', error='boom')
+    
+    resumed = RunCheckpoint(manifest, 'final', ['vertical'], resume=True)
+    requeued = resumed.unfinished_products([still_listed])
+    assert sorted(product_id(p) for p in requeued) == [product_id(p) for p in (failed, interrupted, pending)]
+    assert requeued[0]['title'] == failed['title']
+
+
+def test_atomic_write_leaves_no_partial_file(tmp_path):
+    path = str(tmp_path / 'run.json')
+    write_json_atomic(path, {'items': {'a': 1}})
+    
+    # כתיבה שנכשלת באמצע ה-dump - הקובץ הקודם נשאר שלם ואין קובץ זמני
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {'items': {'a': 2, 'b': object()}})
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'items': {'a': 1}}
+    assert os.listdir(tmp_path) == ['run.json']
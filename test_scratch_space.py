@@ -0,0 +1,93 @@
+"""
+בדיקות למכסות הדיסק של ה-janitor
+Tests for DiskJanitor quotas (age, size, sidecars, manifests, in-progress jobs)
+"""
+# -*- coding: utf-8 -*-
+import os
+import time
+
+from scratch_space import DiskJanitor, ScratchSpace
+
+
+def _file(directory, name, size=500, age=0):
+    path = os.path.join(str(directory), name)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _janitor(tmp_path, quota, min_age=60, on_remove=None):
+    scratch = ScratchSpace(str(tmp_path / 'temp'))
+    output = tmp_path / 'out'
+    output.mkdir()
+    janitor = DiskJanitor(scratch, output_dir=str(output), min_age=min_age, on_remove=on_remove)
+    janitor.quotas = {str(output): quota}
+    return janitor, output
+
+
+def test_age_quota_removes_only_old_files(tmp_path):
+    janitor, output = _janitor(tmp_path, (0, 3600))
+    _file(output, 'old.mp4', age=7200)
+    _file(output, 'new.mp4', age=120)
+    
+    report = janitor.run_once()
+    assert sorted(os.listdir(output)) == ['new.mp4']
+    assert report[str(output)] == {'reclaimed_bytes': 500, 'removed': 1}
+
+
+def test_size_quota_evicts_oldest_video_with_its_sidecars(tmp_path):
+    removed = []
+    janitor, output = _janitor(tmp_path, (2000, 0), on_remove=removed.append)
+    for name in ('oldest.mp4', 'oldest.jpg', 'oldest.webp'):
+        _file(output, name, age=3000)
+    _file(output, 'middle.mp4', age=2000)
+    _file(output, 'middle.jpg', age=2000)
+    _file(output, 'newest.mp4', age=1000)
+    
+    # 3000 בתים מול מכסה של 2000: מספיק לפנות את הקבוצה הישנה ביותר (1500 בתים) כיחידה אחת
+    report = janitor.run_once()
+    assert sorted(os.listdir(output)) == ['middle.jpg', 'middle.mp4', 'newest.mp4']
+    assert sorted(os.path.basename(path) for path in removed) == ['oldest.jpg', 'oldest.mp4', 'oldest.webp']
+    assert report[str(output)] == {'reclaimed_bytes': 1500, 'removed': 3}
+
+
+def test_run_and_batch_manifests_are_kept(tmp_path):
+    janitor, output = _janitor(tmp_path, (100, 3600))
+    _file(output, 'run_deals_abc123.json', age=99999)
+    _file(output, 'batch_20260101.json', age=99999)
+    _file(output, 'video.mp4', age=99999)
+    
+    janitor.run_once()
+    assert sorted(os.listdir(output)) == ['batch_20260101.json', 'run_deals_abc123.json']
+    assert janitor.usage()['directories'][str(output)]['entries'] == 0
+
+
+def test_min_age_and_active_jobs_are_protected(tmp_path):
+    janitor, output = _janitor(tmp_path, (1, 1), min_age=600)
+    janitor.quotas[janitor.scratch.root] = (1, 1)
+    
+    # תיקיית עבודה שעדיין רצה - לא נמחקת גם כשהיא ישנה וחורגת מהמכסות
+    active = janitor.scratch.create('active')
+    _file(active, 'frame.png', age=7200)
+    os.utime(active, (time.time() - 7200, time.time() - 7200))
+    # תיקייה שהתעדכנה לאחרונה (נכתבת כרגע) - מוגנת ע"י JANITOR_MIN_AGE
+    recent = os.path.join(janitor.scratch.root, 'job_recent_x')
+    os.mkdir(recent)
+    _file(recent, 'frame.png')
+    _file(output, 'rendering.mp4', age=30)
+    # ישנה ולא פעילה - נמחקת
+    stale = os.path.join(janitor.scratch.root, 'job_stale_y')
+    os.mkdir(stale)
+    _file(stale, 'frame.png')
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+    
+    janitor.run_once()
+    assert os.path.isdir(active)
+    assert os.path.isdir(recent)
+    assert not os.path.exists(stale)
+    assert os.listdir(output) == ['rendering.mp4']
+    
+    janitor.scratch.release(active)
+    assert not os.path.exists(active)
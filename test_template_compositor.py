@@ -0,0 +1,65 @@
+"""
+בדיקות לערבוב שכבות הטקסט בתבנית
+Tests for _PreparedLayer blending against moviepy's fade-to-black compositing
+"""
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from moviepy.editor import ColorClip, CompositeVideoClip, ImageClip
+from moviepy.video.fx.all import fadein
+
+from template_compositor import OverlayLayer, _PreparedLayer
+
+
+FRAME_SIZE = (64, 48)
+# fade-in של שנייה: בזמנים האלה מקדם ה-fade הוא 0, 0.5 ו-1
+TIMES = [0.0, 0.5, 1.5]
+
+
+def _layer_image():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (20, 40, 4), dtype=np.uint8)
+    image[:, :, 3] = np.linspace(0, 255, 40, dtype=np.uint8)[None, :]  # אלפא מדורג, כולל שקוף ואטום
+    image[:4, :, 3] = 0  # שורות שקופות - נחתכות מתיבת האלפא
+    return image
+
+
+def _moviepy_frames(image, background, y):
+    """ההרכבה הישנה: ImageClip עם מסכה, fadein (שמחשיך את הצבע בלבד) ו-CompositeVideoClip"""
+    x = (FRAME_SIZE[0] - image.shape[1]) // 2
+    mask = ImageClip(image[:, :, 3] / 255.0, ismask=True)
+    clip = ImageClip(image[:, :, :3]).set_mask(mask).set_duration(2).set_position((x, y))
+    clip = fadein(clip, 1.0)
+    background_clip = ColorClip(FRAME_SIZE, color=background).set_duration(2)
+    composite = CompositeVideoClip([background_clip, clip], size=FRAME_SIZE)
+    return clip, [composite.get_frame(t) for t in TIMES]
+
+
+@pytest.mark.parametrize('y', [10, -6, 40])
+def test_blend_matches_moviepy_fade_to_black(y):
+    image = _layer_image()
+    background = (30, 120, 200)
+    clip, expected = _moviepy_frames(image, background, y)
+    prepared = _PreparedLayer(OverlayLayer(image, 0, 2, y, fade_in=1.0), FRAME_SIZE, TIMES)
+    
+    assert list(prepared.factors) == [0.0, 0.5, 1.0]
+    for index, t in enumerate(TIMES):
+        frame = np.empty((FRAME_SIZE[1], FRAME_SIZE[0], 3), np.uint8)
+        frame[:] = background
+        prepared.blend(frame, index)
+        # moviepy חותך לשלם ואנחנו מעגלים - הפרש של רמה אחת לכל היותר
+        assert np.abs(frame.astype(int) - expected[index].astype(int)).max() <= 1
+        # ה-fade לא נוגע במסכה: השכבה מחשיכה את הרקע גם כשהיא שחורה לגמרי
+        assert np.array_equal(clip.mask.get_frame(t), image[:, :, 3] / 255.0)
+
+
+def test_hidden_layer_leaves_frame_untouched():
+    image = _layer_image()
+    prepared = _PreparedLayer(OverlayLayer(image, 1.0, 0.5, 10), FRAME_SIZE, [0.0, 1.2, 1.5])
+    frame = np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), 77, np.uint8)
+    
+    prepared.blend(frame, 0)
+    prepared.blend(frame, 2)
+    assert (frame == 77).all()
+    prepared.blend(frame, 1)
+    assert not (frame == 77).all()
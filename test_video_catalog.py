@@ -0,0 +1,109 @@
+"""
+בדיקות לאינדקס הסרטונים
+Tests for VideoCatalog (paging, filters, pruning, cross-process reload, rebuild)
+"""
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+from render_profiles import get_profile
+from video_catalog import VideoCatalog
+
+
+def _catalog(tmp_path, videos):
+    """קטלוג מקובץ JSON מוכן; videos: (filename, asin, profile, format) מהישן לחדש"""
+    videos_dir = tmp_path / 'videos'
+    videos_dir.mkdir()
+    entries = []
+    for i, (filename, asin, profile, output_format) in enumerate(videos):
+        (videos_dir / filename).write_bytes(b'video')
+        entries.append({'filename': filename, 'asin': asin, 'profile': profile, 'format': output_format,
+                        'title': f'Video {i}', 'created_at': f'2026-01-01T00:00:{i:02d}'})
+    storage = tmp_path / 'videos.json'
+    storage.write_text(json.dumps({'videos': entries}), encoding='utf-8')
+    return VideoCatalog(str(storage), str(videos_dir))
+
+
+def _names(page):
+    return [entry['filename'] for entry in page]
+
+
+def test_query_pages_newest_first(tmp_path):
+    catalog = _catalog(tmp_path, [(f'v{i}.mp4', None, 'final', 'vertical') for i in range(5)])
+    
+    page, total = catalog.query(offset=0, limit=2)
+    assert (_names(page), total) == (['v4.mp4', 'v3.mp4'], 5)
+    page, total = catalog.query(offset=2, limit=2)
+    assert (_names(page), total) == (['v2.mp4', 'v1.mp4'], 5)
+    page, total = catalog.query(offset=4, limit=2)
+    assert (_names(page), total) == (['v0.mp4'], 5)
+    assert catalog.query(offset=10, limit=2) == ([], 5)
+
+
+def test_filters_intersect(tmp_path):
+    catalog = _catalog(tmp_path, [
+        ('a_vertical_final.mp4', 'B000000001', 'final', 'vertical'),
+        ('a_square_final.mp4', 'B000000001', 'final', 'square'),
+        ('a_vertical_preview.mp4', 'B000000001', 'preview', 'vertical'),
+        ('b_vertical_final.mp4', 'B000000002', 'final', 'vertical'),
+    ])
+    
+    assert _names(catalog.query(asin='B000000001')[0]) == [
+        'a_vertical_preview.mp4', 'a_square_final.mp4', 'a_vertical_final.mp4']
+    assert _names(catalog.query(profile='final', output_format='vertical')[0]) == [
+        'b_vertical_final.mp4', 'a_vertical_final.mp4']
+    page, total = catalog.query(asin='B000000001', profile='final', output_format='vertical')
+    assert (_names(page), total) == (['a_vertical_final.mp4'], 1)
+    assert catalog.query(asin='B000000002', output_format='square') == ([], 0)
+
+
+def test_missing_files_are_pruned_from_page_and_total(tmp_path):
+    catalog = _catalog(tmp_path, [(f'v{i}.mp4', None, 'final', 'vertical') for i in range(5)])
+    os.remove(os.path.join(catalog.videos_dir, 'v3.mp4'))
+    
+    # הקובץ החסר באמצע העמוד - העמוד מתמלא מהבא בתור, והוא יוצא מהספירה ומהקובץ
+    page, total = catalog.query(offset=0, limit=3)
+    assert (_names(page), total) == (['v4.mp4', 'v2.mp4', 'v1.mp4'], 4)
+    assert catalog.query(offset=3, limit=3)[1] == 4
+    with open(catalog.storage_file, encoding='utf-8') as f:
+        assert 'v3.mp4' not in [entry['filename'] for entry in json.load(f)['videos']]
+
+
+def test_reloads_after_another_process_writes(tmp_path):
+    catalog = _catalog(tmp_path, [('v0.mp4', None, 'final', 'vertical')])
+    
+    # קטלוג נפרד (כמו main.py בתהליך אחר) מוסיף סרטון
+    video = os.path.join(catalog.videos_dir, 'new_square_final.mp4')
+    with open(video, 'wb') as f:
+        f.write(b'video')
+    other = VideoCatalog(catalog.storage_file, catalog.videos_dir)
+    other.add(video, {'asin': 'B000000009', 'title': 'New'}, get_profile('final').for_format('square'))
+    mtime = time.time() + 5
+    os.utime(catalog.storage_file, (mtime, mtime))
+    
+    page, total = catalog.query()
+    assert (_names(page), total) == (['new_square_final.mp4', 'v0.mp4'], 2)
+    assert catalog.get('new_square_final.mp4')['asin'] == 'B000000009'
+    assert _names(catalog.query(output_format='square')[0]) == ['new_square_final.mp4']
+
+
+def test_rebuild_parses_format_and_profile_suffixes(tmp_path):
+    videos_dir = tmp_path / 'videos'
+    videos_dir.mkdir()
+    names = ['Gadget_B000000001_square_preview.mp4', 'Gadget_B000000001_landscape.mp4',
+             'Gadget_B000000002_draft.mp4', 'Old_video.mp4', 'notes.txt']
+    for i, name in enumerate(names):
+        (videos_dir / name).write_bytes(b'video')
+        os.utime(videos_dir / name, (1000 + i, 1000 + i))
+    
+    catalog = VideoCatalog(str(tmp_path / 'videos.json'), str(videos_dir))
+    entries = {entry['filename']: entry for entry in catalog.query()[0]}
+    assert sorted(entries) == sorted(names[:4])
+    assert [(entries[name]['asin'], entries[name]['format'], entries[name]['profile']) for name in names[:4]] == [
+        ('B000000001', 'square', 'preview'),
+        ('B000000001', 'landscape', 'final'),
+        ('B000000002', 'vertical', 'draft'),
+        (None, 'vertical', 'final'),
+    ]
+    assert os.path.exists(catalog.storage_file)
@@ -0,0 +1,26 @@
+"""
+בדיקות למנוע הזום
+Tests for KenBurnsZoom crop rectangles
+"""
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from zoom_engine import KenBurnsZoom
+
+
+@pytest.mark.parametrize('image_size, zoom_start, zoom_end', [
+    ((1600, 2400), 1.0, 0.85),  # תמונה גדולה מהפריים, זום החוצה
+    ((1080, 1920), 0.85, 1.0),  # בגודל הפריים, זום פנימה
+    ((500, 300), 1.0, 0.85),    # קטנה ורחבה - החיתוך נצמד לגבולות
+])
+def test_crop_rect_stays_inside_image(image_size, zoom_start, zoom_end):
+    width, height = image_size
+    zoom = KenBurnsZoom(np.zeros((height, width, 3), np.uint8), (1080, 1920), duration=8, fps=30,
+                        zoom_start=zoom_start, zoom_end=zoom_end)
+    
+    for t in (0, zoom.duration):
+        x0, y0, x1, y1 = zoom.crop_rects[zoom.frame_index(t)]
+        assert 0 <= x0 < x1 <= width
+        assert 0 <= y0 < y1 <= height
+        assert zoom.get_frame(t).shape == (1920, 1080, 3)
@@ -0,0 +1,177 @@
+"""
+מעקב (tracing) קל לכל בקשה: עץ של spans עם מזהה בקשה וזמן לכל שלב, שנכתב כשורת JSON לקובץ מקומי
+Lightweight request tracing - nested spans per request (fetch -> parse -> store -> render), exported to JSONL
+"""
+# -*- coding: utf-8 -*-
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+log = logging.getLogger('goodsells.tracing')  # לא דרך log_config - הוא מוסיף את מזהה הבקשה מכאן
+
+# קובץ הייצוא ('' = בלי ייצוא); נכתב רק trace שנמשך לפחות TRACE_MIN_MS
+TRACE_FILE = os.getenv('TRACE_FILE', 'traces.jsonl')
+TRACE_MIN_MS = float(os.getenv('TRACE_MIN_MS', '0'))
+TRACE_MAX_MB = float(os.getenv('TRACE_MAX_MB', '50'))  # מעבר לגודל הזה הקובץ עובר ל-.1
+# כותרת X-Debug-Timing בתשובה: 1 = כשהבקשה שולחת X-Debug-Timing, always = בכל תשובה, 0 = אף פעם
+DEBUG_TIMING = os.getenv('DEBUG_TIMING', '1').lower()
+
+_current: contextvars.ContextVar = contextvars.ContextVar('goodsells_span', default=None)
+_export_lock = threading.Lock()
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """שלב אחד בעץ: שם, תכונות, זמן התחלה ומשך, ו-spans ילדים"""
+    
+    def __init__(self, name: str, trace_id: str, parent: Optional['Span'] = None, **attrs):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent = parent
+        self.attrs = attrs
+        self.children: List['Span'] = []
+        self.error = None
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        if parent is not None:
+            parent.children.append(self)
+    
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+    
+    def child(self, name: str, **attrs) -> 'Span':
+        """span ילד שנסגר ידנית (end) - לשלבים שלא עטופים בבלוק, כמו שלבי הרינדור"""
+        return Span(name, self.trace_id, parent=self, **attrs)
+    
+    def end(self) -> 'Span':
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._started) * 1000
+        return self
+    
+    @property
+    def elapsed_ms(self) -> float:
+        return self.duration_ms if self.duration_ms is not None else (time.perf_counter() - self._started) * 1000
+    
+    def to_dict(self) -> Dict:
+        entry = {
+            'name': self.name,
+            'start': round(self.start, 6),
+            'duration_ms': round(self.elapsed_ms, 3),
+        }
+        if self.attrs:
+            entry['attrs'] = self.attrs
+        if self.error:
+            entry['error'] = self.error
+        if self.children:
+            entry['spans'] = [child.to_dict() for child in self.children]
+        return entry
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Optional[Span]]:
+    """span ילד של ה-span הנוכחי; מחוץ ל-trace (סקריפטים, CLI) לא עושה כלום"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attrs)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.end()
+        _current.reset(token)
+
+
+def start_trace(name: str, trace_id: Optional[str] = None, **attrs):
+    """פתיחת trace (span שורש) בהקשר הנוכחי; מחזיר (span, token) ל-finish_trace"""
+    root = Span(name, trace_id or new_trace_id(), **attrs)
+    return root, _current.set(root)
+
+
+def finish_trace(root: Span, token=None) -> Span:
+    """סגירת ה-trace, החזרת ההקשר הקודם וייצוא לקובץ"""
+    root.end()
+    if token is not None:
+        _current.reset(token)
+    export(root)
+    return root
+
+
+@contextmanager
+def trace(name: str, trace_id: Optional[str] = None, **attrs) -> Iterator[Span]:
+    """trace שלם סביב בלוק - לעבודות רקע (רינדור) שממשיכות בקשה לפי ה-trace_id שלה"""
+    root, token = start_trace(name, trace_id, **attrs)
+    try:
+        yield root
+    except BaseException as e:
+        root.error = type(e).__name__
+        raise
+    finally:
+        finish_trace(root, token)
+
+
+def export(root: Span, path: Optional[str] = None):
+    """שורת JSON אחת לכל trace (קצר מ-TRACE_MIN_MS לא נכתב)"""
+    path = TRACE_FILE if path is None else path
+    if not path or root.elapsed_ms < TRACE_MIN_MS:
+        return
+    entry = {'trace_id': root.trace_id, 'pid': os.getpid(), **root.to_dict()}
+    line = json.dumps(entry, ensure_ascii=False, default=str) + '\n'
+    try:
+        with _export_lock:
+            if TRACE_MAX_MB and os.path.exists(path) and os.path.getsize(path) > TRACE_MAX_MB * 1024 * 1024:
+                os.replace(path, path + '.1')
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+    except OSError as e:
+        log.warning("Could not export trace %s: %s", root.trace_id, e)
+
+
+def timing_summary(root: Span, max_length: int = 4000) -> str:
+    """תקציר של העץ לכותרת X-Debug-Timing, למשל:
+    total=9012.4ms; fetch_product=8800.1ms(resolve=1200.3ms, download=6900.0ms, parse=410.2ms); save_products=12.0ms
+    spans אחים עם אותו שם מאוחדים (title=3.1ms*4)"""
+    def merged(spans: List[Span]) -> List[str]:
+        groups: Dict[str, List[Span]] = {}
+        for child in spans:
+            groups.setdefault(child.name, []).append(child)
+        parts = []
+        for name, group in groups.items():
+            part = f'{name}={sum(child.elapsed_ms for child in group):.1f}ms'
+            if len(group) > 1:
+                part += f'*{len(group)}'
+            inner = ', '.join(merged([grandchild for child in group for grandchild in child.children]))
+            if inner:
+                part += f'({inner})'
+            parts.append(part)
+        return parts
+    
+    summary = f'total={root.elapsed_ms:.1f}ms'
+    if root.children:
+        summary += '; ' + '; '.join(merged(root.children))
+    if len(summary) > max_length:
+        summary = summary[:max_length - 3] + '...'
+    return summary
@@ -0,0 +1,164 @@
+"""
+יצירת סרטונים באצווה - הרבה מוצרים בעבודה אחת עם מניפסט
+Batch video generation - many products in one grouped job, with a JSON manifest
+"""
+# -*- coding: utf-8 -*-
+import os
+import copy
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from render_profiles import get_profile, parse_formats
+from template_compositor import RenderMonitor
+from run_checkpoint import write_json_atomic
+from log_config import get_logger
+import tracing
+
+
+log = get_logger('batch')
+
+
+def new_batch_id() -> str:
+    return f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def select_products(product_manager, asins: Optional[List[str]] = None,
+                    query: Optional[str] = None) -> List[Dict]:
+    """בחירת פריטים מהקטלוג השמור: לפי רשימת ASIN, לפי חיפוש, או כל הקטלוג.
+    ASIN שלא שמור בקטלוג נשאר כפריט בלי מוצר - הוא יימשך מהחנות בזמן הריצה"""
+    if asins:
+        return [{'asin': asin, 'product': product_manager.get_product_by_asin(asin)} for asin in asins]
+    products = product_manager.search_products(query) if query else product_manager.get_all_products()
+    return [{'asin': product_manager.get_asin(product), 'product': product} for product in products]
+
+
+class VideoBatch:
+    """אצוות סרטונים: הפריטים מרונדרים ברצף עם אותו VideoGenerator, כך שמטמון הגופנים
+    ושכבות הטקסט הקבועות (CTA, urgency, hooks) משותף לכל האצווה. המניפסט נשמר אחרי כל פריט"""
+    
+    def __init__(self, video_generator, items: List[Dict], batch_id: Optional[str] = None,
+                 profile: Optional[str] = None, formats=None,
+                 fetch_product: Optional[Callable[[str], Optional[Dict]]] = None):
+        """
+        items: [{'asin': ..., 'product': {...} או None}]
+        fetch_product: משיכת מוצר לפי ASIN לפריטים שאין להם נתוני מוצר
+        """
+        self.video_generator = video_generator
+        self.fetch_product = fetch_product
+        self.batch_id = batch_id or new_batch_id()
+        self.profile = get_profile(profile).name
+        self.formats = parse_formats(formats)
+        self._products = [item.get('product') for item in items]
+        self.manifest_path = os.path.join(video_generator.output_dir, f'{self.batch_id}.json')
+        self.manifest = {
+            'batch_id': self.batch_id,
+            'status': 'queued',
+            'profile': self.profile,
+            'formats': self.formats,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'total': len(items),
+            'completed': 0,
+            'failed': 0,
+            'items': [
+                {
+                    'asin': item.get('asin'),
+                    'title': (item.get('product') or {}).get('title', ''),
+                    'affiliate_url': (item.get('product') or {}).get('affiliate_url', ''),
+                    'status': 'pending',
+                    'videos': {},
+                    'error': None,
+                    'seconds': None,
+                }
+                for item in items
+            ],
+        }
+    
+    def snapshot(self) -> Dict:
+        return copy.deepcopy(self.manifest)
+    
+    def write_manifest(self) -> str:
+        """שמירת המניפסט"""
+        write_json_atomic(self.manifest_path, self.manifest)
+        return self.manifest_path
+    
+    def run(self, monitor: Optional[RenderMonitor] = None,
+            on_item: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """רינדור כל הפריטים ברצף. monitor מקבל התקדמות מצטברת ('batch', פריטים שהושלמו, סה"כ)
+        ובודק ביטול; on_item נקרא עם עותק המניפסט אחרי כל פריט"""
+        monitor = monitor or RenderMonitor()
+        manifest = self.manifest
+        manifest['status'] = 'processing'
+        total = len(manifest['items'])
+        
+        for index, item in enumerate(manifest['items']):
+            if monitor.cancelled:
+                break
+            
+            item['status'] = 'processing'
+            started = time.time()
+            
+            def on_progress(phase: str, done: float, total_units: float, index=index):
+                fraction = done / total_units if phase == 'encode' and total_units else 0.0
+                monitor.report('batch', index + fraction, total)
+            
+            try:
+                with tracing.span('item', index=index, asin=item['asin']):
+                    product = self._products[index]
+                    if product is None and item['asin'] and self.fetch_product:
+                        product = self.fetch_product(item['asin'])
+                    if not product:
+                        raise ValueError('Product not found')
+                    item['title'] = product.get('title', item['title'])
+                    item['affiliate_url'] = product.get('affiliate_url', item['affiliate_url'])
+                    
+                    log.info("[%s/%s] %s", index + 1, total, item['title'] or item['asin'])
+                    videos = self.video_generator.create_product_videos(
+                        product, formats=self.formats, profile=self.profile,
+                        monitor=RenderMonitor(on_progress=on_progress, cancel_event=monitor.cancel_event)
+                    )
+                if videos:
+                    item['status'] = 'completed'
+                    item['videos'] = {output_format: os.path.basename(path) for output_format, path in videos.items()}
+                    manifest['completed'] += 1
+                elif monitor.cancelled:
+                    item['status'] = 'cancelled'
+                else:
+                    raise RuntimeError('Video generation failed')
+            except Exception as e:
+                item['status'] = 'failed'
+                item['error'] = str(e)
+                manifest['failed'] += 1
+                log.error("Batch item failed: %s", e)
+            
+            item['seconds'] = round(time.time() - started, 1)
+            monitor.report('batch', index + 1, total)
+            self._checkpoint(on_item)
+        
+        # פריטים שלא הגיעו אליהם (ביטול)
+        for item in manifest['items']:
+            if item['status'] in ('pending', 'processing'):
+                item['status'] = 'cancelled'
+        
+        if monitor.cancelled:
+            manifest['status'] = 'cancelled'
+        elif manifest['failed'] and not manifest['completed']:
+            manifest['status'] = 'failed'
+        else:
+            manifest['status'] = 'completed'
+        manifest['finished_at'] = datetime.now().isoformat()
+        self._checkpoint(on_item)
+        
+        log.info("Batch %s: %s completed, %s failed of %s", manifest['status'], manifest['completed'],
+                 manifest['failed'], total, extra={'batch_id': self.batch_id, 'manifest': self.manifest_path})
+        return self.snapshot()
+    
+    def _checkpoint(self, on_item: Optional[Callable[[Dict], None]] = None):
+        try:
+            self.write_manifest()
+        except OSError as e:
+            log.warning("Could not write batch manifest: %s", e)
+        if on_item is not None:
+            on_item(self.snapshot())
@@ -0,0 +1,238 @@
+"""
+Video Catalog - אינדקס של הסרטונים שנוצרו (במקום סריקת output_videos בכל בקשה)
+"""
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from render_profiles import OUTPUT_FORMATS, RENDER_PROFILES, DEFAULT_FORMAT
+from run_checkpoint import product_fingerprint, product_id, write_json_atomic
+from video_previews import preview_files
+from log_config import get_logger
+
+
+log = get_logger('catalog')
+
+CATALOG_FILE = os.getenv('VIDEO_CATALOG', 'videos.json')
+
+# שדות עם אינדקס משני - סינון לפיהם לא סורק את כל הקטלוג
+INDEXED_FIELDS = ('asin', 'profile', 'format')
+
+
+class VideoCatalog:
+    """אינדקס סרטונים: לכל קובץ - מוצר (ASIN), טביעת אצבע, משך, גודל, פרופיל, פורמט וזמן יצירה.
+    נשמר בקובץ JSON ומתעדכן כשרינדור מסתיים; הרשימה מוחזקת בזיכרון לפי סדר יצירה,
+    כך שעמוד של רשימה עולה O(גודל העמוד)"""
+    
+    def __init__(self, storage_file: str = CATALOG_FILE, videos_dir: str = 'output_videos'):
+        self.storage_file = storage_file
+        self.videos_dir = videos_dir
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict] = {}
+        self._order: List[str] = []  # מהישן לחדש
+        self._index: Dict[str, Dict[str, List[str]]] = {field: {} for field in INDEXED_FIELDS}
+        self._loaded_mtime = None
+        
+        if os.path.exists(storage_file):
+            self._load()
+        else:
+            self.rebuild()
+    
+    # --- טעינה ושמירה ---
+    
+    def _load(self):
+        try:
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._loaded_mtime = os.path.getmtime(self.storage_file)
+        except Exception as e:
+            log.warning("Error loading video catalog: %s", e)
+            return
+        self._reset()
+        for entry in sorted(data.get('videos', []), key=lambda entry: entry.get('created_at') or ''):
+            self._insert(entry)
+    
+    def _reload_if_changed(self):
+        """תהליך אחר (למשל main.py) עדכן את הקובץ - טעינה מחדש (בדיקת mtime בלבד)"""
+        try:
+            mtime = os.path.getmtime(self.storage_file)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self._load()
+    
+    def _save(self):
+        """נקרא כשהמנעול מוחזק"""
+        try:
+            write_json_atomic(self.storage_file, {
+                'last_updated': datetime.now().isoformat(),
+                'videos': [self._entries[filename] for filename in self._order],
+            })
+            self._loaded_mtime = os.path.getmtime(self.storage_file)
+        except OSError as e:
+            log.warning("Error saving video catalog: %s", e)
+    
+    def _reset(self):
+        self._entries = {}
+        self._order = []
+        self._index = {field: {} for field in INDEXED_FIELDS}
+    
+    def _insert(self, entry: Dict):
+        filename = entry['filename']
+        if filename in self._entries:
+            self._discard(filename)
+        self._entries[filename] = entry
+        self._order.append(filename)
+        for field in INDEXED_FIELDS:
+            if entry.get(field):
+                self._index[field].setdefault(entry[field], []).append(filename)
+    
+    def _discard(self, filename: str):
+        entry = self._entries.pop(filename, None)
+        if entry is None:
+            return
+        self._order.remove(filename)
+        for field in INDEXED_FIELDS:
+            bucket = self._index[field].get(entry.get(field))
+            if bucket and filename in bucket:
+                bucket.remove(filename)
+                if not bucket:
+                    del self._index[field][entry[field]]
+    
+    # --- עדכון ---
+    
+    def add(self, video_path: str, product: Optional[Dict] = None, profile=None,
+            duration: Optional[float] = None) -> Dict:
+        """רישום סרטון שהרינדור שלו הסתיים (profile: RenderProfile של הפלט)"""
+        product = product or {}
+        output_format = profile.output_format if profile else DEFAULT_FORMAT
+        entry = {
+            'filename': os.path.basename(video_path),
+            'asin': product_id(product) if product else None,
+            'title': product.get('title', ''),
+            'affiliate_url': product.get('affiliate_url', ''),
+            'fingerprint': product_fingerprint(product, profile.name, [output_format]) if profile else None,
+            'profile': profile.name if profile else None,
+            'format': output_format,
+            'width': profile.size[0] if profile else None,
+            'height': profile.size[1] if profile else None,
+            'duration': duration,
+            'size': os.path.getsize(video_path),
+            'created_at': datetime.now().isoformat(),
+        }
+        entry.update(preview_files(video_path))
+        with self._lock:
+            self._reload_if_changed()
+            self._insert(entry)
+            self._save()
+        return entry
+    
+    def remove(self, filename: str):
+        """הסרת סרטון מהאינדקס (נמחק מהדיסק)"""
+        with self._lock:
+            self._reload_if_changed()
+            if filename in self._entries:
+                self._discard(filename)
+                self._save()
+    
+    def rebuild(self) -> int:
+        """בניית האינדקס מחדש מתוך output_videos (כשאין קובץ אינדקס, או לתיקון)"""
+        from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+        
+        entries = []
+        names = os.listdir(self.videos_dir) if os.path.isdir(self.videos_dir) else []
+        for filename in names:
+            if not filename.endswith('.mp4'):
+                continue
+            path = os.path.join(self.videos_dir, filename)
+            stem = filename[:-len('.mp4')]
+            profile = next((name for name in RENDER_PROFILES if stem.endswith(f'_{name}')), 'final')
+            stem = stem[:-len(profile) - 1] if stem.endswith(f'_{profile}') else stem
+            output_format = next((name for name in OUTPUT_FORMATS if stem.endswith(f'_{name}')), DEFAULT_FORMAT)
+            asin = re.search(r'(?<![A-Z0-9])([A-Z0-9]{10})(?![A-Z0-9])', stem)
+            try:
+                infos = ffmpeg_parse_infos(path)
+                duration, size = infos.get('duration'), infos.get('video_size') or [None, None]
+            except Exception:
+                duration, size = None, [None, None]
+            entry = {
+                'filename': filename,
+                'asin': asin.group(1) if asin else None,
+                'title': '',
+                'affiliate_url': '',
+                'fingerprint': None,
+                'profile': profile,
+                'format': output_format,
+                'width': size[0],
+                'height': size[1],
+                'duration': duration,
+                'size': os.path.getsize(path),
+                'created_at': datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+            }
+            entry.update(preview_files(path))
+            entries.append(entry)
+        
+        with self._lock:
+            self._reset()
+            for entry in sorted(entries, key=lambda entry: entry['created_at']):
+                self._insert(entry)
+            self._save()
+        log.info("Video catalog rebuilt: %s videos", len(entries))
+        return len(entries)
+    
+    # --- שאילתות ---
+    
+    def get(self, filename: str) -> Optional[Dict]:
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._entries.get(filename)
+            return dict(entry) if entry else None
+    
+    def query(self, asin: Optional[str] = None, profile: Optional[str] = None,
+              output_format: Optional[str] = None, search: Optional[str] = None,
+              offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        """עמוד של סרטונים, מהחדש לישן, ומספר התוצאות הכולל.
+        בלי סינון: O(גודל העמוד). עם סינון: רק הסרטונים ברשימת האינדקס הקטנה מבין השדות שנבחרו.
+        סרטון שנמחק מהדיסק מוסר מהאינדקס כשהוא מגיע לעמוד"""
+        with self._lock:
+            self._reload_if_changed()
+            filters = {'asin': asin, 'profile': profile, 'format': output_format}
+            filters = {field: value for field, value in filters.items() if value}
+            
+            if filters:
+                candidates = min((self._index[field].get(value, []) for field, value in filters.items()), key=len)
+                matches = [
+                    filename for filename in candidates
+                    if all(self._entries[filename].get(field) == value for field, value in filters.items())
+                ]
+            else:
+                matches = self._order
+            if search:
+                search = search.lower()
+                matches = [filename for filename in matches if search in (self._entries[filename].get('title') or '').lower()
+                           or search in filename.lower()]
+            
+            page, missing = [], []
+            position = len(matches) - 1 - offset
+            while position >= 0 and len(page) < limit:
+                filename = matches[position]
+                position -= 1
+                if not os.path.exists(os.path.join(self.videos_dir, filename)):
+                    missing.append(filename)
+                    continue
+                page.append(dict(self._entries[filename]))
+            
+            total = len(matches) - len(missing)
+            if missing:
+                for filename in missing:
+                    self._discard(filename)
+                self._save()
+            return page, total
+
+
+if __name__ == '__main__':
+    # בנייה מחדש של האינדקס מתוך output_videos: python video_catalog.py
+    VideoCatalog().rebuild()
@@ -18,30 +18,186 @@ from moviepy.editor import (
     AudioFileClip, concatenate_videoclips, ColorClip, VideoClip
 )
 from moviepy.video.fx.all import fadein, fadeout
-from typing import Dict, Optional, List
+from moviepy.audio.fx.all import audio_loop
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from proglog import ProgressBarLogger
+from zoom_engine import KenBurnsZoom
+from template_compositor import (
+    TemplateCompositor, BackgroundSegment, OverlayLayer, RenderMonitor, RenderCancelled, write_videofiles,
+    ENCODER_FPS, ENCODED_FRAMES
+)
+from render_profiles import RenderProfile, get_profile, parse_formats, DEFAULT_FORMAT, PREVIEW_PROFILE
+from video_ingest import StreamedVideoSource, fetch_head, DEFAULT_HEADERS
+from scratch_space import ScratchSpace
+from video_previews import create_previews
+from video_catalog import VideoCatalog
+import metrics
+from log_config import get_logger
+from typing import Dict, Optional, List, Callable, Hashable
+from collections import OrderedDict
+from functools import lru_cache
 import tempfile
+import threading
+import time
 from io import BytesIO
 import textwrap
 
 
+log = get_logger('video')
+
+# פונטים מועמדים לפי סדר עדיפות (Windows, Linux, macOS)
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/arial.ttf",
+    "arial.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/liberation-sans/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+]
+
+_font_lock = threading.Lock()
+_font_path_resolved = False
+_font_path: Optional[str] = None
+
+
+def resolve_font_path() -> Optional[str]:
+    """איתור קובץ הפונט פעם אחת לכל התהליך (VIDEO_FONT_PATH גובר על הרשימה)"""
+    global _font_path_resolved, _font_path
+    with _font_lock:
+        if not _font_path_resolved:
+            for path in [os.getenv('VIDEO_FONT_PATH')] + FONT_CANDIDATES:
+                if not path:
+                    continue
+                try:
+                    ImageFont.truetype(path, 10)
+                except OSError:
+                    continue
+                _font_path = path
+                break
+            if not _font_path:
+                log.warning("No TrueType font found, using PIL default font")
+            _font_path_resolved = True
+    return _font_path
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> ImageFont.ImageFont:
+    """פונט בגודל נתון - נטען פעם אחת ומשותף לכל הסרטונים"""
+    path = resolve_font_path()
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size=size)
+
+
+class OverlayCache:
+    """מטמון LRU לתמונות שכבת-על מרונדרות, לפי (סוג, טקסט, גודל)"""
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, render: Callable[[], np.ndarray]) -> np.ndarray:
+        """החזרת התמונה מהמטמון, או רינדור ושמירה שלה"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+        
+        image = render()
+        # המערך משותף בין סרטונים - אסור לשנות אותו במקום
+        image.setflags(write=False)
+        
+        with self._lock:
+            self._items[key] = image
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return image
+    
+    def clear(self):
+        """ריקון המטמון"""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict:
+        """סטטיסטיקות שימוש במטמון"""
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# מטמון משותף לכל מופעי VideoGenerator בתהליך
+overlay_cache = OverlayCache(maxsize=int(os.getenv('OVERLAY_CACHE_SIZE', '64')))
+
+
+def _cache_counts() -> Dict[str, tuple]:
+    """(hits, misses) לכל מטמון - נקרא בזמן ה-scrape של /metrics"""
+    fonts = get_font.cache_info()
+    return {'overlay': (overlay_cache.hits, overlay_cache.misses), 'font': (fonts.hits, fonts.misses)}
+
+
+metrics.gauge('cache_hits', 'Cache hits since start', ['cache'], kind='counter',
+              function=lambda: {(name,): hits for name, (hits, _) in _cache_counts().items()})
+metrics.gauge('cache_misses', 'Cache misses since start', ['cache'], kind='counter',
+              function=lambda: {(name,): misses for name, (_, misses) in _cache_counts().items()})
+metrics.gauge('cache_hit_ratio', 'Cache hit ratio since start (0-1)', ['cache'],
+              function=lambda: {(name,): hits / (hits + misses) if hits + misses else None
+                                for name, (hits, misses) in _cache_counts().items()})
+
+
+class _MoviepyProgressLogger(ProgressBarLogger):
+    """העברת התקדמות הכתיבה של moviepy (נתיב הגיבוי) ל-RenderMonitor, כולל ביטול"""
+    
+    def __init__(self, monitor: RenderMonitor):
+        super().__init__()
+        self.monitor = monitor
+    
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar == 't' and attr == 'index':
+            self.monitor.check()
+            self.monitor.report('encode', value + 1, self.bars[bar]['total'])
+
+
 class VideoGenerator:
     """מחלקה ליצירת סרטוני שיווק אוטומטיים"""
     
-    def __init__(self, output_dir: str = 'output_videos', temp_dir: str = 'temp_files'):
+    def __init__(self, output_dir: str = 'output_videos', temp_dir: str = 'temp_files',
+                 cache_zoom_frames: bool = False, scratch: Optional[ScratchSpace] = None):
+        """scratch: תיקיות עבודה משותפות (למשל עם ה-DiskJanitor של האתר); ברירת מחדל - בתוך temp_dir"""
         self.output_dir = output_dir
         self.temp_dir = temp_dir
         self.video_duration = 8  # 8 שניות
         self.video_size = (1080, 1920)  # פורמט אנכי (TikTok/Instagram Reels)
+        self.cache_zoom_frames = cache_zoom_frames  # שמירת פריימי הזום בזיכרון
+        # מרכיב ישיר ל-ffmpeg; VIDEO_COMPOSITOR=moviepy מחזיר לנתיב הישן
+        self.use_template_compositor = os.getenv('VIDEO_COMPOSITOR', 'template') != 'moviepy'
         
         # יצירת תיקיות אם לא קיימות
         os.makedirs(output_dir, exist_ok=True)
-        os.makedirs(temp_dir, exist_ok=True)
+        # כל עבודה מקבלת תיקיית עבודה משלה בתוך temp_dir, שנמחקת בסיום
+        self.scratch = scratch or ScratchSpace(temp_dir)
+        # אינדקס הסרטונים שנוצרו (videos.json) - מתעדכן בסוף כל רינדור
+        self.catalog = VideoCatalog(videos_dir=output_dir)
     
-    def download_image(self, url: str) -> Optional[str]:
-        """הורדת תמונת מוצר או יצירת תמונה דמה"""
+    def download_image(self, url: str, work_dir: Optional[str] = None) -> Optional[str]:
+        """הורדת תמונת מוצר או יצירת תמונה דמה (לתוך תיקיית העבודה של העבודה)"""
         if not url or 'placeholder' in url.lower():
-            print("[!] Invalid or placeholder image URL, creating placeholder image...")
-            return self._create_placeholder_image()
+            log.warning("Invalid or placeholder image URL, creating placeholder image")
+            return self._create_placeholder_image(work_dir)
         
         try:
             # Set headers to avoid blocking
@@ -57,12 +213,12 @@ class VideoGenerator:
             # Check if it's actually an image
             content_type = response.headers.get('content-type', '')
             if not content_type.startswith('image/'):
-                print(f"[!] URL does not point to an image (content-type: {content_type}), creating placeholder...")
-                return self._create_placeholder_image()
+                log.warning("URL does not point to an image (content-type: %s), creating placeholder", content_type)
+                return self._create_placeholder_image(work_dir)
             
-            # שמירה זמנית
-            temp_path = os.path.join(self.temp_dir, f"product_{abs(hash(url))}.jpg")
-            with open(temp_path, 'wb') as f:
+            # שמירה זמנית - קובץ ייחודי כדי שעבודות מקבילות לא ידרסו זו את זו
+            fd, temp_path = tempfile.mkstemp(prefix='product_', suffix='.jpg', dir=work_dir or self.temp_dir)
+            with os.fdopen(fd, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
             
@@ -70,16 +226,15 @@ class VideoGenerator:
             if os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
                 return temp_path
             else:
-                print("[!] Downloaded file is empty, creating placeholder...")
-                return self._create_placeholder_image()
+                log.warning("Downloaded file is empty, creating placeholder")
+                return self._create_placeholder_image(work_dir)
                 
         except Exception as e:
-            print(f"[!] Error downloading image from {url}: {e}")
-            print("[!] Creating placeholder image instead...")
+            log.warning("Error downloading image, using a placeholder: %s", e, extra={'url': url})
             # יצירת תמונה דמה במקום
-            return self._create_placeholder_image()
+            return self._create_placeholder_image(work_dir)
     
-    def _create_placeholder_image(self) -> str:
+    def _create_placeholder_image(self, work_dir: Optional[str] = None) -> str:
         """יצירת תמונת דמה מעניינת יותר"""
         # יצירת תמונה גדולה יותר עם גרדיאנט
         width, height = 1000, 1000
@@ -113,13 +268,7 @@ class VideoGenerator:
                   fill=(255, 255, 255), width=3)
         
         # הוספת טקסט
-        try:
-            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 50)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 50)
-            except:
-                font = ImageFont.load_default()
+        font = get_font(50)
         
         text = "Product"
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -135,358 +284,478 @@ class VideoGenerator:
         draw.text(position, text, fill=(255, 255, 255), font=font)
         
         # שמירה
-        temp_path = os.path.join(self.temp_dir, "placeholder_product.jpg")
-        img.save(temp_path)
+        fd, temp_path = tempfile.mkstemp(prefix='placeholder_', suffix='.jpg', dir=work_dir or self.temp_dir)
+        with os.fdopen(fd, 'wb') as f:
+            img.save(f, format='JPEG')
         return temp_path
     
-    def create_product_video(self, product: Dict, output_filename: Optional[str] = None) -> Optional[str]:
-        """יצירת סרטון שיווק למוצר"""
+    def create_product_video(self, product: Dict, output_filename: Optional[str] = None,
+                             profile: Optional[str] = None,
+                             monitor: Optional[RenderMonitor] = None) -> Optional[str]:
+        """יצירת סרטון שיווק למוצר (profile: draft / standard / final)"""
+        videos = self.create_product_videos(product, output_filename=output_filename, profile=profile, monitor=monitor)
+        return videos.get(DEFAULT_FORMAT) if videos else None
+    
+    def create_product_videos(self, product: Dict, formats=None, output_filename: Optional[str] = None,
+                              profile: Optional[str] = None,
+                              monitor: Optional[RenderMonitor] = None,
+                              assets: Optional[Dict] = None) -> Dict[str, str]:
+        """יצירת סרטון המוצר בכמה יחסי תמונה בעבודה אחת (vertical / square / landscape).
+        ההורדות, פענוח התמונות ושכבות הטקסט משותפים; לכל פלט מקודד משלו.
+        monitor: דיווח התקדמות וביטול (RenderCancelled עוצר את המקודדים ומוחק קבצים חלקיים).
+        assets: תוצאה של download_assets - רינדור בלי הורדות (שלב נפרד בצינור).
+        מחזיר {פורמט: נתיב}, או מילון ריק אם היצירה נכשלה או בוטלה"""
+        monitor = monitor or RenderMonitor()
         try:
-            print(f"[VIDEO] Creating video for: {product.get('title', 'Unknown Product')}")
-            
-            # Check if product has a video
-            video_url = product.get('video_url', '')
-            if video_url:
-                print("[VIDEO] Using product video from Amazon")
-                return self._create_video_from_product_video(product, video_url, output_filename)
-            
-            # Check if product has multiple images for slideshow
-            image_urls = product.get('image_urls', [])
-            if not image_urls:
-                # Fallback to single image
-                image_urls = [product.get('image_url', '')]
-            
-            if len(image_urls) > 1:
-                print(f"[VIDEO] Creating slideshow from {len(image_urls)} product images")
-                return self._create_video_from_images_slideshow(product, image_urls, output_filename)
-            else:
-                print("[VIDEO] Creating video from single product image")
-                return self._create_video_from_single_image(product, image_urls[0] if image_urls else '', output_filename)
+            render_profile = get_profile(profile)
+            formats = parse_formats(formats)
+            log.info("Creating video for: %s", product.get('title', 'Unknown Product'),
+                     extra={'profile': render_profile.name, 'formats': ','.join(formats)})
+            
+            # תיקיית עבודה לעבודה הזו - נמחקת ביציאה מה-with גם בכישלון או בביטול
+            with self.scratch.job_dir(render_profile.name) as work_dir:
+                if assets is not None:
+                    return self._create_video_from_assets(product, assets, output_filename, render_profile, formats, monitor, work_dir)
+                
+                # Check if product has a video
+                video_url = product.get('video_url', '')
+                if video_url:
+                    log.debug("Using product video from Amazon")
+                    return self._create_video_from_product_video(product, video_url, output_filename, render_profile, formats, monitor, work_dir)
+                
+                # Check if product has multiple images for slideshow
+                image_urls = product.get('image_urls', [])
+                if not image_urls:
+                    # Fallback to single image
+                    image_urls = [product.get('image_url', '')]
+                
+                if len(image_urls) > 1:
+                    log.debug("Creating slideshow from %s product images", len(image_urls))
+                    return self._create_video_from_images_slideshow(product, image_urls, output_filename, render_profile, formats, monitor, work_dir)
+                else:
+                    log.debug("Creating video from single product image")
+                    return self._create_video_from_single_image(product, image_urls[0] if image_urls else '', output_filename, render_profile, formats, monitor, work_dir)
+        except RenderCancelled:
+            log.warning("Video generation cancelled: %s", product.get('title', 'Unknown Product'))
+            return {}
         except Exception as e:
-            print(f"[X] Error creating product video: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            log.exception("Error creating product video: %s", e)
+            return {}
     
-    def _create_video_from_product_video(self, product: Dict, video_url: str, output_filename: Optional[str] = None) -> Optional[str]:
-        """יצירת סרטון מסרטון המוצר"""
+    def download_assets(self, product: Dict, monitor: Optional[RenderMonitor] = None) -> Dict:
+        """שלב ההורדה בלבד: תחילת סרטון המוצר לקובץ זמני, או התמונות מפוענחות בזיכרון.
+        התוצאה מועברת ל-create_product_videos(assets=...) ומשוחררת ב-release_assets"""
+        monitor = monitor or RenderMonitor()
+        work_dir = self.scratch.create('assets')
         try:
-            from moviepy.editor import VideoFileClip
-            
-            # Download product video
-            print(f"[DOWNLOAD] Downloading product video...")
-            video_path = self.download_video(video_url)
-            if not video_path:
-                print("[!] Failed to download product video, falling back to images")
-                return self._create_video_from_images_slideshow(product, product.get('image_urls', []), output_filename)
-            
-            # Load video clip
-            product_video = VideoFileClip(video_path)
-            
-            # Resize and crop to fit vertical format
-            product_video = product_video.resize(height=self.video_size[1])
-            if product_video.w > self.video_size[0]:
-                product_video = product_video.crop(x_center=product_video.w/2, width=self.video_size[0])
-            
-            # Limit duration to 8 seconds
-            if product_video.duration > self.video_duration:
-                product_video = product_video.subclip(0, self.video_duration)
+            return self._download_assets(product, monitor, work_dir)
+        except BaseException:
+            self.scratch.release(work_dir)
+            raise
+    
+    def _download_assets(self, product: Dict, monitor: RenderMonitor, work_dir: str) -> Dict:
+        video_url = product.get('video_url', '')
+        if video_url:
+            video_path = os.path.join(work_dir, 'product_video.mp4')
+            try:
+                monitor.report('download')
+                log.debug("Fetching first %ss of product video", self.video_duration)
+                return {'video_path': fetch_head(video_url, video_path, self.video_duration), 'work_dir': work_dir}
+            except Exception as e:
+                self._remove_temp_files([video_path])
+                log.warning("Error fetching product video, falling back to images: %s", e)
+                image_urls = product.get('image_urls', [])
+                slideshow = True
+        else:
+            image_urls = product.get('image_urls', [])
+            slideshow = len(image_urls) > 1
+            if not slideshow:
+                image_urls = [image_urls[0] if image_urls else product.get('image_url', '')]
+        
+        image_paths = self._download_images(image_urls, monitor, work_dir)
+        try:
+            return {'images': [self._load_image(path) for path in image_paths], 'slideshow': slideshow,
+                    'work_dir': work_dir}
+        finally:
+            # התמונות מפוענחות בזיכרון - הקבצים כבר לא נחוצים
+            self._remove_temp_files(image_paths)
+    
+    def release_assets(self, assets: Optional[Dict]):
+        """מחיקת תיקיית העבודה של download_assets"""
+        if assets:
+            self.scratch.release(assets.get('work_dir'))
+    
+    def _create_video_from_assets(self, product: Dict, assets: Dict, output_filename: Optional[str],
+                                  profile: RenderProfile, formats: List[str],
+                                  monitor: RenderMonitor, work_dir: Optional[str] = None) -> Dict[str, str]:
+        """רינדור מנכסים שכבר הורדו (אותם מסלולים כמו ב-create_product_videos)"""
+        if assets.get('video_path'):
+            log.debug("Using downloaded product video")
+            return self._create_video_from_product_video(product, assets['video_path'], output_filename, profile, formats, monitor, work_dir)
+        
+        images = assets.get('images') or []
+        if not images:
+            log.error("No product images were downloaded")
+            return {}
+        if assets.get('slideshow'):
+            log.debug("Creating slideshow from %s product images", len(images))
+            return self._render_slideshow(product, images, output_filename, profile, formats, monitor)
+        log.debug("Creating video from single product image")
+        return self._render_single_image(product, images[0], output_filename, profile, formats, monitor)
+    
+    def _create_video_from_product_video(self, product: Dict, video_url: str, output_filename: Optional[str] = None,
+                                         profile: Optional[RenderProfile] = None,
+                                         formats: Optional[List[str]] = None,
+                                         monitor: Optional[RenderMonitor] = None,
+                                         work_dir: Optional[str] = None) -> Dict[str, str]:
+        """יצירת סרטון מסרטון המוצר - ffmpeg שומר רק את 8 השניות הראשונות (עם הקול),
+        משנה גודל, חותך ומלופף ישירות לגודל הפלט; נשאר רק להרכיב את הטקסטים"""
+        profile = profile or get_profile()
+        formats = formats or [DEFAULT_FORMAT]
+        monitor = monitor or RenderMonitor()
+        head_path = None
+        sources = []
+        try:
+            source = video_url
+            if video_url.startswith(('http://', 'https://')):
+                # הורדה אחת של תחילת הסרטון (העתקה בלי פענוח): כל פלט מפענח ממנה בגודל שלו,
+                # ופס הקול שלה ממוקסס לפלט
+                log.debug("Fetching first %ss of product video", self.video_duration)
+                monitor.report('download')
+                fd, head_path = tempfile.mkstemp(prefix='product_video_', suffix='.mp4', dir=work_dir or self.temp_dir)
+                os.close(fd)
+                source = fetch_head(video_url, head_path, self.video_duration)
             else:
-                # Loop video if shorter than 8 seconds
-                loops_needed = int(self.video_duration / product_video.duration) + 1
-                product_video = concatenate_videoclips([product_video] * loops_needed).subclip(0, self.video_duration)
-            
-            product_video = product_video.set_fps(30)
-            
-            # Add text overlays (same as image version)
-            clips = [product_video]
-            clips.extend(self._create_text_overlays(product))
+                monitor.report('download')
             
-            # Create final video
-            final_video = CompositeVideoClip(clips, size=self.video_size).set_duration(self.video_duration).set_fps(30)
-            
-            # Save video
-            if not output_filename:
-                safe_title = "".join(c for c in product.get('title', 'product')[:30] if c.isalnum() or c in (' ', '-', '_'))
-                output_filename = f"{safe_title.replace(' ', '_')}.mp4"
-            
-            output_path = os.path.join(self.output_dir, output_filename)
-            final_video.write_videofile(output_path, fps=30, codec='libx264', audio_codec='aac', preset='medium', threads=4, logger=None)
-            
-            # Cleanup
-            final_video.close()
-            product_video.close()
-            if os.path.exists(video_path):
-                try:
-                    os.remove(video_path)
-                except:
-                    pass
+            def backgrounds_for(output_profile: RenderProfile) -> List[BackgroundSegment]:
+                stream = StreamedVideoSource(source, output_profile.size, self.video_duration, output_profile.fps)
+                sources.append(stream)
+                return [BackgroundSegment(stream.make_clip(), render_into=stream.render_into)]
             
-            print(f"[OK] Video created: {output_path}")
-            return output_path
+            # Add text overlays (same as image version) and render
+            # פס הקול נלקח מהקובץ שנקלט (תחילת הסרטון)
+            return self._render_formats(product, formats, profile, output_filename, backgrounds_for, monitor=monitor,
+                                        audio_source=source)
             
+        except RenderCancelled:
+            raise
         except Exception as e:
-            print(f"[!] Error using product video: {e}")
-            print("[!] Falling back to images")
-            return self._create_video_from_images_slideshow(product, product.get('image_urls', []), output_filename)
+            log.warning("Error using product video, falling back to images: %s", e)
+            return self._create_video_from_images_slideshow(product, product.get('image_urls', []), output_filename, profile, formats, monitor, work_dir)
+        finally:
+            for stream in sources:
+                stream.close()
+            self._remove_temp_files([head_path])
     
-    def _create_video_from_images_slideshow(self, product: Dict, image_urls: List[str], output_filename: Optional[str] = None) -> Optional[str]:
+    def _create_video_from_images_slideshow(self, product: Dict, image_urls: List[str], output_filename: Optional[str] = None,
+                                            profile: Optional[RenderProfile] = None,
+                                            formats: Optional[List[str]] = None,
+                                            monitor: Optional[RenderMonitor] = None,
+                                            work_dir: Optional[str] = None) -> Dict[str, str]:
         """יצירת סרטון מסליידשואו של תמונות"""
+        profile = profile or get_profile()
+        formats = formats or [DEFAULT_FORMAT]
+        monitor = monitor or RenderMonitor()
+        image_paths = []
         try:
             # Download all images
-            image_paths = []
-            for i, url in enumerate(image_urls[:5]):  # Limit to 5 images
-                print(f"[DOWNLOAD] Downloading image {i+1}/{min(len(image_urls), 5)}...")
-                img_path = self.download_image(url)
-                if img_path:
-                    image_paths.append(img_path)
-            
+            image_paths = self._download_images(image_urls, monitor, work_dir)
             if not image_paths:
-                print("[X] Failed to download any images")
-                return None
-            
-            # Create clips from images
-            clips = []
-            duration_per_image = self.video_duration / len(image_paths)
-            
-            for i, img_path in enumerate(image_paths):
-                clip = self._create_product_image_clip_with_zoom(img_path, duration=duration_per_image)
-                clip = clip.set_start(i * duration_per_image)
-                clips.append(clip)
-            
-            # Add text overlays
-            text_clips = self._create_text_overlays(product)
-            clips.extend(text_clips)
-            
-            # Create final video
-            final_video = CompositeVideoClip(clips, size=self.video_size).set_duration(self.video_duration).set_fps(30)
-            
-            # Save video
-            if not output_filename:
-                safe_title = "".join(c for c in product.get('title', 'product')[:30] if c.isalnum() or c in (' ', '-', '_'))
-                output_filename = f"{safe_title.replace(' ', '_')}.mp4"
-            
-            output_path = os.path.join(self.output_dir, output_filename)
-            final_video.write_videofile(output_path, fps=30, codec='libx264', audio_codec='aac', preset='medium', threads=4, logger=None)
-            
-            # Cleanup
-            final_video.close()
-            for clip in clips:
-                if hasattr(clip, 'close'):
-                    try:
-                        clip.close()
-                    except:
-                        pass
+                log.error("Failed to download any images")
+                return {}
             
-            print(f"[OK] Video created: {output_path}")
-            return output_path
+            # פענוח כל תמונה פעם אחת - משותף לכל הפורמטים
+            images = [self._load_image(path) for path in image_paths]
+            return self._render_slideshow(product, images, output_filename, profile, formats, monitor)
             
+        except RenderCancelled:
+            raise
         except Exception as e:
-            print(f"[X] Error creating slideshow: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            log.exception("Error creating slideshow: %s", e)
+            return {}
+        finally:
+            self._remove_temp_files(image_paths)
+    
+    def _download_images(self, image_urls: List[str], monitor: RenderMonitor,
+                         work_dir: Optional[str] = None) -> List[str]:
+        """הורדת עד 5 תמונות מוצר לקבצים זמניים"""
+        image_paths = []
+        image_urls = image_urls[:5]  # Limit to 5 images
+        for i, url in enumerate(image_urls):
+            monitor.check()
+            monitor.report('download', i, len(image_urls))
+            log.debug("Downloading image %s/%s", i + 1, len(image_urls))
+            img_path = self.download_image(url, work_dir)
+            if img_path:
+                image_paths.append(img_path)
+        return image_paths
     
-    def _create_video_from_single_image(self, product: Dict, image_url: str, output_filename: Optional[str] = None) -> Optional[str]:
+    def _render_slideshow(self, product: Dict, images: List[Image.Image], output_filename: Optional[str],
+                          profile: RenderProfile, formats: List[str],
+                          monitor: RenderMonitor) -> Dict[str, str]:
+        """סליידשואו מתמונות מפוענחות - זום לכל תמונה ברצף"""
+        duration_per_image = self.video_duration / len(images)
+        
+        def backgrounds_for(output_profile: RenderProfile) -> List[BackgroundSegment]:
+            # Create zoom backgrounds from images
+            return [
+                BackgroundSegment.from_zoom(
+                    self._create_zoom(image, duration=duration_per_image, profile=output_profile),
+                    start=i * duration_per_image
+                )
+                for i, image in enumerate(images)
+            ]
+        
+        # Add text overlays and render
+        return self._render_formats(product, formats, profile, output_filename, backgrounds_for, monitor=monitor)
+    
+    def _create_video_from_single_image(self, product: Dict, image_url: str, output_filename: Optional[str] = None,
+                                        profile: Optional[RenderProfile] = None,
+                                        formats: Optional[List[str]] = None,
+                                        monitor: Optional[RenderMonitor] = None,
+                                        work_dir: Optional[str] = None) -> Dict[str, str]:
         """יצירת סרטון מתמונה בודדת (השיטה הישנה)"""
+        profile = profile or get_profile()
+        formats = formats or [DEFAULT_FORMAT]
+        monitor = monitor or RenderMonitor()
+        image_path = None
         try:
-            print(f"[VIDEO] Creating video for: {product.get('title', 'Unknown Product')}")
-            
             # Download product image
-            image_path = self.download_image(image_url)
+            monitor.report('download', 0, 1)
+            image_path = self.download_image(image_url, work_dir)
             if not image_path:
-                print("[X] Failed to download product image")
-                return None
-            
-            # יצירת תמונות עם טקסט באמצעות PIL
-            title_img_path = self._create_title_image(product.get('title', 'Recommended Product'))
-            price_img_path = self._create_price_image(
-                price=product.get('price', '₪0'),
-                original_price=product.get('original_price', ''),
-                discount=product.get('discount', ''),
-                rating=product.get('rating', 0),
-                reviews_count=product.get('reviews_count', 0)
-            )
-            cta_img_path = self._create_cta_image("Shop Now!")
-            
-            # יצירת קליפים מתמונות
-            clips = []
-            
-            # 1. תמונת מוצר עם אנימציית זום (0-8 שניות) - רקע לכל הסרטון
-            product_clip = self._create_product_image_clip_with_zoom(image_path, duration=self.video_duration)
-            clips.append(product_clip)
-            
-            # 2. Sales hook text (0-2 seconds) - Attention grabber
-            hook_text = self._create_sales_hook_text(product)
-            if hook_text:
-                hook_clip = ImageClip(hook_text, duration=2).set_start(0).set_position(('center', 150)).set_fps(30)
-                hook_clip = fadein(hook_clip, 0.5)
-                hook_clip = fadeout(hook_clip, 0.5)
-                clips.append(hook_clip)
-            
-            # 3. Product title (1.5-4 seconds) - Top, appears over product image
-            title_clip = ImageClip(title_img_path, duration=2.5).set_start(1.5).set_position(('center', 100)).set_fps(30)
-            title_clip = fadein(title_clip, 0.3)
-            title_clip = fadeout(title_clip, 0.3)
-            clips.append(title_clip)
-            
-            # 4. Price and discount (3.5-7 seconds) - Bottom, appears over product image
-            price_clip = ImageClip(price_img_path, duration=3.5).set_start(3.5).set_position(('center', self.video_size[1] - 400)).set_fps(30)
-            price_clip = fadein(price_clip, 0.4)
-            price_clip = fadeout(price_clip, 0.4)
-            clips.append(price_clip)
-            
-            # 5. Call to action (6.5-8 seconds) - Bottom, with animation
-            cta_clip = ImageClip(cta_img_path, duration=1.5).set_start(6.5).set_position(('center', self.video_size[1] - 200)).set_fps(30)
-            cta_clip = fadein(cta_clip, 0.3)
-            clips.append(cta_clip)
-            
-            # 6. Urgency text (6-8 seconds) - Limited time offer
-            urgency_text = self._create_urgency_text()
-            if urgency_text:
-                urgency_clip = ImageClip(urgency_text, duration=2).set_start(6).set_position(('center', 250)).set_fps(30)
-                urgency_clip = fadein(urgency_clip, 0.3)
-                clips.append(urgency_clip)
-            
-            # יצירת רקע (לא נחוץ כי תמונת המוצר כבר מכסה)
-            # background = ColorClip(size=self.video_size, color=(0, 0, 0), duration=self.video_duration).set_fps(30)
-            
-            # חיבור כל הקליפים
-            final_video = CompositeVideoClip(
-                clips,  # No background needed - product image is the background
-                size=self.video_size
-            ).set_duration(self.video_duration).set_fps(30)
-            
-            # שמירת הסרטון
-            if not output_filename:
-                safe_title = "".join(c for c in product.get('title', 'product')[:30] if c.isalnum() or c in (' ', '-', '_'))
-                output_filename = f"{safe_title.replace(' ', '_')}.mp4"
-            
-            output_path = os.path.join(self.output_dir, output_filename)
-            
-            # Ensure all clips are properly sized and have fps
-            for clip in clips:
-                if hasattr(clip, 'size') and clip.size != self.video_size:
-                    clip = clip.resize(self.video_size)
+                log.error("Failed to download product image")
+                return {}
+            image = self._load_image(image_path)
+            return self._render_single_image(product, image, output_filename, profile, formats, monitor)
             
+        except RenderCancelled:
+            raise
+        except Exception as e:
+            log.exception("Error creating video: %s", e)
+            return {}
+        finally:
+            self._remove_temp_files([image_path])
+    
+    def _render_single_image(self, product: Dict, image: Image.Image, output_filename: Optional[str],
+                             profile: RenderProfile, formats: List[str],
+                             monitor: RenderMonitor) -> Dict[str, str]:
+        """סרטון מתמונה מפוענחת אחת"""
+        # 1. תמונת מוצר עם אנימציית זום (0-8 שניות) - רקע לכל הסרטון
+        def backgrounds_for(output_profile: RenderProfile) -> List[BackgroundSegment]:
+            zoom = self._create_zoom(image, duration=self.video_duration, profile=output_profile)
+            return [BackgroundSegment.from_zoom(zoom)]
+        
+        # 2-6. Hook, title, price, CTA and urgency overlays (rendered in memory)
+        return self._render_formats(product, formats, profile, output_filename, backgrounds_for,
+                                    default_price='₪0', monitor=monitor)
+    
+    def _render_formats(self, product: Dict, formats: List[str], profile: RenderProfile,
+                        output_filename: Optional[str],
+                        backgrounds_for: Callable[[RenderProfile], List[BackgroundSegment]],
+                        default_price: str = '$0', monitor: Optional[RenderMonitor] = None,
+                        audio_source: Optional[str] = None) -> Dict[str, str]:
+        """הרכבת פלט לכל פורמט (רקע + שכבות בקנה המידה שלו) ורינדור כולם במעבר אחד.
+        audio_source: קובץ שפס הקול שלו נכנס לכל הפלטים (סרטון המוצר)"""
+        monitor = monitor or RenderMonitor()
+        monitor.check()
+        monitor.report('composite')
+        
+        # שכבות הטקסט מרונדרות פעם אחת בגודל התבנית ומוקטנות לכל פלט
+        design_layers = self._design_overlay_layers(product, default_price)
+        
+        outputs = []
+        for output_format in formats:
+            output_profile = profile.for_format(output_format)
+            outputs.append({
+                'format': output_format,
+                'profile': output_profile,
+                'backgrounds': backgrounds_for(output_profile),
+                'layers': self._scale_layers(design_layers, output_profile),
+                'path': self._output_path(product, output_filename, output_profile),
+                'audio_source': audio_source,
+            })
+        
+        self._render_template(outputs, profile, monitor)
+        for output in outputs:
+            log.info("Video created: %s", output['path'])
+            # פוסטר ו-WebP מונפש לרשימות (לא לתצוגה המקדימה המהירה - שם כל שנייה נחשבת)
+            if profile.name != PREVIEW_PROFILE:
+                create_previews(output['path'])
+            try:
+                self.catalog.add(output['path'], product, output['profile'], self.video_duration)
+            except Exception as e:
+                log.warning("Could not add video to catalog: %s", e)
+        return {output['format']: output['path'] for output in outputs}
+    
+    def _output_path(self, product: Dict, output_filename: Optional[str] = None,
+                     profile: Optional[RenderProfile] = None) -> str:
+        """נתיב קובץ הפלט (לפי שם המוצר אם לא ניתן שם; פורמט שאינו אנכי ופרופיל שאינו final מקבלים סיומת)"""
+        suffix = ''
+        if profile and profile.output_format != DEFAULT_FORMAT:
+            suffix += f"_{profile.output_format}"
+        if not output_filename:
+            safe_title = "".join(c for c in product.get('title', 'product')[:30] if c.isalnum() or c in (' ', '-', '_'))
+            if profile and profile.name != 'final':
+                suffix += f"_{profile.name}"
+            output_filename = f"{safe_title.replace(' ', '_')}{suffix}.mp4"
+        elif suffix:
+            base, ext = os.path.splitext(output_filename)
+            output_filename = f"{base}{suffix}{ext or '.mp4'}"
+        return os.path.join(self.output_dir, output_filename)
+    
+    def _render_template(self, outputs: List[Dict], profile: Optional[RenderProfile] = None,
+                         monitor: Optional[RenderMonitor] = None) -> List[str]:
+        """רינדור התבנית לכל הפלטים: מרכיב ישיר ל-ffmpeg, ו-moviepy כגיבוי"""
+        profile = profile or get_profile()
+        monitor = monitor or RenderMonitor()
+        if self.use_template_compositor:
+            try:
+                compositors = [
+                    (TemplateCompositor(output['profile'].size, self.video_duration, profile.fps,
+                                        output['backgrounds'], output['layers'], output.get('audio_source')),
+                     output['path'])
+                    for output in outputs
+                ]
+                return write_videofiles(
+                    compositors, codec='libx264', preset=profile.preset,
+                    threads=profile.threads, crf=profile.crf, monitor=monitor
+                )
+            except RenderCancelled:
+                raise
+            except Exception as e:
+                log.warning("Template compositor failed (%s), falling back to moviepy", e)
+        
+        return [
+            self._render_with_moviepy(output['backgrounds'], output['layers'], output['path'], output['profile'], monitor,
+                                      audio_source=output.get('audio_source'))
+            for output in outputs
+        ]
+    
+    def _render_with_moviepy(self, backgrounds: List[BackgroundSegment], layers: List[OverlayLayer],
+                             output_path: str, profile: Optional[RenderProfile] = None,
+                             monitor: Optional[RenderMonitor] = None, audio_source: Optional[str] = None) -> str:
+        """רינדור התבנית עם CompositeVideoClip (הנתיב הישן)"""
+        profile = profile or get_profile()
+        clips = [segment.clip.set_start(segment.start) for segment in backgrounds]
+        clips.extend(self._layers_to_clips(layers, profile.fps))
+        
+        final_video = CompositeVideoClip(clips, size=profile.size).set_duration(self.video_duration).set_fps(profile.fps)
+        audio = None
+        if audio_source:
+            # פס הקול של סרטון המוצר, מלופף כמו בנתיב הראשי (מקור בלי קול - פלט שקט)
+            try:
+                if ffmpeg_parse_infos(audio_source).get('audio_found'):
+                    audio = AudioFileClip(audio_source)
+                    final_video = final_video.set_audio(audio_loop(audio, duration=self.video_duration))
+            except Exception as e:
+                log.debug("Could not read product video audio: %s", e)
+        started = time.perf_counter()
+        try:
             final_video.write_videofile(
                 output_path,
-                fps=30,
+                fps=profile.fps,
                 codec='libx264',
                 audio_codec='aac',
-                preset='medium',
-                threads=4,
-                logger=None  # Suppress verbose output
+                preset=profile.preset,
+                threads=profile.threads,
+                ffmpeg_params=['-crf', str(profile.crf)],
+                logger=_MoviepyProgressLogger(monitor) if monitor.on_progress or monitor.cancel_event else None
             )
-            
-            # Close the video to free resources
+        except RenderCancelled:
+            self._remove_temp_files([output_path])  # קובץ חלקי
+            raise
+        finally:
             final_video.close()
-            for clip in clips:
-                if hasattr(clip, 'close'):
-                    try:
-                        clip.close()
-                    except:
-                        pass
-            
-            # Cleanup temporary files
-            temp_files = [image_path, title_img_path, price_img_path, cta_img_path]
-            # Add hook and urgency text files if they exist
-            hook_path = self._create_sales_hook_text(product) if product else None
-            urgency_path = self._create_urgency_text()
-            if hook_path:
-                temp_files.append(hook_path)
-            if urgency_path:
-                temp_files.append(urgency_path)
-            
-            for temp_file in temp_files:
-                if temp_file and os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
-            
-            print(f"[OK] Video created: {output_path}")
-            return output_path
-            
-        except Exception as e:
-            print(f"[X] Error creating video: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            if audio is not None:
+                audio.close()
+        frames = int(round(self.video_duration * profile.fps))
+        ENCODER_FPS.observe(frames / max(time.perf_counter() - started, 1e-6), encoder='moviepy')
+        ENCODED_FRAMES.inc(frames, encoder='moviepy')
+        return output_path
     
-    def _create_text_overlays(self, product: Dict) -> List:
-        """יצירת כל הטקסטים העל-גבייים"""
-        clips = []
-        
-        # Create text images
-        title_img_path = self._create_title_image(product.get('title', 'Recommended Product'))
-        price_img_path = self._create_price_image(
-            price=product.get('price', '$0'),
+    def _create_overlay_layers(self, product: Dict, default_price: str = '$0',
+                               profile: Optional[RenderProfile] = None) -> List[OverlayLayer]:
+        """תזמון ומיקום כל הטקסטים העל-גבייים בתבנית (בקנה המידה של הפרופיל)"""
+        return self._scale_layers(self._design_overlay_layers(product, default_price), profile or get_profile())
+    
+    def _design_overlay_layers(self, product: Dict, default_price: str = '$0') -> List[OverlayLayer]:
+        """שכבות הטקסט בגודל התבנית המקורי (1080x1920)"""
+        layers = []
+        
+        # Sales hook text (0-2 seconds) - Attention grabber
+        hook_img = self._create_sales_hook_text(product)
+        if hook_img is not None:
+            layers.append(OverlayLayer(hook_img, start=0, duration=2, y=150, fade_in=0.5, fade_out=0.5))
+        
+        # Product title (1.5-4 seconds) - Top, appears over product image
+        title_img = self._create_title_image(product.get('title', 'Recommended Product'))
+        layers.append(OverlayLayer(title_img, start=1.5, duration=2.5, y=100, fade_in=0.3, fade_out=0.3))
+        
+        # Price and discount (3.5-7 seconds) - Bottom
+        price_img = self._create_price_image(
+            price=product.get('price', default_price),
             original_price=product.get('original_price', ''),
             discount=product.get('discount', ''),
             rating=product.get('rating', 0),
             reviews_count=product.get('reviews_count', 0)
         )
-        cta_img_path = self._create_cta_image("Shop Now!")
-        
-        # Sales hook text
-        hook_text = self._create_sales_hook_text(product)
-        if hook_text:
-            hook_clip = ImageClip(hook_text, duration=2).set_start(0).set_position(('center', 150)).set_fps(30)
-            hook_clip = fadein(hook_clip, 0.5)
-            hook_clip = fadeout(hook_clip, 0.5)
-            clips.append(hook_clip)
-        
-        # Product title
-        title_clip = ImageClip(title_img_path, duration=2.5).set_start(1.5).set_position(('center', 100)).set_fps(30)
-        title_clip = fadein(title_clip, 0.3)
-        title_clip = fadeout(title_clip, 0.3)
-        clips.append(title_clip)
-        
-        # Price and discount
-        price_clip = ImageClip(price_img_path, duration=3.5).set_start(3.5).set_position(('center', self.video_size[1] - 400)).set_fps(30)
-        price_clip = fadein(price_clip, 0.4)
-        price_clip = fadeout(price_clip, 0.4)
-        clips.append(price_clip)
-        
-        # Call to action
-        cta_clip = ImageClip(cta_img_path, duration=1.5).set_start(6.5).set_position(('center', self.video_size[1] - 200)).set_fps(30)
-        cta_clip = fadein(cta_clip, 0.3)
-        clips.append(cta_clip)
-        
-        # Urgency text
-        urgency_text = self._create_urgency_text()
-        if urgency_text:
-            urgency_clip = ImageClip(urgency_text, duration=2).set_start(6).set_position(('center', 250)).set_fps(30)
-            urgency_clip = fadein(urgency_clip, 0.3)
-            clips.append(urgency_clip)
+        layers.append(OverlayLayer(price_img, start=3.5, duration=3.5, y=self.video_size[1] - 400, fade_in=0.4, fade_out=0.4))
+        
+        # Call to action (6.5-8 seconds) - Bottom
+        cta_img = self._create_cta_image("Shop Now!")
+        layers.append(OverlayLayer(cta_img, start=6.5, duration=1.5, y=self.video_size[1] - 200, fade_in=0.3))
         
+        # Urgency text (6-8 seconds) - Limited time offer
+        urgency_img = self._create_urgency_text()
+        if urgency_img is not None:
+            layers.append(OverlayLayer(urgency_img, start=6, duration=2, y=250, fade_in=0.3))
+        
+        return layers
+    
+    def _scale_layers(self, layers: List[OverlayLayer], profile: RenderProfile) -> List[OverlayLayer]:
+        """התבנית מתוכננת ב-1080x1920; פרופילים ופורמטים אחרים מקטינים את השכבות.
+        בפורמט ריבועי/רוחבי עמודת התבנית ממורכזת ותופסת את כל הגובה"""
+        scale = profile.scale_from(self.video_size)
+        if scale != 1.0:
+            layers = [layer.scaled(scale) for layer in layers]
+        return layers
+    
+    def _layers_to_clips(self, layers: List[OverlayLayer], fps: int = 30) -> List:
+        """המרת שכבות התבנית לקליפים של moviepy"""
+        clips = []
+        for layer in layers:
+            clip = ImageClip(layer.image, duration=layer.duration).set_start(layer.start).set_position(('center', layer.y)).set_fps(fps)
+            if layer.fade_in:
+                clip = fadein(clip, layer.fade_in)
+            if layer.fade_out:
+                clip = fadeout(clip, layer.fade_out)
+            clips.append(clip)
         return clips
     
-    def download_video(self, url: str) -> Optional[str]:
+    def _create_text_overlays(self, product: Dict, default_price: str = '$0') -> List:
+        """יצירת כל הטקסטים העל-גבייים"""
+        return self._layers_to_clips(self._create_overlay_layers(product, default_price, get_profile('final')))
+    
+    def download_video(self, url: str, work_dir: Optional[str] = None) -> Optional[str]:
         """הורדת סרטון מוצר"""
         if not url:
             return None
         
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'video/webm,video/ogg,video/*;q=0.9,*/*;q=0.8',
-                'Referer': 'https://www.amazon.com/',
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30, stream=True)
+            response = requests.get(url, headers=DEFAULT_HEADERS, timeout=30, stream=True)
             response.raise_for_status()
             
             # Check if it's actually a video
             content_type = response.headers.get('content-type', '')
             if not content_type.startswith('video/'):
-                print(f"[!] URL does not point to a video (content-type: {content_type})")
+                log.warning("URL does not point to a video (content-type: %s)", content_type)
                 return None
             
-            # Save temporarily
-            temp_path = os.path.join(self.temp_dir, f"product_video_{abs(hash(url))}.mp4")
-            with open(temp_path, 'wb') as f:
+            # Save temporarily (שם ייחודי - כמה עבודות יכולות להוריד את אותה כתובת במקביל)
+            fd, temp_path = tempfile.mkstemp(prefix='product_video_', suffix='.mp4', dir=work_dir or self.temp_dir)
+            with os.fdopen(fd, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
             
@@ -496,18 +765,42 @@ class VideoGenerator:
                 return None
                 
         except Exception as e:
-            print(f"[!] Error downloading video: {e}")
+            log.warning("Error downloading video: %s", e)
             return None
     
-    def _create_product_image_clip_with_zoom(self, image_path: str, duration: float) -> ImageClip:
+    def _remove_temp_files(self, paths: List[Optional[str]]):
+        """מחיקת קבצים זמניים שהורדו (נקרא מתוך finally)"""
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def _create_product_image_clip_with_zoom(self, image_path: str, duration: float) -> VideoClip:
         """יצירת קליפ תמונת מוצר עם אנימציית זום"""
-        # טעינת תמונה
-        img = Image.open(image_path)
+        return self._create_zoom(image_path, duration, get_profile('final')).make_clip().set_position('center')
+    
+    def _load_image(self, image_path: str) -> Image.Image:
+        """פענוח תמונה פעם אחת (לשימוש חוזר בכמה פורמטים)"""
+        with Image.open(image_path) as img:
+            img.load()
+            return img.copy()
+    
+    def _create_zoom(self, image, duration: float,
+                     profile: Optional[RenderProfile] = None) -> KenBurnsZoom:
+        """הכנת תמונת המוצר ומנוע הזום שלה, בגודל הפלט של הפרופיל (image: נתיב או תמונה מפוענחת)"""
+        profile = profile or get_profile()
+        frame_size = profile.size
+        scale = profile.scale_from(self.video_size)
+        
+        # טעינת תמונה (עותק - thumbnail משנה את התמונה במקום)
+        img = Image.open(image) if isinstance(image, str) else image.copy()
         
         # יצירת תמונה גדולה יותר לזום
         zoom_factor = 1.2  # 20% zoom in
-        large_width = int(self.video_size[0] * zoom_factor)
-        large_height = int(self.video_size[1] * zoom_factor)
+        large_width = int(frame_size[0] * zoom_factor)
+        large_height = int(frame_size[1] * zoom_factor)
         
         # שינוי גודל תוך שמירה על יחס גובה-רוחב
         img.thumbnail((large_width, large_height), Image.Resampling.LANCZOS)
@@ -515,34 +808,28 @@ class VideoGenerator:
         # יצירת תמונה גדולה עם רקע שחור
         bg = Image.new('RGB', (large_width, large_height), color=(20, 20, 20))
         x = (bg.width - img.width) // 2
-        y = (bg.height - img.height) // 2 - 100
+        y = (bg.height - img.height) // 2 - int(100 * scale)
         bg.paste(img, (x, y))
         
-        # שמירה זמנית
-        temp_path = os.path.join(self.temp_dir, f"product_bg_{abs(hash(image_path))}.jpg")
-        bg.save(temp_path)
-        
-        # יצירת קליפ עם אנימציית זום
-        base_clip = ImageClip(temp_path).set_duration(duration).set_fps(30)
-        
         # אנימציית זום - מתחיל גדול ומתקרב (Ken Burns effect)
-        # Use resize with a function that changes over time
-        def zoom_func(t):
-            # Start at 1.0, end at 0.85 (zooms in 15% over duration)
-            return 1.0 - (t / duration) * 0.15
-        
-        # Apply zoom effect
-        zoom_clip = base_clip.resize(zoom_func)
-        zoom_clip = zoom_clip.set_position('center')
-        
-        return zoom_clip
+        # Start at 1.0, end at 0.85 (zooms in 15% over duration). מלבני החיתוך
+        # מחושבים מראש וכל פריים הוא חיתוך ו-resize זול, במקום resize של כל התמונה
+        return KenBurnsZoom(
+            np.array(bg), frame_size, duration, fps=profile.fps,
+            zoom_start=1.0, zoom_end=0.85, cache_frames=self.cache_zoom_frames
+        )
     
-    def _create_product_image_clip(self, image_path: str, duration: float) -> ImageClip:
+    def _create_product_image_clip(self, image_path: str, duration: float) -> VideoClip:
         """יצירת קליפ תמונת מוצר עם אנימציה (legacy method)"""
         return self._create_product_image_clip_with_zoom(image_path, duration)
     
-    def _create_title_image(self, title: str) -> str:
-        """יצירת תמונת כותרת באמצעות PIL"""
+    def _create_title_image(self, title: str) -> np.ndarray:
+        """יצירת תמונת כותרת (מהמטמון אם כבר רונדרה)"""
+        key = ('title', title, self.video_size)
+        return overlay_cache.get(key, lambda: self._draw_title_image(title))
+    
+    def _draw_title_image(self, title: str) -> np.ndarray:
+        """ציור תמונת כותרת באמצעות PIL"""
         # פיצול טקסט לשורות
         max_chars_per_line = 25
         wrapped_title = '\n'.join(textwrap.wrap(title, width=max_chars_per_line))
@@ -552,13 +839,7 @@ class VideoGenerator:
         draw = ImageDraw.Draw(img)
         
         # טעינת פונט
-        try:
-            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 60)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 60)
-            except:
-                font = ImageFont.load_default()
+        font = get_font(60)
         
         # ציור טקסט עם outline
         lines = wrapped_title.split('\n')
@@ -571,29 +852,26 @@ class VideoGenerator:
             draw.text((50, y_offset), line, font=font, fill=(255, 255, 255, 255))
             y_offset += 70
         
-        # שמירה
-        temp_path = os.path.join(self.temp_dir, f"title_{hash(title)}.png")
-        img.save(temp_path)
-        return temp_path
+        return np.array(img)
     
     def _create_price_image(self, price: str, original_price: str, discount: str,
-                           rating: float = 0, reviews_count: int = 0) -> str:
-        """יצירת תמונת מחיר באמצעות PIL"""
+                           rating: float = 0, reviews_count: int = 0) -> np.ndarray:
+        """יצירת תמונת מחיר (מהמטמון אם כבר רונדרה)"""
+        key = ('price', price, original_price, discount, rating, reviews_count, self.video_size)
+        return overlay_cache.get(key, lambda: self._draw_price_image(
+            price, original_price, discount, rating, reviews_count
+        ))
+    
+    def _draw_price_image(self, price: str, original_price: str, discount: str,
+                          rating: float = 0, reviews_count: int = 0) -> np.ndarray:
+        """ציור תמונת מחיר באמצעות PIL"""
         # יצירת תמונה
         img = Image.new('RGBA', (self.video_size[0] - 100, 300), color=(0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         
         # טעינת פונט
-        try:
-            font_large = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 50)
-            font_small = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 40)
-        except:
-            try:
-                font_large = ImageFont.truetype("arial.ttf", 50)
-                font_small = ImageFont.truetype("arial.ttf", 40)
-            except:
-                font_large = ImageFont.load_default()
-                font_small = ImageFont.load_default()
+        font_large = get_font(50)
+        font_small = get_font(40)
         
         y_pos = 20
         
@@ -622,12 +900,9 @@ class VideoGenerator:
             # טקסט צהוב
             draw.text((50, y_pos), rating_text, font=font_small, fill=(255, 255, 0, 255))
         
-        # שמירה
-        temp_path = os.path.join(self.temp_dir, f"price_{hash(price)}.png")
-        img.save(temp_path)
-        return temp_path
+        return np.array(img)
     
-    def _create_sales_hook_text(self, product: Dict) -> Optional[str]:
+    def _create_sales_hook_text(self, product: Dict) -> Optional[np.ndarray]:
         """יצירת טקסט למשיכת תשומת לב"""
         hooks = [
             "🔥 HOT DEAL!",
@@ -643,17 +918,16 @@ class VideoGenerator:
         else:
             hook = hooks[2]
         
+        key = ('hook', hook, self.video_size)
+        return overlay_cache.get(key, lambda: self._draw_sales_hook(hook))
+    
+    def _draw_sales_hook(self, hook: str) -> np.ndarray:
+        """ציור תגית משיכת תשומת לב"""
         # Create image with hook text
         img = Image.new('RGBA', (self.video_size[0] - 200, 120), color=(0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         
-        try:
-            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 55)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 55)
-            except:
-                font = ImageFont.load_default()
+        font = get_font(55)
         
         # Red background with white text
         bbox = draw.textbbox((0, 0), hook, font=font)
@@ -674,24 +948,20 @@ class VideoGenerator:
             draw.text((100 + adj[0], 20 + adj[1]), hook, font=font, fill=(0, 0, 0, 255))
         draw.text((100, 20), hook, font=font, fill=(255, 255, 255, 255))
         
-        temp_path = os.path.join(self.temp_dir, f"hook_{abs(hash(hook))}.png")
-        img.save(temp_path)
-        return temp_path
+        return np.array(img)
     
-    def _create_urgency_text(self) -> Optional[str]:
+    def _create_urgency_text(self) -> Optional[np.ndarray]:
         """יצירת טקסט דחיפות"""
         urgency_text = "⏰ LIMITED TIME OFFER!"
-        
+        key = ('urgency', urgency_text, self.video_size)
+        return overlay_cache.get(key, lambda: self._draw_urgency_text(urgency_text))
+    
+    def _draw_urgency_text(self, urgency_text: str) -> np.ndarray:
+        """ציור תגית דחיפות"""
         img = Image.new('RGBA', (self.video_size[0] - 200, 100), color=(0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         
-        try:
-            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 45)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 45)
-            except:
-                font = ImageFont.load_default()
+        font = get_font(45)
         
         # Yellow/orange background
         bbox = draw.textbbox((0, 0), urgency_text, font=font)
@@ -711,24 +981,21 @@ class VideoGenerator:
             draw.text((100 + adj[0], 30 + adj[1]), urgency_text, font=font, fill=(0, 0, 0, 255))
         draw.text((100, 30), urgency_text, font=font, fill=(255, 255, 255, 255))
         
-        temp_path = os.path.join(self.temp_dir, f"urgency_{abs(hash(urgency_text))}.png")
-        img.save(temp_path)
-        return temp_path
+        return np.array(img)
+    
+    def _create_cta_image(self, text: str) -> np.ndarray:
+        """יצירת תמונת קריאה לפעולה (מהמטמון אם כבר רונדרה)"""
+        key = ('cta', text, self.video_size)
+        return overlay_cache.get(key, lambda: self._draw_cta_image(text))
     
-    def _create_cta_image(self, text: str) -> str:
-        """יצירת תמונת קריאה לפעולה באמצעות PIL"""
+    def _draw_cta_image(self, text: str) -> np.ndarray:
+        """ציור תמונת קריאה לפעולה באמצעות PIL"""
         # יצירת תמונה
         img = Image.new('RGBA', (self.video_size[0] - 100, 150), color=(0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         
         # טעינת פונט
-        try:
-            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 70)
-        except:
-            try:
-                font = ImageFont.truetype("arial.ttf", 70)
-            except:
-                font = ImageFont.load_default()
+        font = get_font(70)
         
         # Outline (לבן)
         for adj in [(-3,-3), (-3,3), (3,-3), (3,3)]:
@@ -737,8 +1004,5 @@ class VideoGenerator:
         # טקסט (אדום)
         draw.text((50, 40), text, font=font, fill=(255, 0, 0, 255))
         
-        # שמירה
-        temp_path = os.path.join(self.temp_dir, f"cta_{hash(text)}.png")
-        img.save(temp_path)
-        return temp_path
+        return np.array(img)
     
@@ -0,0 +1,162 @@
+"""
+קליטת סרטון מוצר ב-streaming: ffmpeg מוריד רק את השניות הדרושות, חותך, משנה גודל ומלופף
+Streaming product-video ingest - ffmpeg trims, scales, crops and loops in one native pass
+"""
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from moviepy.config import get_setting
+from moviepy.editor import VideoClip
+
+
+# כותרות HTTP כמו בהורדה הרגילה (CDN של אמזון דורש Referer)
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'video/webm,video/ogg,video/*;q=0.9,*/*;q=0.8',
+    'Referer': 'https://www.amazon.com/',
+}
+
+# זמן המתנה מקסימלי לקריאה מהרשת (שניות)
+NETWORK_TIMEOUT = int(os.getenv('VIDEO_INGEST_TIMEOUT', '30'))
+
+
+def _is_remote(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+def _input_args(source: str, headers: Optional[Dict[str, str]] = None, loop: bool = False) -> list:
+    """ארגומנטי הקלט של ffmpeg (כותרות ו-timeout לכתובת רשת, לופ אינסופי לסרטון קצר)"""
+    args = []
+    if _is_remote(source):
+        headers = dict(headers or DEFAULT_HEADERS)
+        user_agent = headers.pop('User-Agent', None)
+        if user_agent:
+            args += ['-user_agent', user_agent]
+        if headers:
+            args += ['-headers', ''.join(f'{key}: {value}\r\n' for key, value in headers.items())]
+        args += ['-rw_timeout', str(NETWORK_TIMEOUT * 1000000)]
+    if loop:
+        args += ['-stream_loop', '-1']
+    return args + ['-i', source]
+
+
+def fit_filter(size: Tuple[int, int], fps: int) -> str:
+    """התאמה לפריים: גובה מלא, חיתוך הרוחב אם רחב מדי, ומירכוז על שחור אם צר מדי"""
+    width, height = size
+    return (
+        f"scale=-2:{height},"
+        f"crop=w='min(iw\\,{width})':h={height},"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:color=black,"
+        f"fps={fps},format=rgb24"
+    )
+
+
+def fetch_head(source: str, output_path: str, duration: float,
+               headers: Optional[Dict[str, str]] = None) -> str:
+    """שמירת N השניות הראשונות בלבד (העתקת stream, בלי פענוח) - וידאו ופס הקול אם יש,
+    כדי שהפלט יוכל למקסס את הקול מהקובץ המקומי"""
+    cmd = [get_setting('FFMPEG_BINARY'), '-y', '-loglevel', 'error']
+    cmd += _input_args(source, headers)
+    cmd += ['-t', str(duration), '-map', '0:v:0', '-map', '0:a:0?', '-c', 'copy', output_path]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            timeout=NETWORK_TIMEOUT * 4)
+    if result.returncode != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        raise RuntimeError(f"ffmpeg could not fetch video: {result.stderr.decode(errors='replace').strip()}")
+    return output_path
+
+
+class StreamedVideoSource:
+    """סרטון מקור שמפוענח ע"י ffmpeg ישירות בגודל הפלט ונקרא פריים אחר פריים מ-pipe.
+    ffmpeg עוצר אחרי duration שניות, ומלופף מקור קצר יותר - אין הורדה מלאה ואין concat ב-moviepy"""
+    
+    def __init__(self, source: str, size: Tuple[int, int], duration: float, fps: int,
+                 headers: Optional[Dict[str, str]] = None):
+        self.source = source
+        self.size = (int(size[0]), int(size[1]))
+        self.duration = duration
+        self.fps = fps
+        self.headers = headers
+        self.n_frames = max(1, int(round(duration * fps)))
+        self._frame_bytes = self.size[0] * self.size[1] * 3
+        self._frame = np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+        self._proc = None
+        self._pos = -1  # אינדקס הפריים שנמצא כרגע ב-_frame
+        
+        # פתיחה וקריאת הפריים הראשון - מקור לא תקין נכשל כאן ולא באמצע הרינדור
+        self._start()
+        if not self._read_next():
+            error = self._stderr()
+            self.close()
+            raise RuntimeError(f"ffmpeg could not read video: {error or 'no frames'}")
+    
+    def _start(self):
+        self.close()
+        cmd = [get_setting('FFMPEG_BINARY'), '-loglevel', 'error', '-nostdin']
+        cmd += _input_args(self.source, self.headers, loop=True)
+        # פריימים בלבד - פס הקול נכנס בקידוד הפלט (audio_source של FFmpegPipeEncoder)
+        cmd += [
+            '-t', str(self.duration), '-an',
+            '-vf', fit_filter(self.size, self.fps),
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-',
+        ]
+        self._proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                      bufsize=self._frame_bytes)
+        self._pos = -1
+    
+    def _read_next(self) -> bool:
+        """קריאת הפריים הבא לתוך המאגר (False בסוף ה-stream - הפריים האחרון נשמר)"""
+        view = memoryview(self._frame).cast('B')
+        read = 0
+        while read < self._frame_bytes:
+            n = self._proc.stdout.readinto(view[read:])
+            if not n:
+                return False
+            read += n
+        self._pos += 1
+        return True
+    
+    def _stderr(self) -> str:
+        try:
+            self._proc.wait(timeout=5)
+            return self._proc.stderr.read().decode(errors='replace').strip()
+        except Exception:
+            return ''
+    
+    def frame_index(self, t: float) -> int:
+        return min(max(int(round(t * self.fps)), 0), self.n_frames - 1)
+    
+    def _seek(self, index: int):
+        """התקדמות לפריים index (קריאה סדרתית; חזרה אחורה מפעילה את ffmpeg מחדש)"""
+        if index < self._pos:
+            self._start()
+        while self._pos < index:
+            if not self._read_next():
+                break  # המקור נגמר מוקדם - נשארים על הפריים האחרון
+    
+    def render_into(self, t: float, dst: np.ndarray):
+        """כתיבת הפריים של זמן t לתוך dst (למרכיב התבנית)"""
+        self._seek(self.frame_index(t))
+        np.copyto(dst, self._frame)
+    
+    def get_frame(self, t: float) -> np.ndarray:
+        """עותק של הפריים בזמן t (נקרא ע"י moviepy)"""
+        self._seek(self.frame_index(t))
+        return self._frame.copy()
+    
+    def make_clip(self) -> VideoClip:
+        """קליפ moviepy בגודל הפלט (לנתיב הגיבוי)"""
+        return VideoClip(self.get_frame, duration=self.duration).set_fps(self.fps)
+    
+    def close(self):
+        """עצירת תהליך ffmpeg"""
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._proc.stdout.close()
+        self._proc.stderr.close()
+        self._proc = None
@@ -0,0 +1,337 @@
+"""
+ניהול עבודות יצירת סרטונים - תצוגה מקדימה מהירה ואז רינדור מלא ברקע
+Video job manager - quick preview first, full render queued in the background
+"""
+# -*- coding: utf-8 -*-
+import os
+import copy
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from render_profiles import PREVIEW_PROFILE, DEFAULT_FORMAT
+from template_compositor import RenderMonitor
+from video_batch import VideoBatch
+import metrics
+import tracing
+
+
+# מצבים סופיים של עבודה
+FINISHED_STATES = ('completed', 'failed', 'cancelled')
+
+
+class ProgressTracker:
+    """התקדמות של תוצר אחד: שלב נוכחי, כמה הושלם, אחוז ו-ETA לפי קצב מתגלגל"""
+    
+    def __init__(self, window: float = 5.0):
+        self.window = window  # שניות אחרונות שמהן מחושב הקצב
+        self._samples = deque()
+        self._phase = None
+    
+    def update(self, phase: str, done: int, total: int) -> Dict:
+        now = time.time()
+        if phase != self._phase:
+            self._phase = phase
+            self._samples.clear()
+        
+        self._samples.append((now, done))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+        
+        eta = None
+        first_time, first_done = self._samples[0]
+        if total and done > first_done and now > first_time:
+            rate = (done - first_done) / (now - first_time)
+            eta = round((total - done) / rate, 1)
+        
+        return {
+            'phase': phase,
+            'done': done,
+            'total': total,
+            'percent': round(100.0 * done / total, 1) if total else None,
+            'eta_seconds': eta,
+        }
+
+
+class VideoJobManager:
+    """מחלקה לניהול עבודות רינדור: מצב לכל עבודה, תור תצוגות מקדימות ותור רינדור מלא"""
+    
+    def __init__(self, video_generator, preview_workers: Optional[int] = None,
+                 render_workers: Optional[int] = None):
+        self.video_generator = video_generator
+        self.jobs: Dict[str, Dict] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        # מונה שינויים - מאפשר למאזינים (SSE) לחכות לשינוי במקום לתשאל
+        self._changed = threading.Condition(self._lock)
+        self._version = 0
+        
+        # תצוגות מקדימות לא ממתינות מאחורי רינדורים מלאים
+        preview_workers = preview_workers or int(os.getenv('VIDEO_PREVIEW_WORKERS', '2'))
+        render_workers = render_workers or int(os.getenv('VIDEO_RENDER_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+        self._preview_pool = ThreadPoolExecutor(max_workers=preview_workers, thread_name_prefix='video-preview')
+        self._render_pool = ThreadPoolExecutor(max_workers=render_workers, thread_name_prefix='video-render')
+        # עבודות שממתינות / רצות בכל תור (ל-/metrics)
+        self._depth = {'preview': {'queued': 0, 'running': 0}, 'render': {'queued': 0, 'running': 0}}
+        metrics.gauge('render_queue_depth', 'Jobs waiting in each render queue', ['queue'],
+                      function=lambda: self._depth_counts('queued'))
+        metrics.gauge('render_jobs_running', 'Jobs currently rendering in each queue', ['queue'],
+                      function=lambda: self._depth_counts('running'))
+    
+    def submit(self, job_id: str, product: Dict, profile: str, preview: bool = True,
+               formats: Optional[List[str]] = None) -> Dict:
+        """פתיחת עבודה: תצוגה מקדימה (אם ביקשו) ואחריה רינדור מלא בתור"""
+        formats = formats or [DEFAULT_FORMAT]
+        with_preview = preview and profile != PREVIEW_PROFILE
+        job = {
+            'status': 'processing',
+            'message': 'Video generation started...',
+            'profile': profile,
+            'formats': formats,
+            'created_at': time.time(),
+            'preview': {'status': 'queued' if with_preview else 'skipped', 'profile': PREVIEW_PROFILE},
+            'final': {'status': 'queued', 'profile': profile},
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+            self._cancel_events[job_id] = threading.Event()
+            self._notify()
+        
+        if with_preview:
+            self._enqueue('preview', self._run_preview, job_id, product, profile, formats)
+        else:
+            self._enqueue('render', self._run_render, job_id, product, profile, formats)
+        return self.get(job_id)
+    
+    def submit_batch(self, batch_id: str, items: List[Dict], profile: str,
+                     formats: Optional[List[str]] = None, fetch_product=None) -> Dict:
+        """פתיחת עבודת אצווה: כל הפריטים מרונדרים ברצף בעבודה אחת בתור הרינדור המלא
+        (בלי תצוגות מקדימות), עם התקדמות מצטברת ומניפסט"""
+        batch = VideoBatch(self.video_generator, items, batch_id=batch_id, profile=profile,
+                           formats=formats, fetch_product=fetch_product)
+        manifest = batch.snapshot()
+        job = {
+            'type': 'batch',
+            'status': 'processing',
+            'message': f"Batch of {manifest['total']} products queued...",
+            'profile': batch.profile,
+            'formats': batch.formats,
+            'created_at': time.time(),
+            'total': manifest['total'],
+            'completed': 0,
+            'failed': 0,
+            'current': None,
+            'items': manifest['items'],
+            'manifest': os.path.basename(batch.manifest_path),
+        }
+        with self._lock:
+            self.jobs[batch_id] = job
+            self._cancel_events[batch_id] = threading.Event()
+            self._notify()
+        
+        self._enqueue('render', self._run_batch, batch_id, batch)
+        return self.get(batch_id)
+    
+    def _enqueue(self, queue: str, func, *args):
+        """הגשה לתור (preview / render) עם ספירת עבודות ממתינות ורצות.
+        העבודה נכתבת כ-trace משלה עם ה-trace_id של הבקשה שהגישה אותה"""
+        with self._lock:
+            self._depth[queue]['queued'] += 1
+        trace_id = tracing.current_trace_id()
+        queued_at = time.perf_counter()
+        
+        def run():
+            with self._lock:
+                self._depth[queue]['queued'] -= 1
+                self._depth[queue]['running'] += 1
+            try:
+                with tracing.trace(func.__name__.lstrip('_'), trace_id, queue=queue, job_id=args[0],
+                                   queued_ms=round((time.perf_counter() - queued_at) * 1000, 1)):
+                    func(*args)
+            finally:
+                with self._lock:
+                    self._depth[queue]['running'] -= 1
+        
+        (self._preview_pool if queue == 'preview' else self._render_pool).submit(run)
+    
+    def _depth_counts(self, state: str) -> Dict[tuple, int]:
+        with self._lock:
+            return {(queue,): counts[state] for queue, counts in self._depth.items()}
+    
+    def get(self, job_id: str) -> Optional[Dict]:
+        """עותק של מצב העבודה (בטוח לסריאליזציה ל-JSON)"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+    
+    @property
+    def version(self) -> int:
+        """מונה השינויים הנוכחי"""
+        with self._lock:
+            return self._version
+    
+    def wait_for_change(self, since: int, timeout: Optional[float] = None) -> int:
+        """המתנה עד שמצב של עבודה כלשהי משתנה אחרי הגרסה since (או timeout); מחזיר את הגרסה הנוכחית"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != since, timeout)
+            return self._version
+    
+    def _notify(self):
+        """נקרא כשהמנעול מוחזק"""
+        self._version += 1
+        self._changed.notify_all()
+    
+    def list_active(self) -> Dict[str, Dict]:
+        """כל העבודות שעדיין לא הסתיימו"""
+        with self._lock:
+            return {
+                job_id: copy.deepcopy(job) for job_id, job in self.jobs.items()
+                if job['status'] not in FINISHED_STATES
+            }
+    
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """ביטול עבודה: תוצרים בתור מבוטלים מיד, ורינדור שרץ נעצר בפריים הבא
+        (המקודד נהרג והקובץ החלקי נמחק). None אם העבודה לא קיימת"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] in FINISHED_STATES:
+                return copy.deepcopy(job)
+            
+            self._cancel_events[job_id].set()
+            if job.get('type') == 'batch':
+                # האצווה נעצרת בפריים הבא של הפריט הנוכחי (או לפני שהתחילה)
+                job['message'] = 'Cancelling...'
+                self._notify()
+                return copy.deepcopy(job)
+            
+            running = False
+            for artifact in ('preview', 'final'):
+                if job[artifact]['status'] == 'queued':
+                    job[artifact]['status'] = 'cancelled'
+                elif job[artifact]['status'] == 'processing':
+                    running = True
+            if running:
+                job['message'] = 'Cancelling...'
+            else:
+                job.update(status='cancelled', message='Video generation cancelled')
+            self._notify()
+            return copy.deepcopy(job)
+    
+    def _update(self, job_id: str, artifact: Optional[str] = None, **fields):
+        """עדכון שדות של העבודה או של אחד התוצרים שלה (preview / final)"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            target = job[artifact] if artifact else job
+            target.update(fields)
+            self._notify()
+    
+    def _monitor(self, job_id: str, artifact: str) -> RenderMonitor:
+        """RenderMonitor שמעדכן את ההתקדמות של התוצר ובודק את דגל הביטול של העבודה"""
+        tracker = ProgressTracker()
+        
+        def on_progress(phase: str, done: int, total: int):
+            self._update(job_id, artifact, progress=tracker.update(phase, done, total))
+        
+        return RenderMonitor(on_progress=on_progress, cancel_event=self._cancel_events[job_id])
+    
+    def _start_artifact(self, job_id: str, artifact: str) -> bool:
+        """סימון תוצר כרץ; False אם העבודה בוטלה בזמן שחיכתה בתור"""
+        with self._lock:
+            if self._cancel_events[job_id].is_set():
+                return False
+            self.jobs[job_id][artifact]['status'] = 'processing'
+            self._notify()
+            return True
+    
+    def _mark_cancelled(self, job_id: str, artifact: str):
+        self._update(job_id, artifact, status='cancelled')
+        self._update(job_id, status='cancelled', message='Video generation cancelled')
+    
+    def _run_preview(self, job_id: str, product: Dict, profile: str, formats: List[str]):
+        """רינדור תצוגה מקדימה ואז הכנסת הרינדור המלא לתור"""
+        if not self._start_artifact(job_id, 'preview'):
+            return
+        try:
+            video_path = self.video_generator.create_product_video(
+                product, profile=PREVIEW_PROFILE, monitor=self._monitor(job_id, 'preview')
+            )
+            if video_path:
+                self._update(job_id, 'preview', status='completed', filename=os.path.basename(video_path))
+                self._update(job_id, message='Preview ready, rendering full quality...')
+            elif self._cancel_events[job_id].is_set():
+                self._update(job_id, 'preview', status='cancelled')
+            else:
+                self._update(job_id, 'preview', status='failed')
+        except Exception as e:
+            self._update(job_id, 'preview', status='failed', message=f'Error: {str(e)}')
+        finally:
+            if self._cancel_events[job_id].is_set():
+                # הרינדור המלא כבר סומן כמבוטל ב-cancel
+                self._update(job_id, status='cancelled', message='Video generation cancelled')
+            else:
+                self._enqueue('render', self._run_render, job_id, product, profile, formats)
+    
+    def _run_render(self, job_id: str, product: Dict, profile: str, formats: List[str]):
+        """הרינדור המלא לפי הפרופיל שנבחר, בכל הפורמטים במעבר אחד"""
+        if not self._start_artifact(job_id, 'final'):
+            return
+        try:
+            videos = self.video_generator.create_product_videos(
+                product, formats=formats, profile=profile, monitor=self._monitor(job_id, 'final')
+            )
+            if videos:
+                files = {output_format: os.path.basename(path) for output_format, path in videos.items()}
+                video_path = videos[formats[0]]
+                filename = files[formats[0]]
+                self._update(job_id, 'final', status='completed', filename=filename, files=files)
+                self._update(job_id, status='completed', message='Video generated successfully',
+                             filename=filename, path=video_path)
+            elif self._cancel_events[job_id].is_set():
+                self._mark_cancelled(job_id, 'final')
+            else:
+                self._update(job_id, 'final', status='failed')
+                self._update(job_id, status='failed', message='Video generation failed')
+        except Exception as e:
+            self._update(job_id, 'final', status='failed')
+            self._update(job_id, status='failed', message=f'Error: {str(e)}')
+    
+    def _run_batch(self, batch_id: str, batch: VideoBatch):
+        """הרצת אצווה: התקדמות מצטברת לכל האצווה, וסטטוס הפריטים מתעדכן אחרי כל פריט"""
+        if self._cancel_events[batch_id].is_set():
+            batch.run(monitor=RenderMonitor(cancel_event=self._cancel_events[batch_id]))
+            self._update(batch_id, status='cancelled', message='Batch cancelled', items=batch.snapshot()['items'])
+            return
+        
+        # ETA לפי קצב הפריטים - חלון ארוך יותר מרינדור בודד
+        tracker = ProgressTracker(window=60.0)
+        
+        def on_progress(phase: str, done: float, total: float):
+            index = min(int(done), total - 1) if total else 0
+            self._update(batch_id, progress=tracker.update(phase, round(done, 2), total),
+                         current=batch.manifest['items'][index]['asin'] if total else None)
+        
+        def on_item(manifest: Dict):
+            self._update(batch_id, items=manifest['items'], completed=manifest['completed'],
+                         failed=manifest['failed'],
+                         message=f"Rendered {manifest['completed'] + manifest['failed']} of {manifest['total']} products...")
+        
+        try:
+            manifest = batch.run(
+                monitor=RenderMonitor(on_progress=on_progress, cancel_event=self._cancel_events[batch_id]),
+                on_item=on_item
+            )
+            messages = {
+                'completed': f"Batch finished: {manifest['completed']} completed, {manifest['failed']} failed",
+                'failed': 'Batch failed: no videos were generated',
+                'cancelled': 'Batch cancelled',
+            }
+            self._update(batch_id, status=manifest['status'], message=messages[manifest['status']],
+                         items=manifest['items'], current=None)
+        except Exception as e:
+            self._update(batch_id, status='failed', message=f'Error: {str(e)}', current=None)
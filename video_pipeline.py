@@ -0,0 +1,190 @@
+"""
+צינור יצירת סרטונים מקבילי: משיכת מוצרים ‖ הורדת נכסים ‖ רינדור
+Staged video pipeline - fetch, asset download and render overlap through bounded queues
+"""
+# -*- coding: utf-8 -*-
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from metrics import percentile
+
+
+# מספר threads לכל שלב וגודל התורים ביניהם (מוצרים שמחכים)
+DOWNLOAD_WORKERS = int(os.getenv('PIPELINE_DOWNLOAD_WORKERS', '3'))
+RENDER_WORKERS = int(os.getenv('PIPELINE_RENDER_WORKERS', '1'))
+QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '2'))
+
+_DONE = object()  # סימן סוף לתור
+
+
+class VideoPipeline:
+    """שלושה שלבים עם תורים חסומים ביניהם: בזמן שמוצר אחד מקודד, התמונות של הבאים כבר יורדות.
+    התור אחרי ההורדה חסום (QUEUE_SIZE), כך שתמונות מפוענחות לא מצטברות בזיכרון כשהרינדור איטי"""
+    
+    def __init__(self, video_generator, profile: Optional[str] = None, formats=None,
+                 download_workers: Optional[int] = None, render_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, checkpoint=None):
+        """checkpoint: RunCheckpoint - מוצרים שכבר הושלמו מדולגים, וכל שינוי סטטוס נשמר"""
+        self.video_generator = video_generator
+        self.checkpoint = checkpoint
+        self.profile = profile
+        self.formats = formats
+        self.download_workers = max(1, download_workers or DOWNLOAD_WORKERS)
+        self.render_workers = max(1, render_workers or RENDER_WORKERS)
+        self.queue_size = max(1, queue_size or QUEUE_SIZE)
+        self.results: List[Dict] = []
+        self._lock = threading.Lock()
+    
+    def run(self, products: Iterable[Dict]) -> List[Dict]:
+        """הרצת הצינור על המוצרים (iterable - גם generator שמושך אותם בהדרגה).
+        מחזיר רשומה לכל מוצר: מוצר, סרטונים, שגיאה וזמני כל שלב"""
+        self.results = []
+        self.started = time.time()
+        to_download = queue.Queue(maxsize=self.queue_size)
+        to_render = queue.Queue(maxsize=self.queue_size)
+        
+        downloaders = [
+            threading.Thread(target=self._download_stage, args=(to_download, to_render),
+                             name=f'pipeline-download-{i}', daemon=True)
+            for i in range(self.download_workers)
+        ]
+        renderers = [
+            threading.Thread(target=self._render_stage, args=(to_render,),
+                             name=f'pipeline-render-{i}', daemon=True)
+            for i in range(self.render_workers)
+        ]
+        for thread in downloaders + renderers:
+            thread.start()
+        
+        # שלב המשיכה רץ ב-thread הראשי
+        try:
+            for index, product in enumerate(products):
+                record = {'index': index, 'product': product, 'videos': {}, 'error': None,
+                          'fetched_at': time.time()}
+                if self.checkpoint is not None:
+                    videos = self.checkpoint.completed_videos(product)
+                    if videos:
+                        print(f"[SKIP] Already rendered: {product.get('title', 'Unknown')}")
+                        record.update(videos=videos, skipped=True)
+                        with self._lock:
+                            self.results.append(record)
+                        continue
+                    self.checkpoint.mark(product, 'pending')
+                to_download.put(record)
+        except Exception as e:
+            print(f"[X] Error fetching products: {e}")
+        finally:
+            for _ in downloaders:
+                to_download.put(_DONE)
+            for thread in downloaders:
+                thread.join()
+            for _ in renderers:
+                to_render.put(_DONE)
+            for thread in renderers:
+                thread.join()
+        
+        self.finished = time.time()
+        self.results.sort(key=lambda record: record['index'])
+        return self.results
+    
+    def _download_stage(self, inbox: queue.Queue, outbox: queue.Queue):
+        while True:
+            record = inbox.get()
+            if record is _DONE:
+                return
+            record['download_started'] = time.time()
+            try:
+                record['assets'] = self.video_generator.download_assets(record['product'])
+            except Exception as e:
+                record['assets'] = None
+                record['error'] = f'Download failed: {e}'
+            record['downloaded_at'] = time.time()
+            outbox.put(record)  # נחסם כשהרינדור מפגר
+    
+    def _render_stage(self, inbox: queue.Queue):
+        while True:
+            record = inbox.get()
+            if record is _DONE:
+                return
+            record['render_started'] = time.time()
+            assets = record.pop('assets', None)
+            try:
+                if assets is not None:
+                    if self.checkpoint is not None:
+                        self.checkpoint.mark(record['product'], 'processing')
+                    print(f"\n[VIDEO] [{record['index'] + 1}] Rendering: {record['product'].get('title', 'Unknown')}")
+                    record['videos'] = self.video_generator.create_product_videos(
+                        record['product'], formats=self.formats, profile=self.profile, assets=assets
+                    )
+                    if not record['videos']:
+                        record['error'] = 'Video generation failed'
+            except Exception as e:
+                # ה-thread חייב להמשיך לרוקן את התור, אחרת שלב ההורדה נתקע
+                record['error'] = f'Render failed: {e}'
+            finally:
+                self.video_generator.release_assets(assets)
+                record['finished_at'] = time.time()
+                if self.checkpoint is not None:
+                    if record['videos']:
+                        self.checkpoint.mark(record['product'], 'completed', videos=record['videos'])
+                    else:
+                        self.checkpoint.mark(record['product'], 'failed', error=record['error'])
+                with self._lock:
+                    self.results.append(record)
+    
+    def summary(self) -> Dict:
+        """תפוקה וזמני השהיה: זמן כולל לכל מוצר (משיכה עד סרטון), זמן בכל שלב והמתנה בתורים"""
+        wall = max(self.finished - self.started, 1e-9)
+        # מוצרים שדולגו (checkpoint) לא נכנסים לזמנים
+        processed = [record for record in self.results if not record.get('skipped')]
+        done = [record for record in processed if record['videos']]
+        latency = [record['finished_at'] - record['fetched_at'] for record in processed]
+        download = [record['downloaded_at'] - record['download_started'] for record in processed]
+        render = [record['finished_at'] - record['render_started'] for record in processed]
+        waiting = [
+            (record['download_started'] - record['fetched_at']) + (record['render_started'] - record['downloaded_at'])
+            for record in processed
+        ]
+        
+        def stats(values: List[float]) -> Dict:
+            return {
+                'avg': round(sum(values) / len(values), 2) if values else None,
+                'p50': round(percentile(values, 50), 2) if values else None,
+                'p95': round(percentile(values, 95), 2) if values else None,
+                'max': round(max(values), 2) if values else None,
+            }
+        
+        return {
+            'products': len(self.results),
+            'videos': len(done),
+            'skipped': len(self.results) - len(processed),
+            'failed': len(processed) - len(done),
+            'wall_seconds': round(wall, 2),
+            'videos_per_minute': round(60.0 * len(done) / wall, 2),
+            'latency': stats(latency),
+            'download': stats(download),
+            'render': stats(render),
+            'queue_wait': stats(waiting),
+            # סכום זמני השלבים מול הזמן בפועל - מעל 1 אומר שהשלבים חופפים
+            'overlap': round((sum(download) + sum(render)) / wall, 2),
+            'workers': {'download': self.download_workers, 'render': self.render_workers,
+                        'queue_size': self.queue_size},
+        }
+    
+    def print_summary(self):
+        summary = self.summary()
+        print(f"[PIPELINE] {summary['videos']}/{summary['products']} videos in {summary['wall_seconds']}s "
+              f"({summary['videos_per_minute']} videos/min, overlap x{summary['overlap']}, "
+              f"workers: {summary['workers']['download']} download / {summary['workers']['render']} render)")
+        if summary['skipped']:
+            print(f"  {summary['skipped']} already rendered (skipped), {summary['failed']} failed")
+        for stage in ('latency', 'download', 'render', 'queue_wait'):
+            values = summary[stage]
+            if values['avg'] is None:
+                continue
+            print(f"  {stage:<11} avg {values['avg']:>6}s   p50 {values['p50']:>6}s   "
+                  f"p95 {values['p95']:>6}s   max {values['max']:>6}s")
+        return summary
@@ -0,0 +1,94 @@
+"""
+פוסטר JPEG ותצוגה מונפשת (WebP) לכל סרטון - רשתות בממשק מציגות אותם בלי לטעון את ה-MP4
+Poster frame and animated WebP preview generated next to each rendered video
+"""
+# -*- coding: utf-8 -*-
+import os
+import sys
+import subprocess
+from typing import Dict, Optional
+
+from moviepy.config import get_setting
+
+from log_config import get_logger
+
+
+log = get_logger('video.previews')
+
+
+POSTER_TIME = float(os.getenv('POSTER_TIME', '5.0'))  # שנייה 5: המחיר על המסך
+POSTER_WIDTH = int(os.getenv('POSTER_WIDTH', '480'))
+PREVIEW_WIDTH = int(os.getenv('PREVIEW_WIDTH', '240'))
+PREVIEW_FPS = int(os.getenv('PREVIEW_FPS', '8'))
+PREVIEW_QUALITY = int(os.getenv('PREVIEW_QUALITY', '50'))  # 0-100 (libwebp)
+
+
+def poster_path(video_path: str) -> str:
+    return os.path.splitext(video_path)[0] + '.jpg'
+
+
+def preview_path(video_path: str) -> str:
+    return os.path.splitext(video_path)[0] + '.webp'
+
+
+def _run_ffmpeg(args: list, output_path: str, output_format: str):
+    """הרצה לקובץ זמני והחלפה - רשימת הסרטונים לא רואה קובץ חצי כתוב"""
+    temp_path = output_path + '.tmp'
+    cmd = [get_setting('FFMPEG_BINARY'), '-y', '-loglevel', 'error', '-nostdin'] + args + ['-f', output_format, temp_path]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=120)
+    if result.returncode != 0 or not os.path.exists(temp_path):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise RuntimeError(result.stderr.decode(errors='replace').strip() or 'ffmpeg failed')
+    os.replace(temp_path, output_path)
+
+
+def create_poster(video_path: str, at: Optional[float] = None, width: Optional[int] = None) -> str:
+    """פריים אחד כ-JPEG (seek לפני הקלט - מפענח רק מה-keyframe הקרוב)"""
+    output_path = poster_path(video_path)
+    _run_ffmpeg([
+        '-ss', str(POSTER_TIME if at is None else at), '-i', video_path,
+        '-frames:v', '1', '-vf', f'scale={width or POSTER_WIDTH}:-2', '-q:v', '4',
+    ], output_path, 'image2')
+    return output_path
+
+
+def create_animated_preview(video_path: str, width: Optional[int] = None, fps: Optional[int] = None) -> str:
+    """WebP מונפש קטן של כל הסרטון (ברזולוציה ו-fps נמוכים, בלופ)"""
+    output_path = preview_path(video_path)
+    _run_ffmpeg([
+        '-i', video_path, '-an',
+        '-vf', f'fps={fps or PREVIEW_FPS},scale={width or PREVIEW_WIDTH}:-2',
+        '-c:v', 'libwebp', '-lossless', '0', '-quality', str(PREVIEW_QUALITY),
+        '-compression_level', '4', '-loop', '0',
+    ], output_path, 'webp')
+    return output_path
+
+
+def create_previews(video_path: str) -> Dict[str, str]:
+    """פוסטר ותצוגה מונפשת לסרטון; כישלון לא מכשיל את הרינדור - מחזיר רק מה שנוצר"""
+    previews = {}
+    for name, create in (('poster', create_poster), ('preview', create_animated_preview)):
+        try:
+            previews[name] = create(video_path)
+        except Exception as e:
+            log.warning("Could not create %s for %s: %s", name, os.path.basename(video_path), e)
+    return previews
+
+
+def preview_files(video_path: str) -> Dict[str, str]:
+    """שמות הקבצים (ליד הסרטון) של הפוסטר והתצוגה המונפשת, אם קיימים"""
+    files = {}
+    for name, path in (('poster', poster_path(video_path)), ('preview', preview_path(video_path))):
+        if os.path.exists(path):
+            files[name] = os.path.basename(path)
+    return files
+
+
+if __name__ == '__main__':
+    # השלמה לסרטונים קיימים: python video_previews.py [output_videos]
+    videos_dir = sys.argv[1] if len(sys.argv) > 1 else 'output_videos'
+    for filename in sorted(os.listdir(videos_dir)):
+        path = os.path.join(videos_dir, filename)
+        if filename.endswith('.mp4') and len(preview_files(path)) < 2:
+            print(f"[VIDEO] {filename}: {', '.join(create_previews(path)) or 'failed'}")
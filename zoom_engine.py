@@ -0,0 +1,100 @@
+"""
+מנוע זום (Ken Burns) מחושב מראש
+Precomputed Ken Burns zoom engine
+"""
+# -*- coding: utf-8 -*-
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from moviepy.editor import VideoClip
+
+
+class KenBurnsZoom:
+    """זום הדרגתי על תמונה: מלבני החיתוך לכל הפריימים מחושבים מראש,
+    וכל פריים הוא חיתוך (view, בלי העתקה) ו-cv2.resize אחד לגודל הפלט"""
+    
+    def __init__(self, image: np.ndarray, frame_size: Tuple[int, int], duration: float,
+                 fps: int = 30, zoom_start: float = 1.0, zoom_end: float = 0.85,
+                 cache_frames: bool = False):
+        """
+        image: תמונת RGB (גובה x רוחב x 3), בדרך כלל גדולה מהפריים
+        frame_size: (רוחב, גובה) של הפלט
+        zoom_start / zoom_end: קנה מידה של התמונה בתחילת ובסוף הקליפ
+        cache_frames: שמירת הפריימים המוכנים בזיכרון (כ-6MB לפריים ב-1080x1920)
+        """
+        self.image = np.ascontiguousarray(image[:, :, :3])
+        self.frame_size = (int(frame_size[0]), int(frame_size[1]))
+        self.duration = duration
+        self.fps = fps
+        self.zoom_start = zoom_start
+        self.zoom_end = zoom_end
+        self.cache_frames = cache_frames
+        self.n_frames = max(1, int(round(duration * fps)))
+        self._cache: Dict[int, np.ndarray] = {}
+        
+        self.crop_rects = self._compute_crop_rects()
+    
+    def _compute_crop_rects(self) -> List[Tuple[int, int, int, int]]:
+        """מלבן המקור (x0, y0, x1, y1) שנראה בכל פריים, בפיקסלים שלמים"""
+        src_h, src_w = self.image.shape[:2]
+        out_w, out_h = self.frame_size
+        cx, cy = src_w / 2.0, src_h / 2.0
+        
+        rects = []
+        for i in range(self.n_frames):
+            t = i / self.fps
+            progress = min(t / self.duration, 1.0) if self.duration > 0 else 0.0
+            scale = self.zoom_start + (self.zoom_end - self.zoom_start) * progress
+            # תמונה בקנה מידה scale ממורכזת בפריים => חיתוך ממורכז של out/scale מהמקור
+            # (כמו ב-resize של moviepy, העיגול לפיקסל שלם הוא ברמת תת-פיקסל בפלט)
+            half_w = out_w / scale / 2.0
+            half_h = out_h / scale / 2.0
+            x0 = min(max(int(round(cx - half_w)), 0), src_w - 1)
+            y0 = min(max(int(round(cy - half_h)), 0), src_h - 1)
+            x1 = max(min(int(round(cx + half_w)), src_w), x0 + 1)
+            y1 = max(min(int(round(cy + half_h)), src_h), y0 + 1)
+            rects.append((x0, y0, x1, y1))
+        return rects
+    
+    def frame_index(self, t: float) -> int:
+        """אינדקס הפריים המחושב מראש עבור זמן t"""
+        return min(max(int(round(t * self.fps)), 0), self.n_frames - 1)
+    
+    def render_frame(self, index: int, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """הפקת פריים לפי אינדקס (אפשר לכתוב לתוך מאגר קיים)"""
+        if index in self._cache:
+            frame = self._cache[index]
+            if dst is not None:
+                np.copyto(dst, frame)
+                return dst
+            return frame
+        
+        x0, y0, x1, y1 = self.crop_rects[index]
+        frame = cv2.resize(
+            self.image[y0:y1, x0:x1], self.frame_size, dst=dst,
+            interpolation=cv2.INTER_LINEAR
+        )
+        if self.cache_frames:
+            cached = frame if dst is None else frame.copy()
+            cached.setflags(write=False)
+            self._cache[index] = cached
+        return frame
+    
+    def get_frame(self, t: float) -> np.ndarray:
+        """פריים עבור זמן t (נקרא ע"י moviepy)"""
+        return self.render_frame(self.frame_index(t))
+    
+    def precompute(self):
+        """רינדור כל רצף הפריימים מראש לתוך המטמון"""
+        self.cache_frames = True
+        for i in range(self.n_frames):
+            self.render_frame(i)
+    
+    def clear_cache(self):
+        """שחרור הפריימים השמורים"""
+        self._cache.clear()
+    
+    def make_clip(self) -> VideoClip:
+        """קליפ moviepy בגודל הפריים המלא"""
+        return VideoClip(self.get_frame, duration=self.duration).set_fps(self.fps)